@@ -0,0 +1,14 @@
+"""Respuestas HTTP compartidas por los endpoints de la API."""
+
+from fastapi import Response
+
+
+def json_response(payload: str | bytes) -> Response:
+    """Devuelve un JSON ya serializado sin que FastAPI lo procese de nuevo.
+
+    Con un modelo o un dict como retorno, FastAPI lo vuelca, lo revalida contra ``response_model`` y lo serializa
+    con ``json.dumps``. Los endpoints que usan este helper serializan una sola vez con pydantic-core
+    (``model_dump_json``, ``TypeAdapter.dump_json`` o ``to_json``), y su ``response_model`` queda solo para la
+    documentación OpenAPI.
+    """
+    return Response(content=payload, media_type="application/json")
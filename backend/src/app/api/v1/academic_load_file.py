@@ -24,6 +24,7 @@ from ...crud.academic_load_file import academic_load_file
 from ...crud.crud_faculties import get_faculty_by_id
 from ...crud.crud_schools import get_school_by_id
 from ...crud.crud_term import get_term
+from ...models.hourly_rate_history import HourlyRateHistory
 from ...models.role import UserRoleEnum
 from ...schemas.academic_load_file import (
     AcademicLoadFileCreate,
@@ -812,7 +813,7 @@ async def get_billing_monthly_budget(
     """
     from decimal import Decimal
 
-    from ...crud.crud_hourly_rate_history import get_current_rate
+    from ...crud.crud_hourly_rate_history import get_current_rate_cached
     from ...schemas.billing import MonthlyBudgetItem
 
     # Verificar que el archivo existe y obtener información del término
@@ -837,6 +838,8 @@ async def get_billing_monthly_budget(
     # Obtener lista de meses del término
     term_months = get_term_months(term.start_date, term.end_date)
 
+    rate_cache: dict[tuple[int, date], HourlyRateHistory | None] = {}
+
     # Calcular presupuesto mensual por bloque
     monthly_budgets = []
     for (class_days, class_schedule, class_duration), class_list in grouped_classes.items():
@@ -882,7 +885,9 @@ async def get_billing_monthly_budget(
 
                     # Obtener tarifa vigente para este nivel y fecha (primer día del mes)
                     month_date = date(year, month, 1)
-                    hourly_rate = await get_current_rate(session=db, level_id=level_id, reference_date=month_date)
+                    hourly_rate = await get_current_rate_cached(
+                        session=db, level_id=level_id, reference_date=month_date, rate_cache=rate_cache
+                    )
 
                     if hourly_rate:
                         # Calcular: (suma de tasas de pago) × tarifa por hora × total de horas clase
@@ -940,7 +945,7 @@ async def get_billing_report(
     """
     from decimal import Decimal
 
-    from ...crud.crud_hourly_rate_history import get_current_rate
+    from ...crud.crud_hourly_rate_history import get_current_rate_cached
 
     # Verificar que el archivo existe
     file = await academic_load_file.get(db, id=file_id)
@@ -964,6 +969,8 @@ async def get_billing_report(
     # Obtener lista de meses del término
     term_months = get_term_months(term.start_date, term.end_date)
 
+    rate_cache: dict[tuple[int, date], HourlyRateHistory | None] = {}
+
     # BLOQUE 1: Horarios únicos
     schedule_blocks = []
     for (class_days, class_schedule, class_duration), _ in grouped_classes.items():
@@ -1041,7 +1048,9 @@ async def get_billing_report(
 
                     # Obtener tarifa vigente para este nivel y fecha (primer día del mes)
                     month_date = date(year, month, 1)
-                    hourly_rate = await get_current_rate(session=db, level_id=level_id, reference_date=month_date)
+                    hourly_rate = await get_current_rate_cached(
+                        session=db, level_id=level_id, reference_date=month_date, rate_cache=rate_cache
+                    )
 
                     if hourly_rate:
                         # Calcular: (suma de tasas de pago) × tarifa por hora × total de horas clase
@@ -1108,7 +1117,7 @@ async def generate_and_save_billing_report(
     from decimal import Decimal
 
     from ...crud.crud_billing_report import billing_report as crud_billing_report
-    from ...crud.crud_hourly_rate_history import get_current_rate
+    from ...crud.crud_hourly_rate_history import get_current_rate_cached
     from ...schemas.billing_report import (
         BillingReportCreate,
         MonthlyItemCreate,
@@ -1153,6 +1162,8 @@ async def generate_and_save_billing_report(
     # Obtener lista de meses del término
     term_months = get_term_months(term.start_date, term.end_date)
 
+    rate_cache: dict[tuple[int, date], HourlyRateHistory | None] = {}
+
     # Preparar datos para el reporte
     payment_summaries = []
     monthly_items = []
@@ -1215,7 +1226,9 @@ async def generate_and_save_billing_report(
 
                     # Obtener tarifa vigente para este nivel y fecha (primer día del mes)
                     month_date = date(year, month, 1)
-                    hourly_rate = await get_current_rate(session=db, level_id=level_id, reference_date=month_date)
+                    hourly_rate = await get_current_rate_cached(
+                        session=db, level_id=level_id, reference_date=month_date, rate_cache=rate_cache
+                    )
 
                     if hourly_rate:
                         # Calcular: (suma de tasas de pago) × tarifa por hora × total de horas clase
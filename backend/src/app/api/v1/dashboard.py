@@ -1,16 +1,42 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Sequence
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import desc, distinct, func, select, tuple_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Row,
+    Select,
+    StatementLambdaElement,
+    and_,
+    case,
+    cast,
+    desc,
+    func,
+    lambda_stmt,
+    or_,
+    select,
+    true,
+    tuple_,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, raiseload, selectinload
 
-from ...core.db.database import async_get_db
+from ...api.responses import json_response
+from ...core.db.database import async_get_db, local_session
 from ...core.rbac_scope import get_user_scope_filters
+from ...core.utils import cache
 from ...models.academic_load_class import AcademicLoadClass
 from ...models.academic_load_file import AcademicLoadFile
-from ...models.billing_report import BillingReport
+from ...models.billing_report import BillingReport, BillingReportMonthlyItem, BillingReportPaymentSummary
+from ...models.faculty import Faculty
 from ...models.role import UserRoleEnum
 from ...models.school import School
 from ...models.term import Term
@@ -20,36 +46,187 @@ from ...schemas.dashboard import (
     DashboardKPIs,
     DirectorDashboardResponse,
     GroupsComparisonBySchoolItem,
-    HeatmapPoint,
     MonthlyReportByFaculty,
     MonthlyReportSchoolItem,
-    MonthlyTrendItem,
     RecentLoad,
     SectionsByModalityItem,
     SectionsBySchoolItem,
-    StackedByScheduleItem,
-    TopBlockItem,
 )
 from ..dependencies import get_current_user
 
 router = APIRouter()
 
+# Tiempo de vida de los dashboards consolidados cacheados (segundos)
+_DASHBOARD_CACHE_EXPIRATION = 600
+
 
 def _weekday_label(days: str) -> str:
     # Mantener etiqueta tal cual viene (p.ej. "Lu-Vi", "Ma-Ju")
     return days
 
 
-def _class_type_to_modality(class_type: str) -> str:
-    """Mapea class_type a nombre de modalidad legible."""
-    class_type_upper = str(class_type).strip().upper()
-    if class_type_upper == "P":
-        return "Presenciales"
-    if class_type_upper in ["EL", "E.L."]:
-        return "En Línea"
-    if class_type_upper == "V":
-        return "Virtuales"
-    return "Otros"
+def _level_rate_sums() -> tuple[ColumnElement[float], ...]:
+    """Sumas (como float) de las tasas de pago por nivel de los payment_summaries, con las claves de los charts."""
+    return (
+        cast(func.sum(BillingReportPaymentSummary.payment_rate_grado), Float).label("GDO"),
+        cast(func.sum(BillingReportPaymentSummary.payment_rate_maestria_1), Float).label("M1"),
+        cast(func.sum(BillingReportPaymentSummary.payment_rate_maestria_2), Float).label("M2"),
+        cast(func.sum(BillingReportPaymentSummary.payment_rate_doctor), Float).label("DR"),
+        cast(func.sum(BillingReportPaymentSummary.payment_rate_bilingue), Float).label("BLG"),
+    )
+
+
+def _class_modality_expr() -> ColumnElement[str]:
+    """Expresión SQL que mapea class_type a nombre de modalidad legible."""
+    class_type = func.upper(func.trim(AcademicLoadClass.class_type))
+    return case(
+        (class_type == "P", "Presenciales"),
+        (class_type.in_(["EL", "E.L."]), "En Línea"),
+        (class_type == "V", "Virtuales"),
+        else_="Otros",
+    )
+
+
+# Columnas de la planilla que usan los dashboards de director: su id (monthly_items y payment_summaries se agregan
+# en SQL) y las fechas que versionan sus KPIs memorizados. No se hidrata el objeto ORM.
+_REPORT_VERSION_COLUMNS = (BillingReport.id, BillingReport.created_at, BillingReport.updated_at)
+
+# KPIs ya calculados por planilla, indexados por (id, versión). Una planilla editada cambia su updated_at, por lo
+# que sus KPIs anteriores dejan de usarse y terminan saliendo del caché por antigüedad.
+_REPORT_KPIS_CACHE_SIZE = 256
+_report_kpis_cache: OrderedDict[tuple[int, datetime], DashboardKPIs] = OrderedDict()
+
+
+async def _report_kpis(report: Row) -> DashboardKPIs:
+    """KPIs de una planilla (horas, dólares y cobertura de grupos pagados), memorizados por versión de la planilla.
+
+    Parameters
+    ----------
+    report : Row
+        Fila con ``_REPORT_VERSION_COLUMNS`` de la planilla; los KPIs se agregan en la base de datos con
+        ``_fetch_consolidated_kpis``.
+
+    Returns
+    -------
+    DashboardKPIs
+        Copia de los KPIs de la planilla.
+    """
+    key = (report.id, report.updated_at or report.created_at)
+    kpis = _report_kpis_cache.get(key)
+    if kpis is not None:
+        _report_kpis_cache.move_to_end(key)
+        return kpis.model_copy()
+
+    kpis = await _fetch_consolidated_kpis([report.id])
+    _report_kpis_cache[key] = kpis
+    if len(_report_kpis_cache) > _REPORT_KPIS_CACHE_SIZE:
+        _report_kpis_cache.popitem(last=False)
+    return kpis.model_copy()
+
+
+# Claves de charts que devuelve cada dashboard cuando no hay datos
+_CONSOLIDATED_CHART_KEYS: tuple[str, ...] = ("heatmap", "stacked_by_schedule", "monthly_trend")
+_DIRECTOR_CHART_KEYS: tuple[str, ...] = (
+    *_CONSOLIDATED_CHART_KEYS,
+    "top_blocks",
+    "comparative_sections",
+    "sections_by_school",
+)
+
+
+def _file_versions(files: Sequence[AcademicLoadFile]) -> list[dict]:
+    """Lista de versiones (cargas) para el contexto del dashboard."""
+    return [
+        {
+            "file_id": f.id,
+            "version": f.version,
+            "ingestion_status": f.ingestion_status,
+            "upload_date": f.upload_date,
+            "is_active": f.is_active,
+        }
+        for f in files
+    ]
+
+
+def _scope_context(
+    term_id: int,
+    term_obj: Term,
+    faculty_id: int | None,
+    school_id: int | None,
+    school_ids: list[int],
+    school_acronyms: list[str],
+    files: Sequence[AcademicLoadFile] = (),
+) -> DashboardContext:
+    """Contexto de los dashboards consolidados (decano y vicerrector)."""
+    return DashboardContext(
+        term_id=term_id,
+        term_term=term_obj.term,
+        term_year=term_obj.year,
+        faculty_id=faculty_id,
+        school_ids=school_ids if not school_id else None,
+        school_id=school_id,
+        school_acronyms=school_acronyms if not school_id else None,
+        school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
+        file_versions=_file_versions(files),
+    )
+
+
+# Ciclos ya resueltos por (term_id, compare_term_id). La tabla de ciclos casi no cambia, así que se reutilizan por el
+# mismo tiempo que las respuestas cacheadas de los dashboards.
+_TERMS_CACHE_SIZE = 256
+_terms_cache: OrderedDict[tuple[int, int | None], tuple[float, Term | None, Term | None]] = OrderedDict()
+
+
+async def _fetch_terms(term_id: int, compare_term_id: int | None) -> tuple[Term | None, Term | None]:
+    """Obtiene el ciclo base y el de comparación en una sola consulta, en su propia sesión.
+
+    Si no se indica ``compare_term_id``, el ciclo de comparación es el mismo term del año anterior (si existe). El
+    resultado se guarda en un caché del proceso durante ``_DASHBOARD_CACHE_EXPIRATION`` segundos.
+    """
+    key = (term_id, compare_term_id)
+    cached = _terms_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        _terms_cache.move_to_end(key)
+        return cached[1], cached[2]
+
+    if compare_term_id is not None:
+        compare_condition = Term.id == compare_term_id
+    else:
+        base = aliased(Term)
+        compare_condition = and_(
+            Term.term == select(base.term).filter(base.id == term_id).scalar_subquery(),
+            Term.year == select(base.year - 1).filter(base.id == term_id).scalar_subquery(),
+        )
+    async with local_session() as session:
+        terms = (await session.execute(select(Term).filter(or_(Term.id == term_id, compare_condition)))).scalars().all()
+
+    term_obj = next((t for t in terms if t.id == term_id), None)
+    if compare_term_id is not None:
+        cmp_term_obj = next((t for t in terms if t.id == compare_term_id), None)
+    else:
+        cmp_term_obj = next(
+            (t for t in terms if term_obj and t.term == term_obj.term and t.year == term_obj.year - 1), None
+        )
+
+    # Un ciclo inexistente no se cachea para no seguir respondiendo 404 si se crea después
+    if term_obj is not None:
+        _terms_cache[key] = (time.monotonic() + _DASHBOARD_CACHE_EXPIRATION, term_obj, cmp_term_obj)
+        _terms_cache.move_to_end(key)
+        if len(_terms_cache) > _TERMS_CACHE_SIZE:
+            _terms_cache.popitem(last=False)
+    return term_obj, cmp_term_obj
+
+
+def _empty_dashboard(
+    context: DashboardContext, chart_keys: tuple[str, ...] = _DIRECTOR_CHART_KEYS
+) -> DirectorDashboardResponse:
+    """Respuesta 200 con estructura vacía para permitir UI sin datos."""
+    return DirectorDashboardResponse(
+        context=context,
+        kpis=DashboardKPIs(),
+        charts={key: [] for key in chart_keys},
+        tables={"recent_loads": []},
+    )
 
 
 @router.get("/dashboards/director", response_model=DirectorDashboardResponse)
@@ -62,7 +239,7 @@ async def get_director_dashboard(
         None,
         description=("Term ID para comparar; si no se envía, " "usa mismo term del año anterior si existe"),
     ),
-) -> DirectorDashboardResponse:
+) -> DirectorDashboardResponse | Response:
     """Dashboard para Directores.
 
     - Usa la escuela del director (RBAC) y el term_id proporcionado.
@@ -85,44 +262,40 @@ async def get_director_dashboard(
     # Para director asumimos una sola escuela; si hay varias, tomamos la primera
     school_id = school_ids[0]
 
-    # Obtener versiones (cargas) del ciclo para la escuela
-    files_stmt = (
-        select(AcademicLoadFile)
-        .filter(
-            AcademicLoadFile.school_id == school_id,
-            AcademicLoadFile.term_id == term_id,
-        )
-        .order_by(desc(AcademicLoadFile.is_active), desc(AcademicLoadFile.upload_date))
+    # Respuesta cacheada para la escuela, válida mientras no cambien sus cargas ni sus planillas
+    cache_key = await _director_cache_key(
+        school_id=school_id, term_id=term_id, file_id=file_id, compare_term_id=compare_term_id
     )
-    files_result = await db.execute(files_stmt)
+    cached = await _get_cached_dashboard(cache_key)
+    if cached:
+        return json_response(cached)
+
+    # Obtener versiones (cargas) del ciclo para la escuela
+    files_result = await db.execute(_school_files_stmt(school_id, term_id))
     files = files_result.scalars().all()
     if not files:
         # Responder 200 con estructura vacía para permitir UI sin datos
         # Obtener info del term y la escuela para enriquecer el contexto
-        term_obj = (await db.execute(select(Term).filter(Term.id == term_id))).scalar_one_or_none()
-        school_obj = (await db.execute(select(School).filter(School.id == school_id))).scalar_one_or_none()
+        # (ambos datos en una sola consulta; cada uno queda en NULL si no existe)
+        info = (
+            await db.execute(
+                select(
+                    select(Term.term).filter(Term.id == term_id).scalar_subquery().label("term"),
+                    select(Term.year).filter(Term.id == term_id).scalar_subquery().label("year"),
+                    select(School.acronym).filter(School.id == school_id).scalar_subquery().label("acronym"),
+                )
+            )
+        ).one()
         context = DashboardContext(
             term_id=term_id,
-            term_term=term_obj.term if term_obj else None,
-            term_year=term_obj.year if term_obj else None,
+            term_term=info.term,
+            term_year=info.year,
             school_id=school_id,
-            school_acronym=school_obj.acronym if school_obj else None,
+            school_acronym=info.acronym,
             file_id_selected=None,
             file_versions=[],
         )
-        return DirectorDashboardResponse(
-            context=context,
-            kpis=DashboardKPIs(),
-            charts={
-                "heatmap": [],
-                "stacked_by_schedule": [],
-                "monthly_trend": [],
-                "top_blocks": [],
-                "comparative_sections": [],
-                "sections_by_school": [],
-            },
-            tables={"recent_loads": []},
-        )
+        return _empty_dashboard(context)
 
     # Seleccionar file_id si no se envió
     selected_file = None
@@ -133,25 +306,31 @@ async def get_director_dashboard(
     else:
         selected_file = next((f for f in files if f.is_active), None) or files[0]
 
-    file_versions = [
-        {
-            "file_id": f.id,
-            "version": f.version,
-            "ingestion_status": f.ingestion_status,
-            "upload_date": f.upload_date,
-            "is_active": f.is_active,
-        }
-        for f in files
-    ]
+    file_versions = _file_versions(files)
 
     # Buscar planilla del file seleccionado (más reciente)
     report_stmt = (
-        select(BillingReport)
+        select(*_REPORT_VERSION_COLUMNS)
         .filter(BillingReport.academic_load_file_id == selected_file.id)
         .order_by(desc(BillingReport.created_at))
         .limit(1)
     )
-    report = (await db.execute(report_stmt)).scalar_one_or_none()
+    # Qué cargas del ciclo tienen planilla (tabla de cargas recientes)
+    files_with_report_stmt = (
+        select(BillingReport.academic_load_file_id)
+        .filter(BillingReport.academic_load_file_id.in_([f.id for f in files]))
+        .distinct()
+    )
+    # El ciclo de comparación y las cargas con planilla no dependen de la planilla; se consultan en paralelo
+    report, (_, cmp_term_obj), files_with_report_rows = await asyncio.gather(
+        _fetch_first(report_stmt),
+        _fetch_terms(term_id, compare_term_id),
+        _fetch_all(files_with_report_stmt),
+    )
+
+    # Determinar compare_term_id por defecto: mismo term del año anterior
+    if compare_term_id is None and cmp_term_obj:
+        compare_term_id = cmp_term_obj.id
 
     # Context
     context = DashboardContext(
@@ -171,585 +350,831 @@ async def get_director_dashboard(
     tables: dict = {"recent_loads": []}
 
     # Tabla de cargas recientes
+    files_with_report = {row.academic_load_file_id for row in files_with_report_rows}
     tables["recent_loads"] = [
         RecentLoad(
             file_id=f.id,
             version=f.version,
             ingestion_status=f.ingestion_status,
             upload_date=f.upload_date,
-            has_billing_report=bool(
-                (
-                    await db.execute(select(BillingReport).filter(BillingReport.academic_load_file_id == f.id).limit(1))
-                ).scalar_one_or_none()
-            ),
+            has_billing_report=f.id in files_with_report,
         )
         for f in files
     ]
 
     if not report:
-        return DirectorDashboardResponse(context=context, kpis=kpis, charts=charts, tables=tables)
-
-    # Construir KPIs
-    kpis.has_billing_report = True
-
-    # monthly items
-    monthly_items = report.monthly_items if hasattr(report, "monthly_items") else []
-    total_hours = sum(float(mi.total_class_hours) for mi in monthly_items)
-    total_dollars = sum(float(mi.total_dollars) for mi in monthly_items)
-    kpis.total_hours = total_hours
-    kpis.total_dollars = total_dollars
-
-    # paid groups coverage desde payment_summaries (full=1.0, partial=0<rate<1, none=0)
-    paid_full = paid_partial = paid_none = 0
-    for ps in report.payment_summaries:
-        # suma de rates por nivel; si alguna >0 cuenta como grupo pagado
-        rates = [
-            float(ps.payment_rate_grado),
-            float(ps.payment_rate_maestria_1),
-            float(ps.payment_rate_maestria_2),
-            float(ps.payment_rate_doctor),
-            float(ps.payment_rate_bilingue),
-        ]
-        s = sum(rates)
-        if s == 0:
-            paid_none += 1
-        elif s >= 1.0:
-            paid_full += 1
-        else:
-            paid_partial += 1
-    total_groups = paid_full + paid_partial + paid_none
-    kpis.paid_groups_full = paid_full
-    kpis.paid_groups_partial = paid_partial
-    kpis.paid_groups_none = paid_none
-    kpis.coverage_rate = (paid_full + paid_partial) / total_groups if total_groups else 0.0
-
-    # Heatmap: agregación por (day,schedule)
-    heatmap_map: dict[tuple[str, str], tuple[float, float]] = {}
-    for mi in monthly_items:
-        key = (_weekday_label(mi.class_days), mi.class_schedule)
-        prev_h, prev_d = heatmap_map.get(key, (0.0, 0.0))
-        heatmap_map[key] = (
-            prev_h + float(mi.total_class_hours),
-            prev_d + float(mi.total_dollars),
+        payload = DirectorDashboardResponse(context=context, kpis=kpis, charts=charts, tables=tables).model_dump_json()
+        await _set_cached_dashboard(cache_key, payload)
+        return json_response(payload)
+
+    # KPIs y agregados de payment_summaries (stacked por horario y niveles por bloque) calculados en la base de
+    # datos, en paralelo. Los grupos conservan el orden de primera aparición de cada clave (mínimo id).
+    level_rates = _level_rate_sums()
+    stacked_stmt = (
+        select(BillingReportPaymentSummary.class_schedule, *level_rates)
+        .filter(BillingReportPaymentSummary.billing_report_id == report.id)
+        .group_by(BillingReportPaymentSummary.class_schedule)
+        .order_by(func.min(BillingReportPaymentSummary.id))
+    )
+    # Top blocks (por $): horas/$ de monthly_items y niveles de payment_summaries por bloque, unidos en la base de
+    # datos y limitados a 10. Los empates conservan el orden de primera aparición: primero los bloques con payment
+    # summaries y luego los que solo tienen monthly_items.
+    block_rates = (
+        select(
+            BillingReportPaymentSummary.class_days,
+            BillingReportPaymentSummary.class_schedule,
+            BillingReportPaymentSummary.class_duration,
+            *level_rates,
+            func.min(BillingReportPaymentSummary.id).label("first_id"),
+        )
+        .filter(BillingReportPaymentSummary.billing_report_id == report.id)
+        .group_by(
+            BillingReportPaymentSummary.class_days,
+            BillingReportPaymentSummary.class_schedule,
+            BillingReportPaymentSummary.class_duration,
+        )
+        .subquery()
+    )
+    block_totals = (
+        select(
+            BillingReportMonthlyItem.class_days,
+            BillingReportMonthlyItem.class_schedule,
+            BillingReportMonthlyItem.class_duration,
+            func.sum(BillingReportMonthlyItem.total_class_hours).label("hours"),
+            func.sum(BillingReportMonthlyItem.total_dollars).label("dollars"),
+            func.min(BillingReportMonthlyItem.id).label("first_id"),
+        )
+        .filter(BillingReportMonthlyItem.billing_report_id == report.id)
+        .group_by(
+            BillingReportMonthlyItem.class_days,
+            BillingReportMonthlyItem.class_schedule,
+            BillingReportMonthlyItem.class_duration,
+        )
+        .subquery()
+    )
+    block_dollars = cast(func.coalesce(block_totals.c.dollars, 0), Float)
+    top_blocks_stmt = (
+        select(
+            func.coalesce(block_rates.c.class_days, block_totals.c.class_days).label("class_days"),
+            func.coalesce(block_rates.c.class_schedule, block_totals.c.class_schedule).label("class_schedule"),
+            func.coalesce(block_rates.c.class_duration, block_totals.c.class_duration).label("class_duration"),
+            cast(func.coalesce(block_totals.c.hours, 0), Float).label("hours"),
+            block_dollars.label("dollars"),
+            *(func.coalesce(block_rates.c[level], 0.0).label(level) for level in ("GDO", "M1", "M2", "DR", "BLG")),
+        )
+        .select_from(
+            block_rates.join(
+                block_totals,
+                and_(
+                    block_rates.c.class_days == block_totals.c.class_days,
+                    block_rates.c.class_schedule == block_totals.c.class_schedule,
+                    block_rates.c.class_duration == block_totals.c.class_duration,
+                ),
+                full=True,
+            )
+        )
+        .order_by(
+            desc(block_dollars),
+            block_rates.c.first_id.is_(None),
+            block_rates.c.first_id,
+            block_totals.c.first_id,
+        )
+        .limit(10)
+    )
+    # Heatmap (day, schedule) y monthly trend (año, mes) de monthly_items en un solo recorrido con GROUPING SETS.
+    # Las celdas del heatmap salen en orden de primera aparición (mínimo id) y los meses en orden cronológico.
+    by_cell = func.grouping(BillingReportMonthlyItem.class_days)
+    items_rollup_stmt = (
+        select(
+            (by_cell == 0).label("is_heatmap"),
+            BillingReportMonthlyItem.class_days,
+            BillingReportMonthlyItem.class_schedule,
+            BillingReportMonthlyItem.year,
+            BillingReportMonthlyItem.month,
+            func.sum(BillingReportMonthlyItem.sessions).label("sessions"),
+            cast(func.sum(BillingReportMonthlyItem.total_class_hours), Float).label("hours"),
+            cast(func.sum(BillingReportMonthlyItem.total_dollars), Float).label("dollars"),
+        )
+        .filter(BillingReportMonthlyItem.billing_report_id == report.id)
+        .group_by(
+            func.grouping_sets(
+                tuple_(BillingReportMonthlyItem.class_days, BillingReportMonthlyItem.class_schedule),
+                tuple_(BillingReportMonthlyItem.year, BillingReportMonthlyItem.month),
+            )
+        )
+        .order_by(
+            by_cell,
+            BillingReportMonthlyItem.year,
+            BillingReportMonthlyItem.month,
+            func.min(BillingReportMonthlyItem.id),
         )
+    )
+    # La planilla del ciclo de comparación se busca en la misma tanda, en su propia sesión
+    kpis, stacked_rows, top_block_rows, items_rollup_rows, cmp_report = await asyncio.gather(
+        _report_kpis(report),
+        _fetch_all(stacked_stmt),
+        _fetch_all(top_blocks_stmt),
+        _fetch_all(items_rollup_stmt),
+        _fetch_school_compare_report(school_id, compare_term_id),
+    )
+
+    # Los items de los charts se arman como dicts planos con los campos de HeatmapPoint, StackedByScheduleItem,
+    # MonthlyTrendItem y TopBlockItem: los valores ya llegan tipados desde SQL y el payload se serializa una sola vez,
+    # sin validar fila por fila.
     charts["heatmap"] = [
-        HeatmapPoint(day=k[0], schedule=k[1], hours=v[0], dollars=v[1]) for k, v in heatmap_map.items()
+        {
+            "day": _weekday_label(row.class_days),
+            "schedule": row.class_schedule,
+            "hours": row.hours,
+            "dollars": row.dollars,
+        }
+        for row in items_rollup_rows
+        if row.is_heatmap
     ]
 
     # Stacked by schedule (niveles) a partir de payment_summaries
-    stacked_map: dict[str, dict[str, float]] = {}
-    for ps in report.payment_summaries:
-        sched = ps.class_schedule
-        if sched not in stacked_map:
-            stacked_map[sched] = {
-                "GDO": 0.0,
-                "M1": 0.0,
-                "M2": 0.0,
-                "DR": 0.0,
-                "BLG": 0.0,
-            }
-        stacked_map[sched]["GDO"] += float(ps.payment_rate_grado)
-        stacked_map[sched]["M1"] += float(ps.payment_rate_maestria_1)
-        stacked_map[sched]["M2"] += float(ps.payment_rate_maestria_2)
-        stacked_map[sched]["DR"] += float(ps.payment_rate_doctor)
-        stacked_map[sched]["BLG"] += float(ps.payment_rate_bilingue)
-    charts["stacked_by_schedule"] = [StackedByScheduleItem(schedule=s, **vals) for s, vals in stacked_map.items()]
-
-    # Monthly trend
-    trend_map: dict[str, dict[str, float | int]] = {}
-    for mi in monthly_items:
-        month_key = f"{mi.year}-{mi.month:02d}"
-        if month_key not in trend_map:
-            trend_map[month_key] = {"sessions": 0, "hours": 0.0, "dollars": 0.0}
-        trend_map[month_key]["sessions"] += int(mi.sessions)
-        trend_map[month_key]["hours"] += float(mi.total_class_hours)
-        trend_map[month_key]["dollars"] += float(mi.total_dollars)
-    charts["monthly_trend"] = [
-        MonthlyTrendItem(
-            month=k,
-            sessions=v["sessions"],
-            hours=float(v["hours"]),
-            dollars=float(v["dollars"]),
-        )
-        for k, v in sorted(trend_map.items())
+    charts["stacked_by_schedule"] = [
+        {"schedule": row.class_schedule, "GDO": row.GDO, "M1": row.M1, "M2": row.M2, "DR": row.DR, "BLG": row.BLG}
+        for row in stacked_rows
     ]
 
-    # Top blocks (por $)
-    block_map: dict[tuple[str, str, int], dict[str, float]] = {}
-    # base de niveles desde payment summaries
-    for ps in report.payment_summaries:
-        key = (ps.class_days, ps.class_schedule, ps.class_duration)
-        block_map.setdefault(
-            key,
-            {
-                "GDO": 0.0,
-                "M1": 0.0,
-                "M2": 0.0,
-                "DR": 0.0,
-                "BLG": 0.0,
-                "hours": 0.0,
-                "dollars": 0.0,
-            },
-        )
-        block_map[key]["GDO"] += float(ps.payment_rate_grado)
-        block_map[key]["M1"] += float(ps.payment_rate_maestria_1)
-        block_map[key]["M2"] += float(ps.payment_rate_maestria_2)
-        block_map[key]["DR"] += float(ps.payment_rate_doctor)
-        block_map[key]["BLG"] += float(ps.payment_rate_bilingue)
-    # acumular horas/$ desde monthly items
-    for mi in monthly_items:
-        key = (mi.class_days, mi.class_schedule, mi.class_duration)
-        block_map.setdefault(
-            key,
-            {
-                "GDO": 0.0,
-                "M1": 0.0,
-                "M2": 0.0,
-                "DR": 0.0,
-                "BLG": 0.0,
-                "hours": 0.0,
-                "dollars": 0.0,
-            },
-        )
-        block_map[key]["hours"] += float(mi.total_class_hours)
-        block_map[key]["dollars"] += float(mi.total_dollars)
+    # La etiqueta "YYYY-MM" del trend se arma solo al emitir, ya en orden
+    charts["monthly_trend"] = [
+        {
+            "month": f"{row.year}-{row.month:02d}",
+            "sessions": row.sessions,
+            "hours": row.hours,
+            "dollars": row.dollars,
+        }
+        for row in items_rollup_rows
+        if not row.is_heatmap
+    ]
 
-    top = sorted(block_map.items(), key=lambda kv: kv[1]["dollars"], reverse=True)[:10]
     charts["top_blocks"] = [
-        TopBlockItem(
-            class_days=k[0],
-            class_schedule=k[1],
-            class_duration=k[2],
-            hours=v["hours"],
-            dollars=v["dollars"],
-            GDO=v["GDO"],
-            M1=v["M1"],
-            M2=v["M2"],
-            DR=v["DR"],
-            BLG=v["BLG"],
-        )
-        for k, v in top
+        {
+            "class_days": row.class_days,
+            "class_schedule": row.class_schedule,
+            "class_duration": row.class_duration,
+            "hours": row.hours,
+            "dollars": row.dollars,
+            "GDO": row.GDO,
+            "M1": row.M1,
+            "M2": row.M2,
+            "DR": row.DR,
+            "BLG": row.BLG,
+        }
+        for row in top_block_rows
     ]
 
     # --- Bloque de comparación ---
     comparison: dict | None = None
     try:
-        # Determinar compare_term_id por defecto: mismo term del año anterior
-        if compare_term_id is None and context.term_year and context.term_term:
-            # buscar term con mismo term y year-1
-            prev_term_stmt = select(Term).filter(Term.term == context.term_term, Term.year == context.term_year - 1)
-            prev_term_obj = (await db.execute(prev_term_stmt)).scalar_one_or_none()
-            compare_term_id = prev_term_obj.id if prev_term_obj else None
-
-        if compare_term_id:
-            cmp_term_obj = (await db.execute(select(Term).filter(Term.id == compare_term_id))).scalar_one_or_none()
+        # Solo si hay planilla comparable
+        if cmp_report:
             cmp_term_label = f"{cmp_term_obj.term:02d}/{cmp_term_obj.year}" if cmp_term_obj else None
-            # archivos del ciclo de comparación para la misma escuela
-            cmp_files_stmt = (
-                select(AcademicLoadFile)
-                .filter(
-                    AcademicLoadFile.school_id == school_id,
-                    AcademicLoadFile.term_id == compare_term_id,
-                )
-                .order_by(desc(AcademicLoadFile.is_active), desc(AcademicLoadFile.upload_date))
-            )
-            cmp_files = (await db.execute(cmp_files_stmt)).scalars().all()
-            if cmp_files:
-                cmp_file = next((f for f in cmp_files if f.is_active), None) or cmp_files[0]
-                cmp_report = (
-                    await db.execute(
-                        select(BillingReport)
-                        .filter(BillingReport.academic_load_file_id == cmp_file.id)
-                        .order_by(desc(BillingReport.created_at))
-                        .limit(1)
-                    )
-                ).scalar_one_or_none()
-                # Solo si hay planilla comparable
-                if cmp_report:
-                    # métricas base (actual)
-                    base_hours = float(kpis.total_hours)
-                    base_dollars = float(kpis.total_dollars)
-                    base_groups = len(report.payment_summaries)
-                    base_cov = {
-                        "full": int(kpis.paid_groups_full),
-                        "partial": int(kpis.paid_groups_partial),
-                        "none": int(kpis.paid_groups_none),
-                    }
-                    # métricas compare
-                    cmp_monthly = cmp_report.monthly_items if hasattr(cmp_report, "monthly_items") else []
-                    cmp_hours = sum(float(mi.total_class_hours) for mi in cmp_monthly)
-                    cmp_dollars = sum(float(mi.total_dollars) for mi in cmp_monthly)
-                    # cobertura
-                    c_full = c_partial = c_none = 0
-                    for ps in cmp_report.payment_summaries:
-                        rsum = (
-                            float(ps.payment_rate_grado)
-                            + float(ps.payment_rate_maestria_1)
-                            + float(ps.payment_rate_maestria_2)
-                            + float(ps.payment_rate_doctor)
-                            + float(ps.payment_rate_bilingue)
-                        )
-                        if rsum == 0:
-                            c_none += 1
-                        elif rsum >= 1.0:
-                            c_full += 1
-                        else:
-                            c_partial += 1
-                    cmp_groups = len(cmp_report.payment_summaries)
-                    cmp_cov = {"full": c_full, "partial": c_partial, "none": c_none}
-
-                    def _delta(a: float, b: float) -> dict:
-                        abs_val = a - b
-                        pct = (abs_val / b) if b else None
-                        return {"abs": abs_val, "pct": pct}
-
-                    comparison = {
-                        "base": {
-                            "term_id": term_id,
-                            "term_label": (
-                                f"{context.term_term:02d}/{context.term_year}"
-                                if context.term_term and context.term_year
-                                else None
-                            ),
-                            "total_hours": base_hours,
-                            "total_dollars": base_dollars,
-                            "groups_count": base_groups,
-                            "coverage": base_cov,
-                        },
-                        "compare": {
-                            "term_id": compare_term_id,
-                            "term_label": cmp_term_label,
-                            "total_hours": cmp_hours,
-                            "total_dollars": cmp_dollars,
-                            "groups_count": cmp_groups,
-                            "coverage": cmp_cov,
-                        },
-                        "delta": {
-                            "total_hours": _delta(base_hours, cmp_hours),
-                            "total_dollars": _delta(base_dollars, cmp_dollars),
-                            "groups_count": _delta(float(base_groups), float(cmp_groups)),
-                            "coverage": {
-                                "full": _delta(float(base_cov["full"]), float(cmp_cov["full"])),
-                                "partial": _delta(
-                                    float(base_cov["partial"]),
-                                    float(cmp_cov["partial"]),
-                                ),
-                                "none": _delta(float(base_cov["none"]), float(cmp_cov["none"])),
-                            },
-                        },
-                    }
+            # métricas base (actual)
+            base_hours = kpis.total_hours
+            base_dollars = kpis.total_dollars
+            base_groups = kpis.paid_groups_full + kpis.paid_groups_partial + kpis.paid_groups_none
+            base_cov = {
+                "full": kpis.paid_groups_full,
+                "partial": kpis.paid_groups_partial,
+                "none": kpis.paid_groups_none,
+            }
+            # métricas compare
+            cmp_kpis = await _report_kpis(cmp_report)
+            cmp_hours = cmp_kpis.total_hours
+            cmp_dollars = cmp_kpis.total_dollars
+            cmp_groups = cmp_kpis.paid_groups_full + cmp_kpis.paid_groups_partial + cmp_kpis.paid_groups_none
+            cmp_cov = {
+                "full": cmp_kpis.paid_groups_full,
+                "partial": cmp_kpis.paid_groups_partial,
+                "none": cmp_kpis.paid_groups_none,
+            }
+
+            def _delta(a: float, b: float) -> dict:
+                abs_val = a - b
+                pct = (abs_val / b) if b else None
+                return {"abs": abs_val, "pct": pct}
+
+            comparison = {
+                "base": {
+                    "term_id": term_id,
+                    "term_label": (
+                        f"{context.term_term:02d}/{context.term_year}"
+                        if context.term_term and context.term_year
+                        else None
+                    ),
+                    "total_hours": base_hours,
+                    "total_dollars": base_dollars,
+                    "groups_count": base_groups,
+                    "coverage": base_cov,
+                },
+                "compare": {
+                    "term_id": compare_term_id,
+                    "term_label": cmp_term_label,
+                    "total_hours": cmp_hours,
+                    "total_dollars": cmp_dollars,
+                    "groups_count": cmp_groups,
+                    "coverage": cmp_cov,
+                },
+                "delta": {
+                    "total_hours": _delta(base_hours, cmp_hours),
+                    "total_dollars": _delta(base_dollars, cmp_dollars),
+                    "groups_count": _delta(float(base_groups), float(cmp_groups)),
+                    "coverage": {
+                        "full": _delta(float(base_cov["full"]), float(cmp_cov["full"])),
+                        "partial": _delta(
+                            float(base_cov["partial"]),
+                            float(cmp_cov["partial"]),
+                        ),
+                        "none": _delta(float(base_cov["none"]), float(cmp_cov["none"])),
+                    },
+                },
+            }
     except Exception:
         comparison = None
 
-    return DirectorDashboardResponse(context=context, kpis=kpis, charts=charts, tables=tables, comparison=comparison)
+    response = DirectorDashboardResponse(
+        context=context, kpis=kpis, charts=charts, tables=tables, comparison=comparison
+    )
+    payload = response.model_dump_json()
+    await _set_cached_dashboard(cache_key, payload)
+    return json_response(payload)
 
 
-def _get_kpis_for_report(report: BillingReport | None) -> DashboardKPIs:
-    """Extrae KPIs de un BillingReport."""
-    kpis = DashboardKPIs()
-    if not report:
-        return kpis
+async def _fetch_all(stmt: Select) -> Sequence[Row]:
+    """Ejecuta una consulta de solo lectura en su propia sesión y devuelve todas las filas.
 
-    kpis.has_billing_report = True
-    monthly_items = report.monthly_items if hasattr(report, "monthly_items") else []
-    kpis.total_hours = sum(float(mi.total_class_hours) for mi in monthly_items)
-    kpis.total_dollars = sum(float(mi.total_dollars) for mi in monthly_items)
-
-    paid_full = paid_partial = paid_none = 0
-    for ps in report.payment_summaries:
-        rates = [
-            float(ps.payment_rate_grado),
-            float(ps.payment_rate_maestria_1),
-            float(ps.payment_rate_maestria_2),
-            float(ps.payment_rate_doctor),
-            float(ps.payment_rate_bilingue),
-        ]
-        s = sum(rates)
-        if s == 0:
-            paid_none += 1
-        elif s >= 1.0:
-            paid_full += 1
-        else:
-            paid_partial += 1
-    total_groups = paid_full + paid_partial + paid_none
-    kpis.paid_groups_full = paid_full
-    kpis.paid_groups_partial = paid_partial
-    kpis.paid_groups_none = paid_none
-    kpis.coverage_rate = (paid_full + paid_partial) / total_groups if total_groups else 0.0
-    return kpis
+    Una AsyncSession no admite operaciones concurrentes; usar una sesión por consulta permite lanzar consultas
+    independientes con ``asyncio.gather`` tomando conexiones distintas del pool.
+    """
+    async with local_session() as session:
+        return (await session.execute(stmt)).all()
 
 
-@router.get("/dashboards/decano", response_model=DirectorDashboardResponse)
-async def get_decano_dashboard(
-    current_user: Annotated[dict, Depends(get_current_user)],
-    db: AsyncSession = Depends(async_get_db),
-    term_id: int = Query(...),
-    school_id: int | None = Query(None, description="ID de escuela para filtrar; si no se envía, consolida todas"),
-    compare_term_id: int | None = Query(
-        None,
-        description=("Term ID para comparar; si no se envía, " "usa mismo term del año anterior si existe"),
-    ),
-) -> DirectorDashboardResponse:
-    """Dashboard para Decanos.
+async def _fetch_school_compare_report(school_id: int, compare_term_id: int | None) -> Row | None:
+    """Planilla más reciente de la carga de comparación de una escuela, en su propia sesión.
 
-    - Consolida datos de todas las escuelas de la facultad del decano.
-    - Si se proporciona school_id, filtra solo esa escuela.
-    - Por defecto compara con el consolidado del mismo ciclo del año anterior.
+    Se usa la carga activa del ciclo de comparación o, si no hay, la más reciente. Devuelve la fila con
+    ``_REPORT_VERSION_COLUMNS`` de la planilla, o ``None`` si no hay ciclo de comparación, no hay planilla o la
+    consulta falla: la comparación es opcional y no debe tumbar el dashboard.
     """
+    if compare_term_id is None:
+        return None
+    try:
+        async with local_session() as session:
+            cmp_files = (await session.execute(_school_files_stmt(school_id, compare_term_id))).scalars().all()
+            if not cmp_files:
+                return None
+            cmp_file = next((f for f in cmp_files if f.is_active), None) or cmp_files[0]
+            return (
+                await session.execute(
+                    select(*_REPORT_VERSION_COLUMNS)
+                    .filter(BillingReport.academic_load_file_id == cmp_file.id)
+                    .order_by(desc(BillingReport.created_at))
+                    .limit(1)
+                )
+            ).one_or_none()
+    except Exception:
+        return None
 
-    user_role = current_user.get("role")
-    if isinstance(user_role, str):
-        user_role = UserRoleEnum(user_role)
-
-    if user_role != UserRoleEnum.DECANO:
-        raise HTTPException(status_code=403, detail="Solo disponible para decanos")
-
-    scope = await get_user_scope_filters(db=db, user_uuid=current_user.get("user_uuid"), user_role=user_role)
-    faculty_id: int | None = scope.get("faculty_id")
-    if not faculty_id:
-        raise HTTPException(status_code=403, detail="No tienes una facultad asignada")
 
-    # Obtener escuelas de la facultad
-    from ...models.faculty import Faculty
+async def _fetch_first(stmt: Select) -> Row | None:
+    """Ejecuta una consulta de solo lectura en su propia sesión y devuelve la primera fila (o ``None``)."""
+    async with local_session() as session:
+        return (await session.execute(stmt)).first()
 
-    faculty_obj = (await db.execute(select(Faculty).filter(Faculty.id == faculty_id))).scalar_one_or_none()
-    if not faculty_obj:
-        raise HTTPException(status_code=404, detail="Facultad no encontrada")
 
-    # Si se especifica school_id, validar que pertenezca a la facultad
-    target_school_ids: list[int] = []
-    if school_id:
-        school_obj = (
-            await db.execute(select(School).filter(School.id == school_id, School.fk_faculty == faculty_id))
-        ).scalar_one_or_none()
-        if not school_obj:
-            raise HTTPException(status_code=403, detail="Escuela no pertenece a tu facultad")
-        target_school_ids = [school_id]
-        school_acronyms = [school_obj.acronym]
-    else:
-        # Obtener todas las escuelas de la facultad
-        schools_stmt = select(School).filter(School.fk_faculty == faculty_id, School.is_active.is_(True))
-        schools_result = await db.execute(schools_stmt)
-        schools = schools_result.scalars().all()
-        target_school_ids = [s.id for s in schools]
-        school_acronyms = [s.acronym for s in schools]
+async def _fetch_consolidated_kpis(report_ids: list[int]) -> DashboardKPIs:
+    """KPIs consolidados de un conjunto de planillas, agregados en la base de datos.
 
-    # Obtener term info
-    term_obj = (await db.execute(select(Term).filter(Term.id == term_id))).scalar_one_or_none()
-    if not term_obj:
-        raise HTTPException(status_code=404, detail="Ciclo no encontrado")
+    Horas y dólares salen de la suma de monthly_items; los grupos se clasifican según la suma de tasas de cada
+    payment_summary (0 = sin pago, >= 1 = pago completo, en otro caso parcial, incluida una suma negativa), de modo
+    que los tres grupos suman el total de payment_summaries.
+    """
+    kpis = DashboardKPIs()
+    if not report_ids:
+        return kpis
 
-    # Obtener cargas activas más recientes por escuela
-    files_stmt = (
-        select(AcademicLoadFile)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
+    totals = (
+        select(
+            cast(func.coalesce(func.sum(BillingReportMonthlyItem.total_class_hours), 0), Float).label("total_hours"),
+            cast(func.coalesce(func.sum(BillingReportMonthlyItem.total_dollars), 0), Float).label("total_dollars"),
         )
-        .order_by(desc(AcademicLoadFile.upload_date))
+        .filter(BillingReportMonthlyItem.billing_report_id.in_(report_ids))
+        .subquery()
     )
-    files_result = await db.execute(files_stmt)
-    files = files_result.scalars().all()
-
-    if not files:
-        context = DashboardContext(
-            term_id=term_id,
-            term_term=term_obj.term,
-            term_year=term_obj.year,
-            faculty_id=faculty_id,
-            school_ids=target_school_ids if not school_id else None,
-            school_id=school_id,
-            school_acronyms=school_acronyms if not school_id else None,
-            school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
-            file_versions=[],
-        )
-        return DirectorDashboardResponse(
-            context=context,
-            kpis=DashboardKPIs(),
-            charts={"heatmap": [], "stacked_by_schedule": [], "monthly_trend": []},
-            tables={"recent_loads": []},
+    rate_sum = (
+        BillingReportPaymentSummary.payment_rate_grado
+        + BillingReportPaymentSummary.payment_rate_maestria_1
+        + BillingReportPaymentSummary.payment_rate_maestria_2
+        + BillingReportPaymentSummary.payment_rate_doctor
+        + BillingReportPaymentSummary.payment_rate_bilingue
+    )
+    groups = (
+        select(
+            func.count().filter(rate_sum >= 1).label("paid_full"),
+            func.count().filter(rate_sum != 0, rate_sum < 1).label("paid_partial"),
+            func.count().filter(rate_sum == 0).label("paid_none"),
         )
-
-    # Obtener billing reports más recientes por archivo
-    file_ids = [f.id for f in files]
-    reports_stmt = (
-        select(BillingReport)
-        .filter(BillingReport.academic_load_file_id.in_(file_ids))
-        .order_by(desc(BillingReport.created_at))
+        .filter(BillingReportPaymentSummary.billing_report_id.in_(report_ids))
+        .subquery()
     )
-    reports_result = await db.execute(reports_stmt)
-    all_reports = reports_result.scalars().all()
+    row = (await _fetch_all(select(totals, groups).select_from(totals.join(groups, true()))))[0]
 
-    # Agrupar por file_id y tomar el más reciente de cada uno
-    reports_by_file: dict[int, BillingReport] = {}
-    for r in all_reports:
-        if r.academic_load_file_id not in reports_by_file:
-            reports_by_file[r.academic_load_file_id] = r
+    kpis.has_billing_report = True
+    kpis.total_hours = row.total_hours
+    kpis.total_dollars = row.total_dollars
+    kpis.paid_groups_full = row.paid_full
+    kpis.paid_groups_partial = row.paid_partial
+    kpis.paid_groups_none = row.paid_none
+    total_groups = row.paid_full + row.paid_partial + row.paid_none
+    kpis.coverage_rate = (row.paid_full + row.paid_partial) / total_groups if total_groups else 0.0
+    return kpis
 
-    reports = list(reports_by_file.values())
 
-    if not reports:
-        context = DashboardContext(
-            term_id=term_id,
-            term_term=term_obj.term,
-            term_year=term_obj.year,
-            faculty_id=faculty_id,
-            school_ids=target_school_ids if not school_id else None,
-            school_id=school_id,
-            school_acronyms=school_acronyms if not school_id else None,
-            school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
-            file_versions=[
-                {
-                    "file_id": f.id,
-                    "version": f.version,
-                    "ingestion_status": f.ingestion_status,
-                    "upload_date": f.upload_date,
-                    "is_active": f.is_active,
-                }
-                for f in files
-            ],
-        )
-        return DirectorDashboardResponse(
-            context=context,
-            kpis=DashboardKPIs(),
-            charts={"heatmap": [], "stacked_by_schedule": [], "monthly_trend": []},
-            tables={"recent_loads": []},
-        )
+def _school_files_stmt(school_id: int, term_id: int) -> StatementLambdaElement:
+    """Cargas de una escuela en un ciclo, primero la activa y luego de la más reciente a la más antigua.
 
-    # Consolidar KPIs
-    kpis = DashboardKPIs()
-    kpis.has_billing_report = True
-    for r in reports:
-        r_kpis = _get_kpis_for_report(r)
-        kpis.total_hours += r_kpis.total_hours
-        kpis.total_dollars += r_kpis.total_dollars
-        kpis.paid_groups_full += r_kpis.paid_groups_full
-        kpis.paid_groups_partial += r_kpis.paid_groups_partial
-        kpis.paid_groups_none += r_kpis.paid_groups_none
-    total_groups = kpis.paid_groups_full + kpis.paid_groups_partial + kpis.paid_groups_none
-    kpis.coverage_rate = (kpis.paid_groups_full + kpis.paid_groups_partial) / total_groups if total_groups else 0.0
-
-    # Consolidar charts
-    heatmap_map: dict[tuple[str, str], tuple[float, float]] = {}
-    stacked_map: dict[str, dict[str, float]] = {}
-    trend_map: dict[str, dict[str, float | int]] = {}
-
-    for r in reports:
-        # Heatmap
-        for mi in r.monthly_items:
-            key = (_weekday_label(mi.class_days), mi.class_schedule)
-            prev_h, prev_d = heatmap_map.get(key, (0.0, 0.0))
-            heatmap_map[key] = (
-                prev_h + float(mi.total_class_hours),
-                prev_d + float(mi.total_dollars),
+    Solo se cargan el ciclo y la escuela de cada carga (para el contexto); el resto de relaciones no se usa.
+    """
+    return lambda_stmt(
+        lambda: (
+            select(AcademicLoadFile)
+            .options(
+                selectinload(AcademicLoadFile.term),
+                selectinload(AcademicLoadFile.school).raiseload("*"),
+                raiseload("*"),
+            )
+            .filter(
+                AcademicLoadFile.school_id == school_id,
+                AcademicLoadFile.term_id == term_id,
             )
+            .order_by(desc(AcademicLoadFile.is_active), desc(AcademicLoadFile.upload_date))
+        )
+    )
 
-        # Stacked by schedule
-        for ps in r.payment_summaries:
-            sched = ps.class_schedule
-            if sched not in stacked_map:
-                stacked_map[sched] = {
-                    "GDO": 0.0,
-                    "M1": 0.0,
-                    "M2": 0.0,
-                    "DR": 0.0,
-                    "BLG": 0.0,
-                }
-            stacked_map[sched]["GDO"] += float(ps.payment_rate_grado)
-            stacked_map[sched]["M1"] += float(ps.payment_rate_maestria_1)
-            stacked_map[sched]["M2"] += float(ps.payment_rate_maestria_2)
-            stacked_map[sched]["DR"] += float(ps.payment_rate_doctor)
-            stacked_map[sched]["BLG"] += float(ps.payment_rate_bilingue)
-
-        # Monthly trend
-        for mi in r.monthly_items:
-            month_key = f"{mi.year}-{mi.month:02d}"
-            if month_key not in trend_map:
-                trend_map[month_key] = {"sessions": 0, "hours": 0.0, "dollars": 0.0}
-            trend_map[month_key]["sessions"] += int(mi.sessions)
-            trend_map[month_key]["hours"] += float(mi.total_class_hours)
-            trend_map[month_key]["dollars"] += float(mi.total_dollars)
 
-    charts = {
-        "heatmap": [HeatmapPoint(day=k[0], schedule=k[1], hours=v[0], dollars=v[1]) for k, v in heatmap_map.items()],
-        "stacked_by_schedule": [StackedByScheduleItem(schedule=s, **vals) for s, vals in stacked_map.items()],
-        "monthly_trend": [
-            MonthlyTrendItem(
-                month=k,
-                sessions=v["sessions"],
-                hours=float(v["hours"]),
-                dollars=float(v["dollars"]),
-            )
-            for k, v in sorted(trend_map.items())
-        ],
-        "comparative_sections": [],
-        "sections_by_school": [],
-    }
+async def _consolidated_cache_key(
+    *,
+    term_id: int,
+    compare_term_id: int | None,
+    scope_faculty_id: int | None,
+    school_id: int | None,
+    target_school_ids: list[int],
+    term_ids: list[int],
+) -> str | None:
+    """Clave de caché del dashboard consolidado, o ``None`` si Redis no está disponible.
+
+    La clave incluye una versión de los datos del alcance: las cargas activas de los ciclos involucrados con su estado
+    de ingesta y la planilla más reciente (id y fecha de creación/edición) de cada una. Subir una carga, terminar su
+    ingesta, generar, editar o eliminar una planilla cambia la versión, por lo que no hace falta invalidar
+    explícitamente.
+    """
+    if cache.client is None:
+        return None
 
-    # Secciones por modalidad - Ciclo actual
-    current_sections_stmt = (
+    version_rows = await _fetch_all(
         select(
-            AcademicLoadClass.class_type,
-            func.count(distinct(tuple_(AcademicLoadClass.class_section, AcademicLoadClass.subject_code))).label(
-                "count"
-            ),
+            AcademicLoadFile.id,
+            AcademicLoadFile.ingestion_status,
+            func.max(BillingReport.id),
+            func.max(func.coalesce(BillingReport.updated_at, BillingReport.created_at)),
         )
-        .join(AcademicLoadFile)
+        .outerjoin(BillingReport, BillingReport.academic_load_file_id == AcademicLoadFile.id)
         .filter(
             AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
+            AcademicLoadFile.term_id.in_(term_ids),
             AcademicLoadFile.is_active.is_(True),
         )
-        .group_by(AcademicLoadClass.class_type)
+        .group_by(AcademicLoadFile.id, AcademicLoadFile.ingestion_status)
+        .order_by(AcademicLoadFile.id)
     )
-    current_sections_result = await db.execute(current_sections_stmt)
-    current_sections_data = current_sections_result.all()
-
-    # Mapear resultados a modalidades
-    modality_map_current: dict[str, int] = {
-        "Presenciales": 0,
-        "En Línea": 0,
-        "Virtuales": 0,
-    }
-    for row in current_sections_data:
-        modality = _class_type_to_modality(row.class_type)
-        if modality in modality_map_current:
-            modality_map_current[modality] = row.count
+    version = hashlib.sha1(repr([tuple(row) for row in version_rows]).encode()).hexdigest()
+    schools = ",".join(str(sid) for sid in sorted(target_school_ids))
+    return f"dashboard:consolidated:{term_id}:{compare_term_id}:{scope_faculty_id}:{school_id}:{schools}:{version}"
+
+
+async def _director_cache_key(
+    *,
+    school_id: int,
+    term_id: int,
+    file_id: int | None,
+    compare_term_id: int | None,
+) -> str | None:
+    """Clave de caché del dashboard de director, o ``None`` si Redis no está disponible.
+
+    La versión cubre todas las cargas de la escuela (estado de ingesta y si está activa) y la planilla más reciente
+    de cada una, porque el dashboard muestra las versiones del ciclo y compara contra otro ciclo de la escuela.
+    """
+    if cache.client is None:
+        return None
 
-    # Secciones por escuela - Ciclo actual
-    school_sections_stmt = (
+    version_rows = await _fetch_all(
         select(
-            School.acronym,
-            AcademicLoadClass.class_type,
-            func.count(distinct(tuple_(AcademicLoadClass.class_section, AcademicLoadClass.subject_code))).label(
-                "count"
-            ),
-        )
-        .join(
-            AcademicLoadFile,
-            AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
-        )
-        .join(School, AcademicLoadFile.school_id == School.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
+            AcademicLoadFile.id,
+            AcademicLoadFile.ingestion_status,
+            AcademicLoadFile.is_active,
+            func.max(BillingReport.id),
+            func.max(func.coalesce(BillingReport.updated_at, BillingReport.created_at)),
         )
-        .group_by(School.acronym, AcademicLoadClass.class_type)
+        .outerjoin(BillingReport, BillingReport.academic_load_file_id == AcademicLoadFile.id)
+        .filter(AcademicLoadFile.school_id == school_id)
+        .group_by(AcademicLoadFile.id)
+        .order_by(AcademicLoadFile.id)
     )
-    school_sections_result = await db.execute(school_sections_stmt)
-    school_sections_data = school_sections_result.all()
+    version = hashlib.sha1(repr([tuple(row) for row in version_rows]).encode()).hexdigest()
+    return f"dashboard:director:{school_id}:{term_id}:{file_id}:{compare_term_id}:{version}"
 
-    # Inicializar variables para comparación (en caso de que no haya ciclo comparado)
-    modality_map_compare = {"Presenciales": 0, "En Línea": 0, "Virtuales": 0}
-    cmp_school_sections_data = []
 
-    # Recent loads
-    tables = {
-        "recent_loads": [
-            RecentLoad(
-                file_id=f.id,
+async def _get_cached_dashboard(cache_key: str | None) -> bytes | str | None:
+    """Respuesta serializada guardada bajo ``cache_key``; ``None`` si no hay clave, no existe o Redis falla."""
+    if cache_key is None:
+        return None
+    try:
+        return await cache.client.get(cache_key)
+    except Exception:
+        return None
+
+
+async def _set_cached_dashboard(cache_key: str | None, payload: str) -> None:
+    """Guarda la respuesta serializada bajo ``cache_key`` con la expiración de los dashboards."""
+    if cache_key is None:
+        return
+    try:
+        await cache.client.setex(cache_key, _DASHBOARD_CACHE_EXPIRATION, payload)
+    except Exception:
+        # Si Redis falla, la respuesta se sirve igual sin cachear
+        pass
+
+
+async def _build_consolidated_dashboard(
+    db: AsyncSession,
+    *,
+    term_id: int,
+    term_obj: Term,
+    cmp_term_obj: Term | None,
+    scope_faculty_id: int | None,
+    school_id: int | None,
+    target_school_ids: list[int],
+    school_acronyms: list[str],
+    compare_term_id: int | None,
+) -> DirectorDashboardResponse | Response:
+    """Construye el dashboard consolidado de un conjunto de escuelas.
+
+    Compartido por los dashboards de decano y vicerrector, que solo difieren en cómo resuelven las escuelas objetivo.
+    """
+    # Ciclo de comparación: por defecto, el mismo term del año anterior
+    if compare_term_id is None and cmp_term_obj:
+        compare_term_id = cmp_term_obj.id
+    term_ids = [term_id] if compare_term_id is None else [term_id, compare_term_id]
+
+    # Respuesta cacheada para el alcance, válida mientras no cambien sus cargas activas ni sus planillas
+    cache_key = await _consolidated_cache_key(
+        term_id=term_id,
+        compare_term_id=compare_term_id,
+        scope_faculty_id=scope_faculty_id,
+        school_id=school_id,
+        target_school_ids=target_school_ids,
+        term_ids=term_ids,
+    )
+    cached = await _get_cached_dashboard(cache_key)
+    if cached:
+        return json_response(cached)
+
+    # Obtener cargas activas de ambos ciclos en una sola consulta y separarlas por ciclo. Solo se carga la escuela de
+    # cada carga (para nombrarla en la comparación de grupos); el resto de relaciones no se usa.
+    files_stmt = lambda_stmt(
+        lambda: (
+            select(AcademicLoadFile)
+            .options(selectinload(AcademicLoadFile.school).raiseload("*"), raiseload("*"))
+            .filter(
+                AcademicLoadFile.school_id.in_(target_school_ids),
+                AcademicLoadFile.term_id.in_(term_ids),
+                AcademicLoadFile.is_active.is_(True),
+            )
+            .order_by(desc(AcademicLoadFile.upload_date))
+        )
+    )
+    files_result = await db.execute(files_stmt)
+    all_files = files_result.scalars().all()
+    files = [f for f in all_files if f.term_id == term_id]
+    cmp_files = [f for f in all_files if f.term_id == compare_term_id]
+
+    if not files:
+        context = _scope_context(term_id, term_obj, scope_faculty_id, school_id, target_school_ids, school_acronyms)
+        return _empty_dashboard(context, _CONSOLIDATED_CHART_KEYS)
+
+    # Obtener la planilla más reciente de cada archivo de ambos ciclos (DISTINCT ON por archivo)
+    file_ids = {f.id for f in files}
+    cmp_file_ids = {f.id for f in cmp_files}
+    all_file_ids = [f.id for f in all_files]
+    reports_stmt = lambda_stmt(
+        lambda: (
+            select(BillingReport.id, BillingReport.academic_load_file_id, BillingReport.created_at)
+            .distinct(BillingReport.academic_load_file_id)
+            .filter(BillingReport.academic_load_file_id.in_(all_file_ids))
+            .order_by(BillingReport.academic_load_file_id, desc(BillingReport.created_at))
+        )
+    )
+    reports_result = await db.execute(reports_stmt)
+    # Se conservan de la más reciente a la más antigua, el orden en que se consolidan los charts
+    latest_reports = sorted(reports_result.all(), key=lambda r: r.created_at, reverse=True)
+
+    reports_by_file: dict[int, Row] = {
+        r.academic_load_file_id: r for r in latest_reports if r.academic_load_file_id in file_ids
+    }
+    cmp_reports_by_file: dict[int, Row] = {
+        r.academic_load_file_id: r for r in latest_reports if r.academic_load_file_id in cmp_file_ids
+    }
+
+    reports = list(reports_by_file.values())
+
+    if not reports:
+        context = _scope_context(
+            term_id, term_obj, scope_faculty_id, school_id, target_school_ids, school_acronyms, files
+        )
+        return _empty_dashboard(context, _CONSOLIDATED_CHART_KEYS)
+
+    # Consultas independientes (se ejecutan en paralelo). Las de secciones e info de cargas agrupan por term_id para
+    # traer el ciclo actual y el comparado en una sola consulta.
+    # Secciones por modalidad y por escuela en un solo recorrido. Las secciones únicas (asignatura + sección) se
+    # obtienen con un GROUP BY GROUPING SETS sobre columnas planas, a nivel de ciclo y a nivel de ciclo y escuela, y
+    # se cuentan fuera, en lugar de COUNT(DISTINCT (sección, asignatura)). La modalidad se resuelve en SQL, así que
+    # llegan ya agrupadas por modalidad; ``by_school`` (GROUPING de la escuela) distingue ambos niveles.
+    active_classes_filter = (
+        AcademicLoadFile.school_id.in_(target_school_ids),
+        AcademicLoadFile.term_id.in_(term_ids),
+        AcademicLoadFile.is_active.is_(True),
+    )
+    modality = _class_modality_expr()
+    sections = (
+        select(
+            AcademicLoadFile.term_id,
+            School.acronym,
+            modality.label("modality"),
+            (func.grouping(School.acronym) == 0).label("by_school"),
+        )
+        .select_from(AcademicLoadClass)
+        .join(
+            AcademicLoadFile,
+            AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
+        )
+        .join(School, AcademicLoadFile.school_id == School.id)
+        .filter(*active_classes_filter)
+        .group_by(
+            func.grouping_sets(
+                tuple_(
+                    AcademicLoadFile.term_id,
+                    modality,
+                    AcademicLoadClass.class_section,
+                    AcademicLoadClass.subject_code,
+                ),
+                tuple_(
+                    AcademicLoadFile.term_id,
+                    School.acronym,
+                    modality,
+                    AcademicLoadClass.class_section,
+                    AcademicLoadClass.subject_code,
+                ),
+            )
+        )
+        .subquery()
+    )
+    sections_stmt = select(
+        sections.c.term_id,
+        sections.c.acronym,
+        sections.c.modality,
+        sections.c.by_school,
+        func.count().label("count"),
+    ).group_by(sections.c.term_id, sections.c.by_school, sections.c.acronym, sections.c.modality)
+
+    # Tabla de categorías por estado de pago
+    # Agrupar por escuela/facultad y categoría normalizada; el estado de pago se cuenta con SUMs condicionales:
+    # PAG (tasa = 1.0), NO PAG (tasa = 0.0) y PAR (0.0 < tasa < 1.0)
+    category_expr = func.upper(func.trim(AcademicLoadClass.professor_category))
+    payment_rate = AcademicLoadClass.professor_payment_rate
+    category_payment_stmt = (
+        select(
+            School.acronym,
+            category_expr.label("category"),
+            func.sum(case((payment_rate == 1, 1), else_=0)).label("pag"),
+            func.sum(case((payment_rate == 0, 1), else_=0)).label("no_pag"),
+            func.sum(case((and_(payment_rate > 0, payment_rate < 1), 1), else_=0)).label("par"),
+        )
+        .join(
+            AcademicLoadFile,
+            AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
+        )
+        .join(School, AcademicLoadFile.school_id == School.id)
+        .filter(
+            AcademicLoadFile.school_id.in_(target_school_ids),
+            AcademicLoadFile.term_id == term_id,
+            AcademicLoadFile.is_active.is_(True),
+            AcademicLoadClass.professor_category.isnot(None),
+        )
+        .group_by(School.acronym, category_expr)
+    )
+
+    # Reporte mensual por facultad: dólares por facultad y escuela de las planillas vigentes, pivotados por mes
+    # (julio-diciembre) con SUM ... FILTER. El LEFT JOIN conserva las escuelas cuya planilla no tiene items en esos
+    # meses y el orden por la planilla más reciente mantiene el orden de aparición de las escuelas.
+    month_map = {7: "july", 8: "august", 9: "september", 10: "october", 11: "november", 12: "december"}
+    monthly_report_stmt = (
+        select(
+            Faculty.id.label("faculty_id"),
+            Faculty.name.label("faculty_name"),
+            Faculty.acronym.label("faculty_acronym"),
+            School.acronym.label("school_acronym"),
+            *(
+                cast(
+                    func.coalesce(
+                        func.sum(BillingReportMonthlyItem.total_dollars).filter(
+                            BillingReportMonthlyItem.month == month
+                        ),
+                        0,
+                    ),
+                    Float,
+                ).label(month_name)
+                for month, month_name in month_map.items()
+            ),
+        )
+        .select_from(BillingReport)
+        .join(AcademicLoadFile, BillingReport.academic_load_file_id == AcademicLoadFile.id)
+        .join(School, AcademicLoadFile.school_id == School.id)
+        .join(Faculty, School.fk_faculty == Faculty.id)
+        .outerjoin(
+            BillingReportMonthlyItem,
+            and_(
+                BillingReportMonthlyItem.billing_report_id == BillingReport.id,
+                BillingReportMonthlyItem.month.in_(list(month_map)),
+            ),
+        )
+        .filter(BillingReport.id.in_([r.id for r in reports]))
+        .group_by(Faculty.id, Faculty.name, Faculty.acronym, School.acronym)
+        .order_by(desc(func.max(BillingReport.created_at)))
+    )
+
+    # Charts agregados en la base de datos sobre las planillas vigentes. El heatmap y el stacked conservan el orden
+    # de primera aparición al recorrer las planillas de la más reciente a la más antigua (mínimo row_number).
+    report_ids = [r.id for r in reports]
+    cmp_report_ids = [r.id for r in cmp_reports_by_file.values()]
+    items_ranked = (
+        select(
+            BillingReportMonthlyItem.class_days,
+            BillingReportMonthlyItem.class_schedule,
+            BillingReportMonthlyItem.total_class_hours,
+            BillingReportMonthlyItem.total_dollars,
+            func.row_number().over(order_by=(desc(BillingReport.created_at), BillingReportMonthlyItem.id)).label("rn"),
+        )
+        .join(BillingReport, BillingReportMonthlyItem.billing_report_id == BillingReport.id)
+        .filter(BillingReportMonthlyItem.billing_report_id.in_(report_ids))
+        .subquery()
+    )
+    heatmap_stmt = (
+        select(
+            items_ranked.c.class_days,
+            items_ranked.c.class_schedule,
+            cast(func.sum(items_ranked.c.total_class_hours), Float).label("hours"),
+            cast(func.sum(items_ranked.c.total_dollars), Float).label("dollars"),
+        )
+        .group_by(items_ranked.c.class_days, items_ranked.c.class_schedule)
+        .order_by(func.min(items_ranked.c.rn))
+    )
+    summaries_ranked = (
+        select(
+            BillingReportPaymentSummary.class_schedule,
+            BillingReportPaymentSummary.payment_rate_grado,
+            BillingReportPaymentSummary.payment_rate_maestria_1,
+            BillingReportPaymentSummary.payment_rate_maestria_2,
+            BillingReportPaymentSummary.payment_rate_doctor,
+            BillingReportPaymentSummary.payment_rate_bilingue,
+            func.row_number()
+            .over(order_by=(desc(BillingReport.created_at), BillingReportPaymentSummary.id))
+            .label("rn"),
+        )
+        .join(BillingReport, BillingReportPaymentSummary.billing_report_id == BillingReport.id)
+        .filter(BillingReportPaymentSummary.billing_report_id.in_(report_ids))
+        .subquery()
+    )
+    stacked_stmt = (
+        select(
+            summaries_ranked.c.class_schedule,
+            cast(func.sum(summaries_ranked.c.payment_rate_grado), Float).label("GDO"),
+            cast(func.sum(summaries_ranked.c.payment_rate_maestria_1), Float).label("M1"),
+            cast(func.sum(summaries_ranked.c.payment_rate_maestria_2), Float).label("M2"),
+            cast(func.sum(summaries_ranked.c.payment_rate_doctor), Float).label("DR"),
+            cast(func.sum(summaries_ranked.c.payment_rate_bilingue), Float).label("BLG"),
+        )
+        .group_by(summaries_ranked.c.class_schedule)
+        .order_by(func.min(summaries_ranked.c.rn))
+    )
+    trend_stmt = (
+        select(
+            BillingReportMonthlyItem.year,
+            BillingReportMonthlyItem.month,
+            func.sum(BillingReportMonthlyItem.sessions).label("sessions"),
+            cast(func.sum(BillingReportMonthlyItem.total_class_hours), Float).label("hours"),
+            cast(func.sum(BillingReportMonthlyItem.total_dollars), Float).label("dollars"),
+        )
+        .filter(BillingReportMonthlyItem.billing_report_id.in_(report_ids))
+        .group_by(BillingReportMonthlyItem.year, BillingReportMonthlyItem.month)
+        .order_by(BillingReportMonthlyItem.year, BillingReportMonthlyItem.month)
+    )
+
+    # Resúmenes de pago de ambos ciclos para la comparación de grupos, con las tarifas ya convertidas a float
+    payment_summaries_stmt = (
+        select(
+            BillingReport.academic_load_file_id,
+            cast(BillingReportPaymentSummary.payment_rate_grado, Float).label("grado"),
+            cast(BillingReportPaymentSummary.payment_rate_maestria_1, Float).label("maestria_1"),
+            cast(BillingReportPaymentSummary.payment_rate_maestria_2, Float).label("maestria_2"),
+            cast(BillingReportPaymentSummary.payment_rate_doctor, Float).label("doctor"),
+            cast(BillingReportPaymentSummary.payment_rate_bilingue, Float).label("bilingue"),
+        )
+        .join(BillingReport, BillingReportPaymentSummary.billing_report_id == BillingReport.id)
+        .filter(BillingReportPaymentSummary.billing_report_id.in_(report_ids + cmp_report_ids))
+    )
+
+    # Las filas y los KPIs se agrupan en dos gather anidados (todo corre en paralelo) para conservar el tipo de cada
+    # resultado: un solo gather de nueve awaitables distintos se tipa como lista de ``object``
+    row_sets, (kpis, cmp_kpis) = await asyncio.gather(
+        asyncio.gather(
+            _fetch_all(sections_stmt),
+            _fetch_all(category_payment_stmt),
+            _fetch_all(monthly_report_stmt),
+            _fetch_all(heatmap_stmt),
+            _fetch_all(stacked_stmt),
+            _fetch_all(trend_stmt),
+            _fetch_all(payment_summaries_stmt),
+        ),
+        asyncio.gather(_fetch_consolidated_kpis(report_ids), _fetch_consolidated_kpis(cmp_report_ids)),
+    )
+    (
+        all_sections_data,
+        category_payment_data,
+        monthly_report_rows,
+        heatmap_rows,
+        stacked_rows,
+        trend_rows,
+        payment_summary_rows,
+    ) = row_sets
+    total_groups = kpis.paid_groups_full + kpis.paid_groups_partial + kpis.paid_groups_none
+    sections_data = [row for row in all_sections_data if not row.by_school]
+    school_sections_data = [row for row in all_sections_data if row.by_school and row.term_id == term_id]
+    cmp_school_sections_data = [row for row in all_sections_data if row.by_school and row.term_id == compare_term_id]
+
+    # Consolidar charts (dicts planos con los campos de los schemas, como en el dashboard de director)
+    charts = {
+        "heatmap": [
+            {
+                "day": _weekday_label(row.class_days),
+                "schedule": row.class_schedule,
+                "hours": row.hours,
+                "dollars": row.dollars,
+            }
+            for row in heatmap_rows
+        ],
+        "stacked_by_schedule": [
+            {"schedule": row.class_schedule, "GDO": row.GDO, "M1": row.M1, "M2": row.M2, "DR": row.DR, "BLG": row.BLG}
+            for row in stacked_rows
+        ],
+        "monthly_trend": [
+            {
+                "month": f"{row.year}-{row.month:02d}",
+                "sessions": row.sessions,
+                "hours": row.hours,
+                "dollars": row.dollars,
+            }
+            for row in trend_rows
+        ],
+        "comparative_sections": [],
+        "sections_by_school": [],
+    }
+
+    # Mapear resultados a modalidades
+    modality_map_current: dict[str, int] = {
+        "Presenciales": 0,
+        "En Línea": 0,
+        "Virtuales": 0,
+    }
+    modality_map_compare: dict[str, int] = {
+        "Presenciales": 0,
+        "En Línea": 0,
+        "Virtuales": 0,
+    }
+    for row in sections_data:
+        if row.term_id == term_id and row.modality in modality_map_current:
+            modality_map_current[row.modality] = row.count
+        if row.term_id == compare_term_id and row.modality in modality_map_compare:
+            modality_map_compare[row.modality] = row.count
+
+    # Recent loads
+    tables = {
+        "recent_loads": [
+            RecentLoad(
+                file_id=f.id,
                 version=f.version,
                 ingestion_status=f.ingestion_status,
                 upload_date=f.upload_date,
@@ -760,208 +1185,68 @@ async def get_decano_dashboard(
     }
 
     # Context
-    context = DashboardContext(
-        term_id=term_id,
-        term_term=term_obj.term,
-        term_year=term_obj.year,
-        faculty_id=faculty_id,
-        school_ids=target_school_ids if not school_id else None,
-        school_id=school_id,
-        school_acronyms=school_acronyms if not school_id else None,
-        school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
-        file_versions=[
-            {
-                "file_id": f.id,
-                "version": f.version,
-                "ingestion_status": f.ingestion_status,
-                "upload_date": f.upload_date,
-                "is_active": f.is_active,
-            }
-            for f in files
-        ],
-    )
+    context = _scope_context(term_id, term_obj, scope_faculty_id, school_id, target_school_ids, school_acronyms, files)
 
-    # Comparison logic (similar a director)
+    # Comparación contra el ciclo anterior (similar a director)
     comparison = None
     try:
-        if compare_term_id is None and term_obj.year:
-            prev_year_term_obj = (
-                await db.execute(select(Term).filter(Term.term == term_obj.term, Term.year == term_obj.year - 1))
-            ).scalar_one_or_none()
-            if prev_year_term_obj:
-                compare_term_id = prev_year_term_obj.id
-
-        if compare_term_id:
-            # Obtener cargas y reports del ciclo comparado
-            cmp_files_stmt = (
-                select(AcademicLoadFile)
-                .filter(
-                    AcademicLoadFile.school_id.in_(target_school_ids),
-                    AcademicLoadFile.term_id == compare_term_id,
-                    AcademicLoadFile.is_active.is_(True),
-                )
-                .order_by(desc(AcademicLoadFile.upload_date))
-            )
-            cmp_files_result = await db.execute(cmp_files_stmt)
-            cmp_files = cmp_files_result.scalars().all()
-
-            if cmp_files:
-                # Secciones por modalidad - Ciclo comparado
-                cmp_sections_stmt = (
-                    select(
-                        AcademicLoadClass.class_type,
-                        func.count(
-                            distinct(
-                                tuple_(
-                                    AcademicLoadClass.class_section,
-                                    AcademicLoadClass.subject_code,
-                                )
-                            )
-                        ).label("count"),
-                    )
-                    .join(AcademicLoadFile)
-                    .filter(
-                        AcademicLoadFile.school_id.in_(target_school_ids),
-                        AcademicLoadFile.term_id == compare_term_id,
-                        AcademicLoadFile.is_active.is_(True),
-                    )
-                    .group_by(AcademicLoadClass.class_type)
-                )
-                cmp_sections_result = await db.execute(cmp_sections_stmt)
-                cmp_sections_data = cmp_sections_result.all()
-
-                modality_map_compare = {
-                    "Presenciales": 0,
-                    "En Línea": 0,
-                    "Virtuales": 0,
-                }
-                for row in cmp_sections_data:
-                    modality = _class_type_to_modality(row.class_type)
-                    if modality in modality_map_compare:
-                        modality_map_compare[modality] = row.count
-
-                # Secciones por escuela - Ciclo comparado
-                cmp_school_sections_stmt = (
-                    select(
-                        School.acronym,
-                        AcademicLoadClass.class_type,
-                        func.count(
-                            distinct(
-                                tuple_(
-                                    AcademicLoadClass.class_section,
-                                    AcademicLoadClass.subject_code,
-                                )
-                            )
-                        ).label("count"),
-                    )
-                    .join(
-                        AcademicLoadFile,
-                        AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
-                    )
-                    .join(School, AcademicLoadFile.school_id == School.id)
-                    .filter(
-                        AcademicLoadFile.school_id.in_(target_school_ids),
-                        AcademicLoadFile.term_id == compare_term_id,
-                        AcademicLoadFile.is_active.is_(True),
-                    )
-                    .group_by(School.acronym, AcademicLoadClass.class_type)
-                )
-                cmp_school_sections_result = await db.execute(cmp_school_sections_stmt)
-                cmp_school_sections_data = cmp_school_sections_result.all()
+        if compare_term_id and cmp_kpis.has_billing_report:
+            cmp_total_groups = cmp_kpis.paid_groups_full + cmp_kpis.paid_groups_partial + cmp_kpis.paid_groups_none
 
-                cmp_file_ids = [f.id for f in cmp_files]
-                cmp_reports_stmt = (
-                    select(BillingReport)
-                    .filter(BillingReport.academic_load_file_id.in_(cmp_file_ids))
-                    .order_by(desc(BillingReport.created_at))
-                )
-                cmp_reports_result = await db.execute(cmp_reports_stmt)
-                cmp_all_reports = cmp_reports_result.scalars().all()
-
-                cmp_reports_by_file: dict[int, BillingReport] = {}
-                for r in cmp_all_reports:
-                    if r.academic_load_file_id not in cmp_reports_by_file:
-                        cmp_reports_by_file[r.academic_load_file_id] = r
-
-                cmp_reports = list(cmp_reports_by_file.values())
-
-                if cmp_reports:
-                    # Consolidar KPIs del ciclo comparado
-                    cmp_kpis = DashboardKPIs()
-                    cmp_kpis.has_billing_report = True
-                    for r in cmp_reports:
-                        r_kpis = _get_kpis_for_report(r)
-                        cmp_kpis.total_hours += r_kpis.total_hours
-                        cmp_kpis.total_dollars += r_kpis.total_dollars
-                        cmp_kpis.paid_groups_full += r_kpis.paid_groups_full
-                        cmp_kpis.paid_groups_partial += r_kpis.paid_groups_partial
-                        cmp_kpis.paid_groups_none += r_kpis.paid_groups_none
-                    cmp_total_groups = (
-                        cmp_kpis.paid_groups_full + cmp_kpis.paid_groups_partial + cmp_kpis.paid_groups_none
-                    )
-                    cmp_kpis.coverage_rate = (
-                        (cmp_kpis.paid_groups_full + cmp_kpis.paid_groups_partial) / cmp_total_groups
-                        if cmp_total_groups
-                        else 0.0
-                    )
-
-                    cmp_term_obj = (
-                        await db.execute(select(Term).filter(Term.id == compare_term_id))
-                    ).scalar_one_or_none()
-                    cmp_term_label = f"{cmp_term_obj.term:02d}/{cmp_term_obj.year}" if cmp_term_obj else None
-
-                    def _delta(a: float, b: float) -> dict:
-                        abs_val = a - b
-                        pct = (abs_val / b) if b else None
-                        return {"abs": abs_val, "pct": pct}
-
-                    comparison = {
-                        "base": {
-                            "term_id": term_id,
-                            "term_label": f"{context.term_term:02d}/{context.term_year}"
-                            if context.term_term and context.term_year
-                            else None,
-                            "total_hours": kpis.total_hours,
-                            "total_dollars": kpis.total_dollars,
-                            "groups_count": total_groups,
-                            "coverage": {
-                                "full": kpis.paid_groups_full,
-                                "partial": kpis.paid_groups_partial,
-                                "none": kpis.paid_groups_none,
-                            },
-                        },
-                        "compare": {
-                            "term_id": compare_term_id,
-                            "term_label": cmp_term_label,
-                            "total_hours": cmp_kpis.total_hours,
-                            "total_dollars": cmp_kpis.total_dollars,
-                            "groups_count": cmp_total_groups,
-                            "coverage": {
-                                "full": cmp_kpis.paid_groups_full,
-                                "partial": cmp_kpis.paid_groups_partial,
-                                "none": cmp_kpis.paid_groups_none,
-                            },
-                        },
-                        "delta": {
-                            "total_hours": _delta(kpis.total_hours, cmp_kpis.total_hours),
-                            "total_dollars": _delta(kpis.total_dollars, cmp_kpis.total_dollars),
-                            "groups_count": _delta(float(total_groups), float(cmp_total_groups)),
-                            "coverage": {
-                                "full": _delta(
-                                    float(kpis.paid_groups_full),
-                                    float(cmp_kpis.paid_groups_full),
-                                ),
-                                "partial": _delta(
-                                    float(kpis.paid_groups_partial),
-                                    float(cmp_kpis.paid_groups_partial),
-                                ),
-                                "none": _delta(
-                                    float(kpis.paid_groups_none),
-                                    float(cmp_kpis.paid_groups_none),
-                                ),
-                            },
-                        },
-                    }
+            cmp_term_label = f"{cmp_term_obj.term:02d}/{cmp_term_obj.year}" if cmp_term_obj else None
+
+            def _delta(a: float, b: float) -> dict:
+                abs_val = a - b
+                pct = (abs_val / b) if b else None
+                return {"abs": abs_val, "pct": pct}
+
+            comparison = {
+                "base": {
+                    "term_id": term_id,
+                    "term_label": f"{context.term_term:02d}/{context.term_year}"
+                    if context.term_term and context.term_year
+                    else None,
+                    "total_hours": kpis.total_hours,
+                    "total_dollars": kpis.total_dollars,
+                    "groups_count": total_groups,
+                    "coverage": {
+                        "full": kpis.paid_groups_full,
+                        "partial": kpis.paid_groups_partial,
+                        "none": kpis.paid_groups_none,
+                    },
+                },
+                "compare": {
+                    "term_id": compare_term_id,
+                    "term_label": cmp_term_label,
+                    "total_hours": cmp_kpis.total_hours,
+                    "total_dollars": cmp_kpis.total_dollars,
+                    "groups_count": cmp_total_groups,
+                    "coverage": {
+                        "full": cmp_kpis.paid_groups_full,
+                        "partial": cmp_kpis.paid_groups_partial,
+                        "none": cmp_kpis.paid_groups_none,
+                    },
+                },
+                "delta": {
+                    "total_hours": _delta(kpis.total_hours, cmp_kpis.total_hours),
+                    "total_dollars": _delta(kpis.total_dollars, cmp_kpis.total_dollars),
+                    "groups_count": _delta(float(total_groups), float(cmp_total_groups)),
+                    "coverage": {
+                        "full": _delta(
+                            float(kpis.paid_groups_full),
+                            float(cmp_kpis.paid_groups_full),
+                        ),
+                        "partial": _delta(
+                            float(kpis.paid_groups_partial),
+                            float(cmp_kpis.paid_groups_partial),
+                        ),
+                        "none": _delta(
+                            float(kpis.paid_groups_none),
+                            float(cmp_kpis.paid_groups_none),
+                        ),
+                    },
+                },
+            }
     except Exception:
         comparison = None
 
@@ -978,231 +1263,84 @@ async def get_decano_dashboard(
 
     # Construir datos para gráfico por escuela
     # Agrupar por escuela y modalidad
-    school_modality_map: dict[tuple[str, str], dict[str, int]] = {}
+    # {(escuela, modalidad): [ciclo actual, ciclo comparado]}
+    school_modality_map: defaultdict[tuple[str, str], list[int]] = defaultdict(lambda: [0, 0])
     for row in school_sections_data:
-        modality = _class_type_to_modality(row.class_type)
-        key = (row.acronym, modality)
-        if key not in school_modality_map:
-            school_modality_map[key] = {"current": 0, "compare": 0}
-        school_modality_map[key]["current"] = row.count
+        school_modality_map[(row.acronym, row.modality)][0] = row.count
 
     # Agregar datos del ciclo comparado si existen
     for row in cmp_school_sections_data:
-        modality = _class_type_to_modality(row.class_type)
-        key = (row.acronym, modality)
-        if key not in school_modality_map:
-            school_modality_map[key] = {"current": 0, "compare": 0}
-        school_modality_map[key]["compare"] = row.count
+        school_modality_map[(row.acronym, row.modality)][1] = row.count
 
     # Convertir a lista de SectionsBySchoolItem
     sections_by_school: list[SectionsBySchoolItem] = []
-    for (school_acronym, modality), counts in school_modality_map.items():
+    for (school_acronym, modality_label), (cycle_current, cycle_compare) in school_modality_map.items():
         sections_by_school.append(
             SectionsBySchoolItem(
                 school_acronym=school_acronym,
-                modality=modality,
-                cycle_current=counts["current"],
-                cycle_compare=counts["compare"],
+                modality=modality_label,
+                cycle_current=cycle_current,
+                cycle_compare=cycle_compare,
             )
         )
     charts["sections_by_school"] = sections_by_school
 
     # Tabla de categorías por estado de pago
-    # Agrupar por escuela/facultad, categoría y estado de pago
-    category_payment_stmt = (
-        select(
-            School.acronym,
-            AcademicLoadClass.professor_category,
-            AcademicLoadClass.professor_payment_rate,
-            func.count(AcademicLoadClass.id).label("count"),
-        )
-        .join(
-            AcademicLoadFile,
-            AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
-        )
-        .join(School, AcademicLoadFile.school_id == School.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-            AcademicLoadClass.professor_category.isnot(None),
-        )
-        .group_by(
-            School.acronym,
-            AcademicLoadClass.professor_category,
-            AcademicLoadClass.professor_payment_rate,
-        )
-    )
-    category_payment_result = await db.execute(category_payment_stmt)
-    category_payment_data = category_payment_result.all()
 
-    # Agrupar por escuela y categoría
-    school_category_map: dict[tuple[str, str], dict[str, int]] = {}
+    # Agrupar por escuela y categoría. Cada escuela arranca con todas las categorías de la tabla en cero y en su
+    # orden; las categorías no previstas se agregan al final en orden de aparición.
+    categories_order = ["DEC", "DIR", "CAT/COOR", "DTC", "ADM", "DHC"]
+    school_categories: dict[str, dict[str, CategoryPaymentItem]] = {}
     for row in category_payment_data:
-        category = row.professor_category.upper().strip()
+        category = row.category
         # Mapear COOR a CAT/COOR para la tabla
         if category == "COOR":
             category = "CAT/COOR"
 
-        payment_rate = float(row.professor_payment_rate)
-        key = (row.acronym, category)
-
-        if key not in school_category_map:
-            school_category_map[key] = {"pag": 0, "no_pag": 0, "par": 0}
-
-        if payment_rate == 1.0:
-            school_category_map[key]["pag"] += row.count
-        elif payment_rate == 0.0:
-            school_category_map[key]["no_pag"] += row.count
-        elif 0.0 < payment_rate < 1.0:
-            school_category_map[key]["par"] += row.count
-
-    # Construir lista de CategoryPaymentItem por escuela
-    category_payment_by_school: dict[str, list[CategoryPaymentItem]] = {}
-    categories_order = ["DEC", "DIR", "CAT/COOR", "DTC", "ADM", "DHC"]
-
-    for (school_acronym, category), counts in school_category_map.items():
-        if school_acronym not in category_payment_by_school:
-            category_payment_by_school[school_acronym] = []
-
-        category_payment_by_school[school_acronym].append(
-            CategoryPaymentItem(
-                category=category,
-                pag=counts["pag"],
-                no_pag=counts["no_pag"],
-                par=counts["par"],
-            )
-        )
+        categories = school_categories.get(row.acronym)
+        if categories is None:
+            categories = school_categories[row.acronym] = {
+                cat: CategoryPaymentItem(category=cat, pag=0, no_pag=0, par=0) for cat in categories_order
+            }
+        item = categories.get(category)
+        if item is None:
+            item = categories[category] = CategoryPaymentItem(category=category, pag=0, no_pag=0, par=0)
 
-    # Asegurar que todas las categorías estén presentes para cada escuela
-    for school_acronym in category_payment_by_school:
-        existing_categories = {item.category for item in category_payment_by_school[school_acronym]}
-        for cat in categories_order:
-            if cat not in existing_categories:
-                category_payment_by_school[school_acronym].append(
-                    CategoryPaymentItem(category=cat, pag=0, no_pag=0, par=0)
-                )
-        # Ordenar según el orden definido
-        category_payment_by_school[school_acronym].sort(
-            key=lambda x: categories_order.index(x.category) if x.category in categories_order else 999
-        )
+        item.pag += row.pag
+        item.no_pag += row.no_pag
+        item.par += row.par
 
+    category_payment_by_school = {
+        school_acronym: list(categories.values()) for school_acronym, categories in school_categories.items()
+    }
     tables["category_payment"] = category_payment_by_school
 
     # Reporte mensual por facultad (solo para vicerrector)
-    # Obtener todos los monthly_items de los reportes de facturación para las escuelas seleccionadas
-    from ...models.faculty import Faculty
-
-    monthly_report_data: dict[int, dict[str, dict[str, float]]] = {}  # {faculty_id: {school_acronym: {month: dollars}}}
+    school_items_by_faculty: dict[int, list[MonthlyReportSchoolItem]] = {}  # {faculty_id: [escuelas]}
     faculty_info: dict[int, dict[str, str]] = {}  # {faculty_id: {"name": ..., "acronym": ...}}
-
-    # Obtener reportes de facturación para las escuelas seleccionadas
-    reports_stmt = (
-        select(BillingReport)
-        .join(AcademicLoadFile, BillingReport.academic_load_file_id == AcademicLoadFile.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-        )
-        .order_by(desc(BillingReport.created_at))
-    )
-    reports_result = await db.execute(reports_stmt)
-    all_reports = reports_result.scalars().all()
-
-    # Obtener el reporte más reciente por archivo
-    reports_by_file: dict[int, BillingReport] = {}
-    for r in all_reports:
-        if r.academic_load_file_id not in reports_by_file:
-            reports_by_file[r.academic_load_file_id] = r
-
-    # Obtener archivos para mapear escuela -> facultad
-    files_stmt = (
-        select(AcademicLoadFile, School, Faculty)
-        .join(School, AcademicLoadFile.school_id == School.id)
-        .join(Faculty, School.fk_faculty == Faculty.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-        )
-    )
-    files_result = await db.execute(files_stmt)
-    files_data = files_result.all()
-
-    # Mapeo de file_id -> (school_acronym, faculty_id, faculty_name, faculty_acronym)
-    file_to_info: dict[int, tuple[str, int, str, str]] = {}
-    for file_row, school_obj, faculty_obj in files_data:
-        file_to_info[file_row.id] = (
-            school_obj.acronym,
-            faculty_obj.id,
-            faculty_obj.name,
-            faculty_obj.acronym,
+    faculty_totals: dict[int, dict[str, float]] = {}  # {faculty_id: {month: dollars}}
+
+    # Las filas ya vienen pivotadas por (facultad, escuela); los totales por facultad se acumulan en la misma pasada
+    for row in monthly_report_rows:
+        if row.faculty_id not in school_items_by_faculty:
+            school_items_by_faculty[row.faculty_id] = []
+            faculty_info[row.faculty_id] = {"name": row.faculty_name, "acronym": row.faculty_acronym}
+            faculty_totals[row.faculty_id] = dict.fromkeys(month_map.values(), 0.0)
+
+        months_data = {month_name: row._mapping[month_name] for month_name in month_map.values()}
+        school_items_by_faculty[row.faculty_id].append(
+            MonthlyReportSchoolItem(school_acronym=row.school_acronym, **months_data, total=sum(months_data.values()))
         )
-
-    # Procesar monthly_items
-    month_map = {7: "july", 8: "august", 9: "september", 10: "october", 11: "november", 12: "december"}
-
-    for file_id, report in reports_by_file.items():
-        if file_id not in file_to_info:
-            continue
-
-        school_acronym, faculty_id, faculty_name, faculty_acronym = file_to_info[file_id]
-
-        # Inicializar estructuras si no existen
-        if faculty_id not in monthly_report_data:
-            monthly_report_data[faculty_id] = {}
-            faculty_info[faculty_id] = {"name": faculty_name, "acronym": faculty_acronym}
-
-        if school_acronym not in monthly_report_data[faculty_id]:
-            monthly_report_data[faculty_id][school_acronym] = {
-                "july": 0.0,
-                "august": 0.0,
-                "september": 0.0,
-                "october": 0.0,
-                "november": 0.0,
-                "december": 0.0,
-            }
-
-        # Sumar monthly_items
-        for mi in report.monthly_items:
-            if mi.month in month_map:
-                month_key = month_map[mi.month]
-                monthly_report_data[faculty_id][school_acronym][month_key] += float(mi.total_dollars)
+        totals = faculty_totals[row.faculty_id]
+        for month_name, dollars in months_data.items():
+            totals[month_name] += dollars
 
     # Construir MonthlyReportByFaculty
     monthly_reports_by_faculty: list[MonthlyReportByFaculty] = []
-    for faculty_id, schools_data in monthly_report_data.items():
+    for faculty_id, school_items in school_items_by_faculty.items():
         faculty_name = faculty_info[faculty_id]["name"]
         faculty_acronym = faculty_info[faculty_id]["acronym"]
 
-        # Construir lista de escuelas
-        school_items: list[MonthlyReportSchoolItem] = []
-        for school_acronym, months_data in schools_data.items():
-            total = sum(months_data.values())
-            school_items.append(
-                MonthlyReportSchoolItem(
-                    school_acronym=school_acronym,
-                    july=months_data["july"],
-                    august=months_data["august"],
-                    september=months_data["september"],
-                    october=months_data["october"],
-                    november=months_data["november"],
-                    december=months_data["december"],
-                    total=total,
-                )
-            )
-
-        # Calcular totales mensuales para la facultad
-        monthly_totals = {
-            "july": sum(s.july for s in school_items),
-            "august": sum(s.august for s in school_items),
-            "september": sum(s.september for s in school_items),
-            "october": sum(s.october for s in school_items),
-            "november": sum(s.november for s in school_items),
-            "december": sum(s.december for s in school_items),
-        }
-
         # Calcular diferencias (por ahora vacío, se puede usar para comparar con otro período)
         monthly_differences = {}
 
@@ -1212,7 +1350,7 @@ async def get_decano_dashboard(
                 faculty_name=faculty_name,
                 faculty_acronym=faculty_acronym,
                 schools=school_items,
-                monthly_totals=monthly_totals,
+                monthly_totals=faculty_totals[faculty_id],
                 monthly_differences=monthly_differences,
             )
         )
@@ -1220,174 +1358,93 @@ async def get_decano_dashboard(
     # Ordenar por faculty_id
     monthly_reports_by_faculty.sort(key=lambda x: x.faculty_id)
 
-    tables["monthly_report_by_faculty"] = [mr.model_dump() for mr in monthly_reports_by_faculty]
+    tables["monthly_report_by_faculty"] = monthly_reports_by_faculty
 
     # Comparación de grupos pagados/no pagados por escuela entre dos ciclos
     groups_comparison_by_school: list[GroupsComparisonBySchoolItem] = []
-    if compare_term_id:
-        # Obtener archivos del ciclo comparado
-        cmp_files_stmt = (
-            select(AcademicLoadFile)
-            .filter(
-                AcademicLoadFile.school_id.in_(target_school_ids),
-                AcademicLoadFile.term_id == compare_term_id,
-                AcademicLoadFile.is_active.is_(True),
-            )
-            .order_by(desc(AcademicLoadFile.upload_date))
-        )
-        cmp_files_result = await db.execute(cmp_files_stmt)
-        cmp_files = cmp_files_result.scalars().all()
-
-        if cmp_files:
-            cmp_file_ids = [f.id for f in cmp_files]
-            cmp_reports_stmt = (
-                select(BillingReport)
-                .filter(BillingReport.academic_load_file_id.in_(cmp_file_ids))
-                .order_by(desc(BillingReport.created_at))
-            )
-            cmp_reports_result = await db.execute(cmp_reports_stmt)
-            cmp_all_reports = cmp_reports_result.scalars().all()
-
-            cmp_reports_by_file: dict[int, BillingReport] = {}
-            for r in cmp_all_reports:
-                if r.academic_load_file_id not in cmp_reports_by_file:
-                    cmp_reports_by_file[r.academic_load_file_id] = r
-
-            # Obtener mapeo de file_id -> school_acronym y school_name para ambos ciclos
-            base_files_stmt = (
-                select(AcademicLoadFile, School)
-                .join(School, AcademicLoadFile.school_id == School.id)
-                .filter(
-                    AcademicLoadFile.school_id.in_(target_school_ids),
-                    AcademicLoadFile.term_id == term_id,
-                    AcademicLoadFile.is_active.is_(True),
-                )
-            )
-            base_files_result = await db.execute(base_files_stmt)
-            base_files_data = base_files_result.all()
-
-            cmp_files_stmt_with_school = (
-                select(AcademicLoadFile, School)
-                .join(School, AcademicLoadFile.school_id == School.id)
-                .filter(
-                    AcademicLoadFile.school_id.in_(target_school_ids),
-                    AcademicLoadFile.term_id == compare_term_id,
-                    AcademicLoadFile.is_active.is_(True),
-                )
-            )
-            cmp_files_result_with_school = await db.execute(cmp_files_stmt_with_school)
-            cmp_files_data = cmp_files_result_with_school.all()
-
-            # Mapeo file_id -> (school_acronym, school_name)
-            base_file_to_school: dict[int, tuple[str, str]] = {}
-            for file_row, school_obj in base_files_data:
-                base_file_to_school[file_row.id] = (school_obj.acronym, school_obj.name)
-
-            cmp_file_to_school: dict[int, tuple[str, str]] = {}
-            for file_row, school_obj in cmp_files_data:
-                cmp_file_to_school[file_row.id] = (school_obj.acronym, school_obj.name)
-
-            # Calcular grupos por escuela para ciclo base
-            base_school_groups: dict[
-                str, dict[str, float]
-            ] = {}  # {school_acronym: {"paid": 0.0, "unpaid": 0.0, "total": 0.0}}
-            for file_id, report in reports_by_file.items():
-                if file_id not in base_file_to_school:
-                    continue
-                school_acronym, school_name = base_file_to_school[file_id]
-
-                if school_acronym not in base_school_groups:
-                    base_school_groups[school_acronym] = {"paid": 0.0, "unpaid": 0.0, "total": 0.0}
-
-                for ps in report.payment_summaries:
-                    rates = [
-                        float(ps.payment_rate_grado),
-                        float(ps.payment_rate_maestria_1),
-                        float(ps.payment_rate_maestria_2),
-                        float(ps.payment_rate_doctor),
-                        float(ps.payment_rate_bilingue),
-                    ]
-                    s = sum(rates)
-                    base_school_groups[school_acronym]["total"] += 1.0
-                    if s >= 1.0:
-                        base_school_groups[school_acronym]["paid"] += 1.0
-                    elif s == 0.0:
-                        base_school_groups[school_acronym]["unpaid"] += 1.0
-
-            # Calcular grupos por escuela para ciclo comparado
-            cmp_school_groups: dict[str, dict[str, float]] = {}
-            for file_id, report in cmp_reports_by_file.items():
-                if file_id not in cmp_file_to_school:
+    if compare_term_id and cmp_files:
+        # Mapeo file_id -> (school_acronym, school_name) para ambos ciclos
+        base_file_to_school: dict[int, tuple[str, str]] = {f.id: (f.school.acronym, f.school.name) for f in files}
+        cmp_file_to_school: dict[int, tuple[str, str]] = {f.id: (f.school.acronym, f.school.name) for f in cmp_files}
+
+        # Calcular grupos por escuela para ambos ciclos
+        # {school_acronym: [pagados, no pagados, total]}
+        base_school_groups: dict[str, list[float]] = {}
+        cmp_school_groups: dict[str, list[float]] = {}
+        for file_id in reports_by_file:
+            if file_id in base_file_to_school:
+                base_school_groups.setdefault(base_file_to_school[file_id][0], [0.0, 0.0, 0.0])
+        for file_id in cmp_reports_by_file:
+            if file_id in cmp_file_to_school:
+                cmp_school_groups.setdefault(cmp_file_to_school[file_id][0], [0.0, 0.0, 0.0])
+
+        for ps in payment_summary_rows:
+            s = ps.grado + ps.maestria_1 + ps.maestria_2 + ps.doctor + ps.bilingue
+            for file_to_school, school_groups in (
+                (base_file_to_school, base_school_groups),
+                (cmp_file_to_school, cmp_school_groups),
+            ):
+                if ps.academic_load_file_id not in file_to_school:
                     continue
-                school_acronym, school_name = cmp_file_to_school[file_id]
-
-                if school_acronym not in cmp_school_groups:
-                    cmp_school_groups[school_acronym] = {"paid": 0.0, "unpaid": 0.0, "total": 0.0}
-
-                for ps in report.payment_summaries:
-                    rates = [
-                        float(ps.payment_rate_grado),
-                        float(ps.payment_rate_maestria_1),
-                        float(ps.payment_rate_maestria_2),
-                        float(ps.payment_rate_doctor),
-                        float(ps.payment_rate_bilingue),
-                    ]
-                    s = sum(rates)
-                    cmp_school_groups[school_acronym]["total"] += 1.0
-                    if s >= 1.0:
-                        cmp_school_groups[school_acronym]["paid"] += 1.0
-                    elif s == 0.0:
-                        cmp_school_groups[school_acronym]["unpaid"] += 1.0
-
-            # Construir lista de comparación (incluir todas las escuelas que aparecen en cualquier ciclo)
-            all_schools = set(base_school_groups.keys()) | set(cmp_school_groups.keys())
-            school_info_map: dict[str, str] = {}  # {school_acronym: school_name}
-            for file_id, (acronym, name) in base_file_to_school.items():
-                if acronym not in school_info_map:
-                    school_info_map[acronym] = name
-            for file_id, (acronym, name) in cmp_file_to_school.items():
-                if acronym not in school_info_map:
-                    school_info_map[acronym] = name
-
-            for school_acronym in sorted(all_schools):
-                base_data = base_school_groups.get(school_acronym, {"paid": 0.0, "unpaid": 0.0, "total": 0.0})
-                cmp_data = cmp_school_groups.get(school_acronym, {"paid": 0.0, "unpaid": 0.0, "total": 0.0})
-
-                groups_comparison_by_school.append(
-                    GroupsComparisonBySchoolItem(
-                        school_acronym=school_acronym,
-                        school_name=school_info_map.get(school_acronym),
-                        base_paid=base_data["paid"],
-                        base_unpaid=base_data["unpaid"],
-                        base_total=base_data["total"],
-                        compare_paid=cmp_data["paid"],
-                        compare_unpaid=cmp_data["unpaid"],
-                        compare_total=cmp_data["total"],
-                    )
+                groups = school_groups[file_to_school[ps.academic_load_file_id][0]]
+                groups[2] += 1.0
+                if s >= 1.0:
+                    groups[0] += 1.0
+                elif s == 0.0:
+                    groups[1] += 1.0
+
+        # Construir lista de comparación (incluir todas las escuelas que aparecen en cualquier ciclo)
+        all_schools = set(base_school_groups.keys()) | set(cmp_school_groups.keys())
+        school_info_map: dict[str, str] = {}  # {school_acronym: school_name}
+        for file_id, (acronym, name) in base_file_to_school.items():
+            if acronym not in school_info_map:
+                school_info_map[acronym] = name
+        for file_id, (acronym, name) in cmp_file_to_school.items():
+            if acronym not in school_info_map:
+                school_info_map[acronym] = name
+
+        for school_acronym in sorted(all_schools):
+            base_paid, base_unpaid, base_total = base_school_groups.get(school_acronym, (0.0, 0.0, 0.0))
+            cmp_paid, cmp_unpaid, cmp_total = cmp_school_groups.get(school_acronym, (0.0, 0.0, 0.0))
+
+            groups_comparison_by_school.append(
+                GroupsComparisonBySchoolItem(
+                    school_acronym=school_acronym,
+                    school_name=school_info_map.get(school_acronym),
+                    base_paid=base_paid,
+                    base_unpaid=base_unpaid,
+                    base_total=base_total,
+                    compare_paid=cmp_paid,
+                    compare_unpaid=cmp_unpaid,
+                    compare_total=cmp_total,
                 )
+            )
 
-    tables["groups_comparison_by_school"] = [g.model_dump() for g in groups_comparison_by_school]
+    tables["groups_comparison_by_school"] = groups_comparison_by_school
 
-    return DirectorDashboardResponse(context=context, kpis=kpis, charts=charts, tables=tables, comparison=comparison)
+    response = DirectorDashboardResponse(
+        context=context, kpis=kpis, charts=charts, tables=tables, comparison=comparison
+    )
+    payload = response.model_dump_json()
+    await _set_cached_dashboard(cache_key, payload)
+    return json_response(payload)
 
 
-@router.get("/dashboards/vicerrector", response_model=DirectorDashboardResponse)
-async def get_vicerrector_dashboard(
+@router.get("/dashboards/decano", response_model=DirectorDashboardResponse)
+async def get_decano_dashboard(
     current_user: Annotated[dict, Depends(get_current_user)],
     db: AsyncSession = Depends(async_get_db),
     term_id: int = Query(...),
-    faculty_id: int | None = Query(None, description="ID de facultad para filtrar; si no se envía, consolida todas"),
     school_id: int | None = Query(None, description="ID de escuela para filtrar; si no se envía, consolida todas"),
     compare_term_id: int | None = Query(
         None,
         description=("Term ID para comparar; si no se envía, " "usa mismo term del año anterior si existe"),
     ),
-) -> DirectorDashboardResponse:
-    """Dashboard para Vicerrectores.
+) -> DirectorDashboardResponse | Response:
+    """Dashboard para Decanos.
 
-    - Si faculty_id es None: consolida datos de todas las facultades.
-    - Si faculty_id está especificado pero school_id es None: consolida todas las escuelas de esa facultad.
-    - Si ambos están especificados: muestra solo esa escuela.
+    - Consolida datos de todas las escuelas de la facultad del decano.
+    - Si se proporciona school_id, filtra solo esa escuela.
     - Por defecto compara con el consolidado del mismo ciclo del año anterior.
     """
 
@@ -1395,19 +1452,95 @@ async def get_vicerrector_dashboard(
     if isinstance(user_role, str):
         user_role = UserRoleEnum(user_role)
 
-    if user_role != UserRoleEnum.VICERRECTOR:
-        raise HTTPException(status_code=403, detail="Solo disponible para vicerrectores")
+    if user_role != UserRoleEnum.DECANO:
+        raise HTTPException(status_code=403, detail="Solo disponible para decanos")
 
-    # Obtener facultades y escuelas según los filtros
-    from ...models.faculty import Faculty
+    scope = await get_user_scope_filters(db=db, user_uuid=current_user.get("user_uuid"), user_role=user_role)
+    faculty_id: int | None = scope.get("faculty_id")
+    if not faculty_id:
+        raise HTTPException(status_code=403, detail="No tienes una facultad asignada")
+
+    # Obtener escuelas de la facultad. Se seleccionan columnas y no entidades: Faculty.schools y School.faculty son
+    # lazy="selectin" y cargar las entidades dispararía consultas extra que el dashboard no usa.
+    faculty_found = (await db.execute(select(Faculty.id).filter(Faculty.id == faculty_id))).scalar_one_or_none()
+    if faculty_found is None:
+        raise HTTPException(status_code=404, detail="Facultad no encontrada")
 
+    # Si se especifica school_id, validar que pertenezca a la facultad
+    target_school_ids: list[int] = []
+    if school_id:
+        school_acronym = (
+            await db.execute(select(School.acronym).filter(School.id == school_id, School.fk_faculty == faculty_id))
+        ).scalar_one_or_none()
+        if school_acronym is None:
+            raise HTTPException(status_code=403, detail="Escuela no pertenece a tu facultad")
+        target_school_ids = [school_id]
+        school_acronyms = [school_acronym]
+    else:
+        # Obtener todas las escuelas de la facultad
+        schools_stmt = select(School.id, School.acronym).filter(
+            School.fk_faculty == faculty_id, School.is_active.is_(True)
+        )
+        schools = (await db.execute(schools_stmt)).all()
+        target_school_ids = [s.id for s in schools]
+        school_acronyms = [s.acronym for s in schools]
+
+    # Obtener term info (y el ciclo de comparación)
+    term_obj, cmp_term_obj = await _fetch_terms(term_id, compare_term_id)
+    if not term_obj:
+        raise HTTPException(status_code=404, detail="Ciclo no encontrado")
+
+    return await _build_consolidated_dashboard(
+        db,
+        term_id=term_id,
+        term_obj=term_obj,
+        cmp_term_obj=cmp_term_obj,
+        scope_faculty_id=faculty_id,
+        school_id=school_id,
+        target_school_ids=target_school_ids,
+        school_acronyms=school_acronyms,
+        compare_term_id=compare_term_id,
+    )
+
+
+@router.get("/dashboards/vicerrector", response_model=DirectorDashboardResponse)
+async def get_vicerrector_dashboard(
+    current_user: Annotated[dict, Depends(get_current_user)],
+    db: AsyncSession = Depends(async_get_db),
+    term_id: int = Query(...),
+    faculty_id: int | None = Query(None, description="ID de facultad para filtrar; si no se envía, consolida todas"),
+    school_id: int | None = Query(None, description="ID de escuela para filtrar; si no se envía, consolida todas"),
+    compare_term_id: int | None = Query(
+        None,
+        description=("Term ID para comparar; si no se envía, " "usa mismo term del año anterior si existe"),
+    ),
+) -> DirectorDashboardResponse | Response:
+    """Dashboard para Vicerrectores.
+
+    - Si faculty_id es None: consolida datos de todas las facultades.
+    - Si faculty_id está especificado pero school_id es None: consolida todas las escuelas de esa facultad.
+    - Si ambos están especificados: muestra solo esa escuela.
+    - Por defecto compara con el consolidado del mismo ciclo del año anterior.
+    """
+
+    user_role = current_user.get("role")
+    if isinstance(user_role, str):
+        user_role = UserRoleEnum(user_role)
+
+    if user_role != UserRoleEnum.VICERRECTOR:
+        raise HTTPException(status_code=403, detail="Solo disponible para vicerrectores")
+
+    # Obtener facultades y escuelas según los filtros
     target_school_ids: list[int] = []
     school_acronyms: list[str] = []
     target_faculty_id: int | None = None
 
+    # Se seleccionan columnas y no entidades para no disparar las cargas selectin de Faculty.schools / School.faculty
     if school_id:
         # Si se especifica school_id, validar que exista y obtener su facultad
-        school_obj = (await db.execute(select(School).filter(School.id == school_id))).scalar_one_or_none()
+        school_obj = (
+            await db.execute(select(School.acronym, School.fk_faculty).filter(School.id == school_id))
+        ).one_or_none()
         if not school_obj:
             raise HTTPException(status_code=404, detail="Escuela no encontrada")
         if faculty_id and school_obj.fk_faculty != faculty_id:
@@ -1417,880 +1550,41 @@ async def get_vicerrector_dashboard(
         target_faculty_id = school_obj.fk_faculty
     elif faculty_id:
         # Si solo se especifica faculty_id, obtener todas las escuelas de esa facultad
-        faculty_obj = (await db.execute(select(Faculty).filter(Faculty.id == faculty_id))).scalar_one_or_none()
-        if not faculty_obj:
+        faculty_found = (await db.execute(select(Faculty.id).filter(Faculty.id == faculty_id))).scalar_one_or_none()
+        if faculty_found is None:
             raise HTTPException(status_code=404, detail="Facultad no encontrada")
-        schools_stmt = select(School).filter(School.fk_faculty == faculty_id, School.is_active.is_(True))
-        schools_result = await db.execute(schools_stmt)
-        schools = schools_result.scalars().all()
+        schools_stmt = select(School.id, School.acronym).filter(
+            School.fk_faculty == faculty_id, School.is_active.is_(True)
+        )
+        schools = (await db.execute(schools_stmt)).all()
         target_school_ids = [s.id for s in schools]
         school_acronyms = [s.acronym for s in schools]
         target_faculty_id = faculty_id
     else:
         # Si no se especifica ninguno, obtener todas las escuelas de todas las facultades
-        schools_stmt = select(School).filter(School.is_active.is_(True))
-        schools_result = await db.execute(schools_stmt)
-        schools = schools_result.scalars().all()
+        schools_stmt = select(School.id, School.acronym).filter(School.is_active.is_(True))
+        schools = (await db.execute(schools_stmt)).all()
         target_school_ids = [s.id for s in schools]
         school_acronyms = [s.acronym for s in schools]
         target_faculty_id = None
 
-    if not target_school_ids:
-        # Obtener term info
-        term_obj = (await db.execute(select(Term).filter(Term.id == term_id))).scalar_one_or_none()
-        if not term_obj:
-            raise HTTPException(status_code=404, detail="Ciclo no encontrado")
-
-        context = DashboardContext(
-            term_id=term_id,
-            term_term=term_obj.term,
-            term_year=term_obj.year,
-            faculty_id=target_faculty_id,
-            school_ids=target_school_ids if not school_id else None,
-            school_id=school_id,
-            school_acronyms=school_acronyms if not school_id else None,
-            school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
-            file_versions=[],
-        )
-        return DirectorDashboardResponse(
-            context=context,
-            kpis=DashboardKPIs(),
-            charts={"heatmap": [], "stacked_by_schedule": [], "monthly_trend": []},
-            tables={"recent_loads": []},
-        )
-
-    # Obtener term info
-    term_obj = (await db.execute(select(Term).filter(Term.id == term_id))).scalar_one_or_none()
+    # Obtener term info (y el ciclo de comparación)
+    term_obj, cmp_term_obj = await _fetch_terms(term_id, compare_term_id)
     if not term_obj:
         raise HTTPException(status_code=404, detail="Ciclo no encontrado")
 
-    # Obtener cargas activas más recientes por escuela
-    files_stmt = (
-        select(AcademicLoadFile)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-        )
-        .order_by(desc(AcademicLoadFile.upload_date))
-    )
-    files_result = await db.execute(files_stmt)
-    files = files_result.scalars().all()
-
-    if not files:
-        context = DashboardContext(
-            term_id=term_id,
-            term_term=term_obj.term,
-            term_year=term_obj.year,
-            faculty_id=target_faculty_id,
-            school_ids=target_school_ids if not school_id else None,
-            school_id=school_id,
-            school_acronyms=school_acronyms if not school_id else None,
-            school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
-            file_versions=[],
-        )
-        return DirectorDashboardResponse(
-            context=context,
-            kpis=DashboardKPIs(),
-            charts={"heatmap": [], "stacked_by_schedule": [], "monthly_trend": []},
-            tables={"recent_loads": []},
-        )
-
-    # Obtener billing reports más recientes por archivo
-    file_ids = [f.id for f in files]
-    reports_stmt = (
-        select(BillingReport)
-        .filter(BillingReport.academic_load_file_id.in_(file_ids))
-        .order_by(desc(BillingReport.created_at))
-    )
-    reports_result = await db.execute(reports_stmt)
-    all_reports = reports_result.scalars().all()
-
-    # Agrupar por file_id y tomar el más reciente de cada uno
-    reports_by_file: dict[int, BillingReport] = {}
-    for r in all_reports:
-        if r.academic_load_file_id not in reports_by_file:
-            reports_by_file[r.academic_load_file_id] = r
-
-    reports = list(reports_by_file.values())
-
-    if not reports:
-        context = DashboardContext(
-            term_id=term_id,
-            term_term=term_obj.term,
-            term_year=term_obj.year,
-            faculty_id=target_faculty_id,
-            school_ids=target_school_ids if not school_id else None,
-            school_id=school_id,
-            school_acronyms=school_acronyms if not school_id else None,
-            school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
-            file_versions=[
-                {
-                    "file_id": f.id,
-                    "version": f.version,
-                    "ingestion_status": f.ingestion_status,
-                    "upload_date": f.upload_date,
-                    "is_active": f.is_active,
-                }
-                for f in files
-            ],
-        )
-        return DirectorDashboardResponse(
-            context=context,
-            kpis=DashboardKPIs(),
-            charts={"heatmap": [], "stacked_by_schedule": [], "monthly_trend": []},
-            tables={"recent_loads": []},
-        )
-
-    # Consolidar KPIs
-    kpis = DashboardKPIs()
-    kpis.has_billing_report = True
-    for r in reports:
-        r_kpis = _get_kpis_for_report(r)
-        kpis.total_hours += r_kpis.total_hours
-        kpis.total_dollars += r_kpis.total_dollars
-        kpis.paid_groups_full += r_kpis.paid_groups_full
-        kpis.paid_groups_partial += r_kpis.paid_groups_partial
-        kpis.paid_groups_none += r_kpis.paid_groups_none
-    total_groups = kpis.paid_groups_full + kpis.paid_groups_partial + kpis.paid_groups_none
-    kpis.coverage_rate = (kpis.paid_groups_full + kpis.paid_groups_partial) / total_groups if total_groups else 0.0
-
-    # Consolidar charts
-    heatmap_map: dict[tuple[str, str], tuple[float, float]] = {}
-    stacked_map: dict[str, dict[str, float]] = {}
-    trend_map: dict[str, dict[str, float | int]] = {}
-
-    for r in reports:
-        # Heatmap
-        for mi in r.monthly_items:
-            key = (_weekday_label(mi.class_days), mi.class_schedule)
-            prev_h, prev_d = heatmap_map.get(key, (0.0, 0.0))
-            heatmap_map[key] = (
-                prev_h + float(mi.total_class_hours),
-                prev_d + float(mi.total_dollars),
-            )
-
-        # Stacked by schedule
-        for ps in r.payment_summaries:
-            sched = ps.class_schedule
-            if sched not in stacked_map:
-                stacked_map[sched] = {
-                    "GDO": 0.0,
-                    "M1": 0.0,
-                    "M2": 0.0,
-                    "DR": 0.0,
-                    "BLG": 0.0,
-                }
-            stacked_map[sched]["GDO"] += float(ps.payment_rate_grado)
-            stacked_map[sched]["M1"] += float(ps.payment_rate_maestria_1)
-            stacked_map[sched]["M2"] += float(ps.payment_rate_maestria_2)
-            stacked_map[sched]["DR"] += float(ps.payment_rate_doctor)
-            stacked_map[sched]["BLG"] += float(ps.payment_rate_bilingue)
-
-        # Monthly trend
-        for mi in r.monthly_items:
-            month_key = f"{mi.year}-{mi.month:02d}"
-            if month_key not in trend_map:
-                trend_map[month_key] = {"sessions": 0, "hours": 0.0, "dollars": 0.0}
-            trend_map[month_key]["sessions"] += int(mi.sessions)
-            trend_map[month_key]["hours"] += float(mi.total_class_hours)
-            trend_map[month_key]["dollars"] += float(mi.total_dollars)
-
-    charts = {
-        "heatmap": [HeatmapPoint(day=k[0], schedule=k[1], hours=v[0], dollars=v[1]) for k, v in heatmap_map.items()],
-        "stacked_by_schedule": [StackedByScheduleItem(schedule=s, **vals) for s, vals in stacked_map.items()],
-        "monthly_trend": [
-            MonthlyTrendItem(
-                month=k,
-                sessions=v["sessions"],
-                hours=float(v["hours"]),
-                dollars=float(v["dollars"]),
-            )
-            for k, v in sorted(trend_map.items())
-        ],
-        "comparative_sections": [],
-        "sections_by_school": [],
-    }
-
-    # Secciones por modalidad - Ciclo actual
-    current_sections_stmt = (
-        select(
-            AcademicLoadClass.class_type,
-            func.count(distinct(tuple_(AcademicLoadClass.class_section, AcademicLoadClass.subject_code))).label(
-                "count"
-            ),
-        )
-        .join(AcademicLoadFile)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-        )
-        .group_by(AcademicLoadClass.class_type)
-    )
-    current_sections_result = await db.execute(current_sections_stmt)
-    current_sections_data = current_sections_result.all()
-
-    # Mapear resultados a modalidades
-    modality_map_current: dict[str, int] = {
-        "Presenciales": 0,
-        "En Línea": 0,
-        "Virtuales": 0,
-    }
-    for row in current_sections_data:
-        modality = _class_type_to_modality(row.class_type)
-        if modality in modality_map_current:
-            modality_map_current[modality] = row.count
-
-    # Secciones por escuela - Ciclo actual
-    school_sections_stmt = (
-        select(
-            School.acronym,
-            AcademicLoadClass.class_type,
-            func.count(distinct(tuple_(AcademicLoadClass.class_section, AcademicLoadClass.subject_code))).label(
-                "count"
-            ),
-        )
-        .join(
-            AcademicLoadFile,
-            AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
-        )
-        .join(School, AcademicLoadFile.school_id == School.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-        )
-        .group_by(School.acronym, AcademicLoadClass.class_type)
-    )
-    school_sections_result = await db.execute(school_sections_stmt)
-    school_sections_data = school_sections_result.all()
-
-    # Inicializar variables para comparación (en caso de que no haya ciclo comparado)
-    modality_map_compare = {"Presenciales": 0, "En Línea": 0, "Virtuales": 0}
-    cmp_school_sections_data = []
-
-    # Recent loads
-    tables = {
-        "recent_loads": [
-            RecentLoad(
-                file_id=f.id,
-                version=f.version,
-                ingestion_status=f.ingestion_status,
-                upload_date=f.upload_date,
-                has_billing_report=f.id in reports_by_file,
-            )
-            for f in files
-        ]
-    }
+    if not target_school_ids:
+        context = _scope_context(term_id, term_obj, target_faculty_id, school_id, target_school_ids, school_acronyms)
+        return _empty_dashboard(context, _CONSOLIDATED_CHART_KEYS)
 
-    # Context
-    context = DashboardContext(
+    return await _build_consolidated_dashboard(
+        db,
         term_id=term_id,
-        term_term=term_obj.term,
-        term_year=term_obj.year,
-        faculty_id=target_faculty_id,
-        school_ids=target_school_ids if not school_id else None,
+        term_obj=term_obj,
+        cmp_term_obj=cmp_term_obj,
+        scope_faculty_id=target_faculty_id,
         school_id=school_id,
-        school_acronyms=school_acronyms if not school_id else None,
-        school_acronym=school_acronyms[0] if school_id and school_acronyms else None,
-        file_versions=[
-            {
-                "file_id": f.id,
-                "version": f.version,
-                "ingestion_status": f.ingestion_status,
-                "upload_date": f.upload_date,
-                "is_active": f.is_active,
-            }
-            for f in files
-        ],
-    )
-
-    # Comparison logic (similar a decano)
-    comparison = None
-    try:
-        if compare_term_id is None and term_obj.year:
-            prev_year_term_obj = (
-                await db.execute(select(Term).filter(Term.term == term_obj.term, Term.year == term_obj.year - 1))
-            ).scalar_one_or_none()
-            if prev_year_term_obj:
-                compare_term_id = prev_year_term_obj.id
-
-        if compare_term_id:
-            # Obtener cargas y reports del ciclo comparado
-            cmp_files_stmt = (
-                select(AcademicLoadFile)
-                .filter(
-                    AcademicLoadFile.school_id.in_(target_school_ids),
-                    AcademicLoadFile.term_id == compare_term_id,
-                    AcademicLoadFile.is_active.is_(True),
-                )
-                .order_by(desc(AcademicLoadFile.upload_date))
-            )
-            cmp_files_result = await db.execute(cmp_files_stmt)
-            cmp_files = cmp_files_result.scalars().all()
-
-            if cmp_files:
-                # Secciones por modalidad - Ciclo comparado
-                cmp_sections_stmt = (
-                    select(
-                        AcademicLoadClass.class_type,
-                        func.count(
-                            distinct(
-                                tuple_(
-                                    AcademicLoadClass.class_section,
-                                    AcademicLoadClass.subject_code,
-                                )
-                            )
-                        ).label("count"),
-                    )
-                    .join(AcademicLoadFile)
-                    .filter(
-                        AcademicLoadFile.school_id.in_(target_school_ids),
-                        AcademicLoadFile.term_id == compare_term_id,
-                        AcademicLoadFile.is_active.is_(True),
-                    )
-                    .group_by(AcademicLoadClass.class_type)
-                )
-                cmp_sections_result = await db.execute(cmp_sections_stmt)
-                cmp_sections_data = cmp_sections_result.all()
-
-                modality_map_compare = {
-                    "Presenciales": 0,
-                    "En Línea": 0,
-                    "Virtuales": 0,
-                }
-                for row in cmp_sections_data:
-                    modality = _class_type_to_modality(row.class_type)
-                    if modality in modality_map_compare:
-                        modality_map_compare[modality] = row.count
-
-                # Secciones por escuela - Ciclo comparado
-                cmp_school_sections_stmt = (
-                    select(
-                        School.acronym,
-                        AcademicLoadClass.class_type,
-                        func.count(
-                            distinct(
-                                tuple_(
-                                    AcademicLoadClass.class_section,
-                                    AcademicLoadClass.subject_code,
-                                )
-                            )
-                        ).label("count"),
-                    )
-                    .join(
-                        AcademicLoadFile,
-                        AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
-                    )
-                    .join(School, AcademicLoadFile.school_id == School.id)
-                    .filter(
-                        AcademicLoadFile.school_id.in_(target_school_ids),
-                        AcademicLoadFile.term_id == compare_term_id,
-                        AcademicLoadFile.is_active.is_(True),
-                    )
-                    .group_by(School.acronym, AcademicLoadClass.class_type)
-                )
-                cmp_school_sections_result = await db.execute(cmp_school_sections_stmt)
-                cmp_school_sections_data = cmp_school_sections_result.all()
-
-                cmp_file_ids = [f.id for f in cmp_files]
-                cmp_reports_stmt = (
-                    select(BillingReport)
-                    .filter(BillingReport.academic_load_file_id.in_(cmp_file_ids))
-                    .order_by(desc(BillingReport.created_at))
-                )
-                cmp_reports_result = await db.execute(cmp_reports_stmt)
-                cmp_all_reports = cmp_reports_result.scalars().all()
-
-                cmp_reports_by_file: dict[int, BillingReport] = {}
-                for r in cmp_all_reports:
-                    if r.academic_load_file_id not in cmp_reports_by_file:
-                        cmp_reports_by_file[r.academic_load_file_id] = r
-
-                cmp_reports = list(cmp_reports_by_file.values())
-
-                if cmp_reports:
-                    # Consolidar KPIs del ciclo comparado
-                    cmp_kpis = DashboardKPIs()
-                    cmp_kpis.has_billing_report = True
-                    for r in cmp_reports:
-                        r_kpis = _get_kpis_for_report(r)
-                        cmp_kpis.total_hours += r_kpis.total_hours
-                        cmp_kpis.total_dollars += r_kpis.total_dollars
-                        cmp_kpis.paid_groups_full += r_kpis.paid_groups_full
-                        cmp_kpis.paid_groups_partial += r_kpis.paid_groups_partial
-                        cmp_kpis.paid_groups_none += r_kpis.paid_groups_none
-                    cmp_total_groups = (
-                        cmp_kpis.paid_groups_full + cmp_kpis.paid_groups_partial + cmp_kpis.paid_groups_none
-                    )
-                    cmp_kpis.coverage_rate = (
-                        (cmp_kpis.paid_groups_full + cmp_kpis.paid_groups_partial) / cmp_total_groups
-                        if cmp_total_groups
-                        else 0.0
-                    )
-
-                    cmp_term_obj = (
-                        await db.execute(select(Term).filter(Term.id == compare_term_id))
-                    ).scalar_one_or_none()
-                    cmp_term_label = f"{cmp_term_obj.term:02d}/{cmp_term_obj.year}" if cmp_term_obj else None
-
-                    def _delta(a: float, b: float) -> dict:
-                        abs_val = a - b
-                        pct = (abs_val / b) if b else None
-                        return {"abs": abs_val, "pct": pct}
-
-                    comparison = {
-                        "base": {
-                            "term_id": term_id,
-                            "term_label": f"{context.term_term:02d}/{context.term_year}"
-                            if context.term_term and context.term_year
-                            else None,
-                            "total_hours": kpis.total_hours,
-                            "total_dollars": kpis.total_dollars,
-                            "groups_count": total_groups,
-                            "coverage": {
-                                "full": kpis.paid_groups_full,
-                                "partial": kpis.paid_groups_partial,
-                                "none": kpis.paid_groups_none,
-                            },
-                        },
-                        "compare": {
-                            "term_id": compare_term_id,
-                            "term_label": cmp_term_label,
-                            "total_hours": cmp_kpis.total_hours,
-                            "total_dollars": cmp_kpis.total_dollars,
-                            "groups_count": cmp_total_groups,
-                            "coverage": {
-                                "full": cmp_kpis.paid_groups_full,
-                                "partial": cmp_kpis.paid_groups_partial,
-                                "none": cmp_kpis.paid_groups_none,
-                            },
-                        },
-                        "delta": {
-                            "total_hours": _delta(kpis.total_hours, cmp_kpis.total_hours),
-                            "total_dollars": _delta(kpis.total_dollars, cmp_kpis.total_dollars),
-                            "groups_count": _delta(float(total_groups), float(cmp_total_groups)),
-                            "coverage": {
-                                "full": _delta(
-                                    float(kpis.paid_groups_full),
-                                    float(cmp_kpis.paid_groups_full),
-                                ),
-                                "partial": _delta(
-                                    float(kpis.paid_groups_partial),
-                                    float(cmp_kpis.paid_groups_partial),
-                                ),
-                                "none": _delta(
-                                    float(kpis.paid_groups_none),
-                                    float(cmp_kpis.paid_groups_none),
-                                ),
-                            },
-                        },
-                    }
-    except Exception:
-        comparison = None
-
-    # Construir datos para gráfico comparativo por modalidad
-    comparative_sections = [
-        SectionsByModalityItem(
-            modality=modality,
-            cycle_current=modality_map_current.get(modality, 0),
-            cycle_compare=modality_map_compare.get(modality, 0),
-        )
-        for modality in ["Presenciales", "En Línea", "Virtuales"]
-    ]
-    charts["comparative_sections"] = comparative_sections
-
-    # Construir datos para gráfico por escuela
-    # Agrupar por escuela y modalidad
-    school_modality_map: dict[tuple[str, str], dict[str, int]] = {}
-    for row in school_sections_data:
-        modality = _class_type_to_modality(row.class_type)
-        key = (row.acronym, modality)
-        if key not in school_modality_map:
-            school_modality_map[key] = {"current": 0, "compare": 0}
-        school_modality_map[key]["current"] = row.count
-
-    # Agregar datos del ciclo comparado si existen
-    for row in cmp_school_sections_data:
-        modality = _class_type_to_modality(row.class_type)
-        key = (row.acronym, modality)
-        if key not in school_modality_map:
-            school_modality_map[key] = {"current": 0, "compare": 0}
-        school_modality_map[key]["compare"] = row.count
-
-    # Convertir a lista de SectionsBySchoolItem
-    sections_by_school: list[SectionsBySchoolItem] = []
-    for (school_acronym, modality), counts in school_modality_map.items():
-        sections_by_school.append(
-            SectionsBySchoolItem(
-                school_acronym=school_acronym,
-                modality=modality,
-                cycle_current=counts["current"],
-                cycle_compare=counts["compare"],
-            )
-        )
-    charts["sections_by_school"] = sections_by_school
-
-    # Tabla de categorías por estado de pago
-    # Agrupar por escuela/facultad, categoría y estado de pago
-    category_payment_stmt = (
-        select(
-            School.acronym,
-            AcademicLoadClass.professor_category,
-            AcademicLoadClass.professor_payment_rate,
-            func.count(AcademicLoadClass.id).label("count"),
-        )
-        .join(
-            AcademicLoadFile,
-            AcademicLoadClass.academic_load_file_id == AcademicLoadFile.id,
-        )
-        .join(School, AcademicLoadFile.school_id == School.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-            AcademicLoadClass.professor_category.isnot(None),
-        )
-        .group_by(
-            School.acronym,
-            AcademicLoadClass.professor_category,
-            AcademicLoadClass.professor_payment_rate,
-        )
+        target_school_ids=target_school_ids,
+        school_acronyms=school_acronyms,
+        compare_term_id=compare_term_id,
     )
-    category_payment_result = await db.execute(category_payment_stmt)
-    category_payment_data = category_payment_result.all()
-
-    # Agrupar por escuela y categoría
-    school_category_map: dict[tuple[str, str], dict[str, int]] = {}
-    for row in category_payment_data:
-        category = row.professor_category.upper().strip()
-        # Mapear COOR a CAT/COOR para la tabla
-        if category == "COOR":
-            category = "CAT/COOR"
-
-        payment_rate = float(row.professor_payment_rate)
-        key = (row.acronym, category)
-
-        if key not in school_category_map:
-            school_category_map[key] = {"pag": 0, "no_pag": 0, "par": 0}
-
-        if payment_rate == 1.0:
-            school_category_map[key]["pag"] += row.count
-        elif payment_rate == 0.0:
-            school_category_map[key]["no_pag"] += row.count
-        elif 0.0 < payment_rate < 1.0:
-            school_category_map[key]["par"] += row.count
-
-    # Construir lista de CategoryPaymentItem por escuela
-    category_payment_by_school: dict[str, list[CategoryPaymentItem]] = {}
-    categories_order = ["DEC", "DIR", "CAT/COOR", "DTC", "ADM", "DHC"]
-
-    for (school_acronym, category), counts in school_category_map.items():
-        if school_acronym not in category_payment_by_school:
-            category_payment_by_school[school_acronym] = []
-
-        category_payment_by_school[school_acronym].append(
-            CategoryPaymentItem(
-                category=category,
-                pag=counts["pag"],
-                no_pag=counts["no_pag"],
-                par=counts["par"],
-            )
-        )
-
-    # Asegurar que todas las categorías estén presentes para cada escuela
-    for school_acronym in category_payment_by_school:
-        existing_categories = {item.category for item in category_payment_by_school[school_acronym]}
-        for cat in categories_order:
-            if cat not in existing_categories:
-                category_payment_by_school[school_acronym].append(
-                    CategoryPaymentItem(category=cat, pag=0, no_pag=0, par=0)
-                )
-        # Ordenar según el orden definido
-        category_payment_by_school[school_acronym].sort(
-            key=lambda x: categories_order.index(x.category) if x.category in categories_order else 999
-        )
-
-    tables["category_payment"] = category_payment_by_school
-
-    # Reporte mensual por facultad (solo para vicerrector)
-    # Obtener todos los monthly_items de los reportes de facturación para las escuelas seleccionadas
-    from ...models.faculty import Faculty
-
-    monthly_report_data: dict[int, dict[str, dict[str, float]]] = {}  # {faculty_id: {school_acronym: {month: dollars}}}
-    faculty_info: dict[int, dict[str, str]] = {}  # {faculty_id: {"name": ..., "acronym": ...}}
-
-    # Obtener reportes de facturación para las escuelas seleccionadas
-    reports_stmt = (
-        select(BillingReport)
-        .join(AcademicLoadFile, BillingReport.academic_load_file_id == AcademicLoadFile.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-        )
-        .order_by(desc(BillingReport.created_at))
-    )
-    reports_result = await db.execute(reports_stmt)
-    all_reports = reports_result.scalars().all()
-
-    # Obtener el reporte más reciente por archivo
-    reports_by_file: dict[int, BillingReport] = {}
-    for r in all_reports:
-        if r.academic_load_file_id not in reports_by_file:
-            reports_by_file[r.academic_load_file_id] = r
-
-    # Obtener archivos para mapear escuela -> facultad
-    files_stmt = (
-        select(AcademicLoadFile, School, Faculty)
-        .join(School, AcademicLoadFile.school_id == School.id)
-        .join(Faculty, School.fk_faculty == Faculty.id)
-        .filter(
-            AcademicLoadFile.school_id.in_(target_school_ids),
-            AcademicLoadFile.term_id == term_id,
-            AcademicLoadFile.is_active.is_(True),
-        )
-    )
-    files_result = await db.execute(files_stmt)
-    files_data = files_result.all()
-
-    # Mapeo de file_id -> (school_acronym, faculty_id, faculty_name, faculty_acronym)
-    file_to_info: dict[int, tuple[str, int, str, str]] = {}
-    for file_row, school_obj, faculty_obj in files_data:
-        file_to_info[file_row.id] = (
-            school_obj.acronym,
-            faculty_obj.id,
-            faculty_obj.name,
-            faculty_obj.acronym,
-        )
-
-    # Procesar monthly_items
-    month_map = {7: "july", 8: "august", 9: "september", 10: "october", 11: "november", 12: "december"}
-
-    for file_id, report in reports_by_file.items():
-        if file_id not in file_to_info:
-            continue
-
-        school_acronym, faculty_id, faculty_name, faculty_acronym = file_to_info[file_id]
-
-        # Inicializar estructuras si no existen
-        if faculty_id not in monthly_report_data:
-            monthly_report_data[faculty_id] = {}
-            faculty_info[faculty_id] = {"name": faculty_name, "acronym": faculty_acronym}
-
-        if school_acronym not in monthly_report_data[faculty_id]:
-            monthly_report_data[faculty_id][school_acronym] = {
-                "july": 0.0,
-                "august": 0.0,
-                "september": 0.0,
-                "october": 0.0,
-                "november": 0.0,
-                "december": 0.0,
-            }
-
-        # Sumar monthly_items
-        for mi in report.monthly_items:
-            if mi.month in month_map:
-                month_key = month_map[mi.month]
-                monthly_report_data[faculty_id][school_acronym][month_key] += float(mi.total_dollars)
-
-    # Construir MonthlyReportByFaculty
-    monthly_reports_by_faculty: list[MonthlyReportByFaculty] = []
-    for faculty_id, schools_data in monthly_report_data.items():
-        faculty_name = faculty_info[faculty_id]["name"]
-        faculty_acronym = faculty_info[faculty_id]["acronym"]
-
-        # Construir lista de escuelas
-        school_items: list[MonthlyReportSchoolItem] = []
-        for school_acronym, months_data in schools_data.items():
-            total = sum(months_data.values())
-            school_items.append(
-                MonthlyReportSchoolItem(
-                    school_acronym=school_acronym,
-                    july=months_data["july"],
-                    august=months_data["august"],
-                    september=months_data["september"],
-                    october=months_data["october"],
-                    november=months_data["november"],
-                    december=months_data["december"],
-                    total=total,
-                )
-            )
-
-        # Calcular totales mensuales para la facultad
-        monthly_totals = {
-            "july": sum(s.july for s in school_items),
-            "august": sum(s.august for s in school_items),
-            "september": sum(s.september for s in school_items),
-            "october": sum(s.october for s in school_items),
-            "november": sum(s.november for s in school_items),
-            "december": sum(s.december for s in school_items),
-        }
-
-        # Calcular diferencias (por ahora vacío, se puede usar para comparar con otro período)
-        monthly_differences = {}
-
-        monthly_reports_by_faculty.append(
-            MonthlyReportByFaculty(
-                faculty_id=faculty_id,
-                faculty_name=faculty_name,
-                faculty_acronym=faculty_acronym,
-                schools=school_items,
-                monthly_totals=monthly_totals,
-                monthly_differences=monthly_differences,
-            )
-        )
-
-    # Ordenar por faculty_id
-    monthly_reports_by_faculty.sort(key=lambda x: x.faculty_id)
-
-    tables["monthly_report_by_faculty"] = [mr.model_dump() for mr in monthly_reports_by_faculty]
-
-    # Comparación de grupos pagados/no pagados por escuela entre dos ciclos
-    groups_comparison_by_school: list[GroupsComparisonBySchoolItem] = []
-    if compare_term_id:
-        # Obtener archivos del ciclo comparado
-        cmp_files_stmt = (
-            select(AcademicLoadFile)
-            .filter(
-                AcademicLoadFile.school_id.in_(target_school_ids),
-                AcademicLoadFile.term_id == compare_term_id,
-                AcademicLoadFile.is_active.is_(True),
-            )
-            .order_by(desc(AcademicLoadFile.upload_date))
-        )
-        cmp_files_result = await db.execute(cmp_files_stmt)
-        cmp_files = cmp_files_result.scalars().all()
-
-        if cmp_files:
-            cmp_file_ids = [f.id for f in cmp_files]
-            cmp_reports_stmt = (
-                select(BillingReport)
-                .filter(BillingReport.academic_load_file_id.in_(cmp_file_ids))
-                .order_by(desc(BillingReport.created_at))
-            )
-            cmp_reports_result = await db.execute(cmp_reports_stmt)
-            cmp_all_reports = cmp_reports_result.scalars().all()
-
-            cmp_reports_by_file: dict[int, BillingReport] = {}
-            for r in cmp_all_reports:
-                if r.academic_load_file_id not in cmp_reports_by_file:
-                    cmp_reports_by_file[r.academic_load_file_id] = r
-
-            # Obtener mapeo de file_id -> school_acronym y school_name para ambos ciclos
-            base_files_stmt = (
-                select(AcademicLoadFile, School)
-                .join(School, AcademicLoadFile.school_id == School.id)
-                .filter(
-                    AcademicLoadFile.school_id.in_(target_school_ids),
-                    AcademicLoadFile.term_id == term_id,
-                    AcademicLoadFile.is_active.is_(True),
-                )
-            )
-            base_files_result = await db.execute(base_files_stmt)
-            base_files_data = base_files_result.all()
-
-            cmp_files_stmt_with_school = (
-                select(AcademicLoadFile, School)
-                .join(School, AcademicLoadFile.school_id == School.id)
-                .filter(
-                    AcademicLoadFile.school_id.in_(target_school_ids),
-                    AcademicLoadFile.term_id == compare_term_id,
-                    AcademicLoadFile.is_active.is_(True),
-                )
-            )
-            cmp_files_result_with_school = await db.execute(cmp_files_stmt_with_school)
-            cmp_files_data = cmp_files_result_with_school.all()
-
-            # Mapeo file_id -> (school_acronym, school_name)
-            base_file_to_school: dict[int, tuple[str, str]] = {}
-            for file_row, school_obj in base_files_data:
-                base_file_to_school[file_row.id] = (school_obj.acronym, school_obj.name)
-
-            cmp_file_to_school: dict[int, tuple[str, str]] = {}
-            for file_row, school_obj in cmp_files_data:
-                cmp_file_to_school[file_row.id] = (school_obj.acronym, school_obj.name)
-
-            # Calcular grupos por escuela para ciclo base
-            base_school_groups: dict[
-                str, dict[str, float]
-            ] = {}  # {school_acronym: {"paid": 0.0, "unpaid": 0.0, "total": 0.0}}
-            for file_id, report in reports_by_file.items():
-                if file_id not in base_file_to_school:
-                    continue
-                school_acronym, school_name = base_file_to_school[file_id]
-
-                if school_acronym not in base_school_groups:
-                    base_school_groups[school_acronym] = {"paid": 0.0, "unpaid": 0.0, "total": 0.0}
-
-                for ps in report.payment_summaries:
-                    rates = [
-                        float(ps.payment_rate_grado),
-                        float(ps.payment_rate_maestria_1),
-                        float(ps.payment_rate_maestria_2),
-                        float(ps.payment_rate_doctor),
-                        float(ps.payment_rate_bilingue),
-                    ]
-                    s = sum(rates)
-                    base_school_groups[school_acronym]["total"] += 1.0
-                    if s >= 1.0:
-                        base_school_groups[school_acronym]["paid"] += 1.0
-                    elif s == 0.0:
-                        base_school_groups[school_acronym]["unpaid"] += 1.0
-
-            # Calcular grupos por escuela para ciclo comparado
-            cmp_school_groups: dict[str, dict[str, float]] = {}
-            for file_id, report in cmp_reports_by_file.items():
-                if file_id not in cmp_file_to_school:
-                    continue
-                school_acronym, school_name = cmp_file_to_school[file_id]
-
-                if school_acronym not in cmp_school_groups:
-                    cmp_school_groups[school_acronym] = {"paid": 0.0, "unpaid": 0.0, "total": 0.0}
-
-                for ps in report.payment_summaries:
-                    rates = [
-                        float(ps.payment_rate_grado),
-                        float(ps.payment_rate_maestria_1),
-                        float(ps.payment_rate_maestria_2),
-                        float(ps.payment_rate_doctor),
-                        float(ps.payment_rate_bilingue),
-                    ]
-                    s = sum(rates)
-                    cmp_school_groups[school_acronym]["total"] += 1.0
-                    if s >= 1.0:
-                        cmp_school_groups[school_acronym]["paid"] += 1.0
-                    elif s == 0.0:
-                        cmp_school_groups[school_acronym]["unpaid"] += 1.0
-
-            # Construir lista de comparación (incluir todas las escuelas que aparecen en cualquier ciclo)
-            all_schools = set(base_school_groups.keys()) | set(cmp_school_groups.keys())
-            school_info_map: dict[str, str] = {}  # {school_acronym: school_name}
-            for file_id, (acronym, name) in base_file_to_school.items():
-                if acronym not in school_info_map:
-                    school_info_map[acronym] = name
-            for file_id, (acronym, name) in cmp_file_to_school.items():
-                if acronym not in school_info_map:
-                    school_info_map[acronym] = name
-
-            for school_acronym in sorted(all_schools):
-                base_data = base_school_groups.get(school_acronym, {"paid": 0.0, "unpaid": 0.0, "total": 0.0})
-                cmp_data = cmp_school_groups.get(school_acronym, {"paid": 0.0, "unpaid": 0.0, "total": 0.0})
-
-                groups_comparison_by_school.append(
-                    GroupsComparisonBySchoolItem(
-                        school_acronym=school_acronym,
-                        school_name=school_info_map.get(school_acronym),
-                        base_paid=base_data["paid"],
-                        base_unpaid=base_data["unpaid"],
-                        base_total=base_data["total"],
-                        compare_paid=cmp_data["paid"],
-                        compare_unpaid=cmp_data["unpaid"],
-                        compare_total=cmp_data["total"],
-                    )
-                )
-
-    tables["groups_comparison_by_school"] = [g.model_dump() for g in groups_comparison_by_school]
-
-    return DirectorDashboardResponse(context=context, kpis=kpis, charts=charts, tables=tables, comparison=comparison)
@@ -2,7 +2,7 @@
 
 from typing import Annotated, Any, cast
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastcrud.paginated import PaginatedListResponse, compute_offset, paginated_response
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,17 +10,18 @@ from ...api.dependencies import get_current_superuser, get_current_user
 from ...core.db.database import async_get_db
 from ...core.exceptions.http_exceptions import DuplicateValueException, NotFoundException
 from ...crud.crud_faculties import (
-    crud_faculties,
-    faculty_acronym_exists,
-    faculty_exists,
+    delete_faculty_returning_id,
     get_deleted_faculties,
     get_faculty_by_uuid,
     get_non_deleted_faculties,
+    get_non_deleted_faculties_after,
+    insert_faculty,
     restore_faculty,
     soft_delete_faculty,
+    update_faculty_returning,
 )
 from ...crud.crud_recycle_bin import create_recycle_bin_entry, find_recycle_bin_entry, mark_as_restored
-from ...schemas.faculty import FacultyCreate, FacultyRead, FacultyUpdate
+from ...schemas.faculty import FacultyCreate, FacultyCursorPage, FacultyRead, FacultyUpdate
 
 router = APIRouter(prefix="/catalog/faculties", tags=["catalog-faculties"])
 
@@ -49,26 +50,18 @@ async def create_faculty(
     ------
         DuplicateValueException: Si el nombre o acrónimo de la facultad ya existe
     """
-    # Verificar si el nombre de la facultad ya existe
-    if await faculty_exists(db=db, name=faculty.name):
-        raise DuplicateValueException(f"Ya existe una facultad con el nombre '{faculty.name}'")
+    # Crear la facultad; los índices únicos detectan nombres o acrónimos repetidos sin consultas previas. La sesión
+    # no expira los atributos al hacer commit, así que la fila creada ya trae el id (obtenido con RETURNING en el
+    # INSERT) y los valores por defecto, sin volver a consultarla
+    try:
+        created_faculty = await insert_faculty(db=db, faculty=faculty)
+    except ValueError as e:
+        raise DuplicateValueException(str(e)) from e
 
-    # Verificar si el acrónimo de la facultad ya existe
-    if await faculty_acronym_exists(db=db, acronym=faculty.acronym):
-        raise DuplicateValueException(f"Ya existe una facultad con el acrónimo '{faculty.acronym}'")
+    return FacultyRead.model_validate(created_faculty)
 
-    # Create faculty
-    created_faculty = await crud_faculties.create(db=db, object=faculty)
 
-    # Retrieve and return the created faculty
-    faculty_read = await crud_faculties.get(db=db, id=created_faculty.id, schema_to_select=FacultyRead)
-    if faculty_read is None:
-        raise NotFoundException("Created faculty not found")
-
-    return cast(FacultyRead, faculty_read)
-
-
-@router.get("", response_model=PaginatedListResponse[FacultyRead])
+@router.get("", response_model=PaginatedListResponse[FacultyRead] | FacultyCursorPage)
 async def list_faculties(
     request: Request,
     db: Annotated[AsyncSession, Depends(async_get_db)],
@@ -77,9 +70,14 @@ async def list_faculties(
     items_per_page: int = 10,
     is_active: bool | None = None,
     include_deleted: bool = False,
+    cursor: str | None = None,
 ) -> dict:
     """Obtener lista paginada de facultades - Accesible para todos los usuarios autenticados.
 
+    Por defecto pagina por número de página (OFFSET). Si se envía ``cursor`` (``next_cursor`` de la respuesta
+    anterior, vacío para la primera página) se pagina por keyset sobre el id, sin OFFSET ni conteo total, y la
+    respuesta incluye ``next_cursor``. La paginación por cursor no aplica a las facultades eliminadas.
+
     Args:
     ----
         request: Objeto request de FastAPI
@@ -89,11 +87,26 @@ async def list_faculties(
         items_per_page: Items por página (default: 10)
         is_active: Filtrar por estado activo (opcional)
         include_deleted: Incluir facultades eliminadas (soft delete)
+        cursor: Cursor de la página anterior para paginar por keyset (opcional)
 
     Returns:
     -------
         Lista paginada de facultades
+
+    Raises:
+    ------
+        HTTPException: 400 si el cursor no es válido
     """
+    if cursor is not None and not include_deleted:
+        # Paginación por cursor: id > cursor ORDER BY id LIMIT n, sin recorrer ni descartar páginas previas
+        try:
+            faculties_page = await get_non_deleted_faculties_after(
+                db=db, cursor=cursor or None, limit=items_per_page, is_active=is_active
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        return {**faculties_page, "items_per_page": items_per_page}
+
     if include_deleted:
         # Si se solicitan eliminadas, usar get_deleted_faculties
         faculties_data = await get_deleted_faculties(
@@ -167,26 +180,16 @@ async def update_faculty(
         NotFoundException: Si la facultad no se encuentra
         DuplicateValueException: Si el nuevo nombre o acrónimo ya existe
     """
-    # Verificar si la facultad existe
-    db_faculty = await get_faculty_by_uuid(db=db, faculty_id=faculty_id)
-    if db_faculty is None:
+    # Actualizar y devolver la fila resultante con UPDATE ... RETURNING; los índices únicos detectan duplicados
+    try:
+        updated_faculty = await update_faculty_returning(
+            db=db, faculty_id=faculty_id, values=values.model_dump(exclude_unset=True)
+        )
+    except ValueError as e:
+        raise DuplicateValueException(str(e)) from e
+    if updated_faculty is None:
         raise NotFoundException(f"No se encontró la facultad con id '{faculty_id}'")
 
-    # Verificar si el nuevo nombre entra en conflicto con una facultad existente
-    if values.name is not None and values.name != db_faculty["name"]:
-        if await faculty_exists(db=db, name=values.name):
-            raise DuplicateValueException(f"Ya existe una facultad con el nombre '{values.name}'")
-
-    # Verificar si el nuevo acrónimo entra en conflicto con una facultad existente
-    if values.acronym is not None and values.acronym != db_faculty["acronym"]:
-        if await faculty_acronym_exists(db=db, acronym=values.acronym):
-            raise DuplicateValueException(f"Ya existe una facultad con el acrónimo '{values.acronym}'")
-
-    # Update faculty
-    await crud_faculties.update(db=db, object=values, id=faculty_id)
-
-    # Retrieve and return updated faculty
-    updated_faculty = await get_faculty_by_uuid(db=db, faculty_id=faculty_id)
     return cast(FacultyRead, updated_faculty)
 
 
@@ -212,14 +215,10 @@ async def delete_faculty(
     ------
         NotFoundException: Si la facultad no se encuentra
     """
-    # Verificar si la facultad existe
-    db_faculty = await get_faculty_by_uuid(db=db, faculty_id=faculty_id)
-    if db_faculty is None:
+    # Delete faculty (cascade will handle related records); RETURNING indica si existía
+    if await delete_faculty_returning_id(db=db, faculty_id=faculty_id) is None:
         raise NotFoundException(f"No se encontró la facultad con id '{faculty_id}'")
 
-    # Delete faculty (cascade will handle related records)
-    await crud_faculties.delete(db=db, id=faculty_id)
-
 
 @router.patch("/soft-delete/{faculty_id}", response_model=FacultyRead)
 async def soft_delete_faculty_endpoint(
@@ -255,8 +254,8 @@ async def soft_delete_faculty_endpoint(
         raise NotFoundException(f"No se encontró la facultad con id '{faculty_id}'")
 
     # Soft delete faculty
-    success = await soft_delete_faculty(db=db, faculty_id=faculty_id)
-    if not success:
+    deleted_faculty = await soft_delete_faculty(db=db, faculty_id=faculty_id)
+    if deleted_faculty is None:
         raise NotFoundException(f"Error al eliminar la facultad con id '{faculty_id}'")
 
     # Crear registro en RecycleBin
@@ -271,9 +270,7 @@ async def soft_delete_faculty_endpoint(
         can_restore=True,
     )
 
-    # Retrieve and return updated faculty
-    updated_faculty = await get_faculty_by_uuid(db=db, faculty_id=faculty_id)
-    return cast(FacultyRead, updated_faculty)
+    return cast(FacultyRead, deleted_faculty)
 
 
 @router.patch("/restore/{faculty_id}", response_model=FacultyRead)
@@ -309,8 +306,8 @@ async def restore_faculty_endpoint(
         raise NotFoundException(f"No se encontró la facultad con id '{faculty_id}'")
 
     # Restore faculty
-    success = await restore_faculty(db=db, faculty_id=faculty_id)
-    if not success:
+    restored_faculty = await restore_faculty(db=db, faculty_id=faculty_id)
+    if restored_faculty is None:
         raise NotFoundException(f"Error al restaurar la facultad con id '{faculty_id}'")
 
     # Buscar y actualizar registro en RecycleBin
@@ -323,9 +320,7 @@ async def restore_faculty_endpoint(
             restored_by_name=current_user["name"],
         )
 
-    # Retrieve and return updated faculty
-    updated_faculty = await get_faculty_by_uuid(db=db, faculty_id=faculty_id)
-    return cast(FacultyRead, updated_faculty)
+    return cast(FacultyRead, restored_faculty)
 
 
 @router.get("/deleted", response_model=PaginatedListResponse[FacultyRead])
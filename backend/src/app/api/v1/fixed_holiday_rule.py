@@ -1,12 +1,18 @@
 """API endpoints for Fixed Holiday Rule management."""
 
+import asyncio
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...api.responses import json_response
 from ...core.db.database import async_get_db
+from ...core.utils.cache import cached_count, invalidate_cached
 from ...crud import crud_fixed_holiday_rule
+from ...crud.pagination import count_in_own_session
 from ...schemas.fixed_holiday_rule import (
     FixedHolidayRuleCreate,
     FixedHolidayRuleRead,
@@ -15,6 +21,11 @@ from ...schemas.fixed_holiday_rule import (
 
 router = APIRouter()
 
+# Prefijo de los totales de paginación cacheados; se invalidan al crear, editar o eliminar reglas
+_COUNT_CACHE_PREFIX = "count:fixed_holiday_rules:"
+
+_RULES_ADAPTER = TypeAdapter(list[FixedHolidayRuleRead])
+
 
 @router.get("/", response_model=dict)
 async def list_fixed_holiday_rules(
@@ -22,7 +33,7 @@ async def list_fixed_holiday_rules(
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=1000)] = 100,
     month: Annotated[int | None, Query(ge=1, le=12)] = None,
-) -> dict:
+) -> Response:
     """List all fixed holiday rules with optional filters.
 
     Args:
@@ -34,20 +45,23 @@ async def list_fixed_holiday_rules(
     Returns:
         Dictionary with data and total count
     """
-    rules = await crud_fixed_holiday_rule.get_fixed_holiday_rules(session=session, skip=skip, limit=limit, month=month)
-
-    # Simple count (no filtering for total)
-    all_rules = await crud_fixed_holiday_rule.get_fixed_holiday_rules(session=session, skip=0, limit=10000)
-    total = len(all_rules)
+    rules, total = await asyncio.gather(
+        crud_fixed_holiday_rule.get_fixed_holiday_rules(session=session, skip=skip, limit=limit, month=month),
+        cached_count(
+            f"{_COUNT_CACHE_PREFIX}{month}",
+            lambda: count_in_own_session(crud_fixed_holiday_rule.count_fixed_holiday_rules, month=month),
+        ),
+    )
 
-    return {"data": [FixedHolidayRuleRead.model_validate(rule) for rule in rules], "total": total}
+    data = _RULES_ADAPTER.validate_python(rules, from_attributes=True)
+    return json_response(to_json({"data": data, "total": total}))
 
 
 @router.get("/{rule_id}", response_model=FixedHolidayRuleRead)
 async def get_fixed_holiday_rule(
     rule_id: int,
     session: Annotated[AsyncSession, Depends(async_get_db)],
-) -> FixedHolidayRuleRead:
+) -> Response:
     """Get a specific fixed holiday rule by ID.
 
     Args:
@@ -68,7 +82,7 @@ async def get_fixed_holiday_rule(
             detail=f"Regla de asueto fijo con ID {rule_id} no encontrada",
         )
 
-    return FixedHolidayRuleRead.model_validate(rule)
+    return json_response(FixedHolidayRuleRead.model_validate(rule).model_dump_json())
 
 
 @router.post("/", response_model=FixedHolidayRuleRead, status_code=status.HTTP_201_CREATED)
@@ -90,6 +104,7 @@ async def create_fixed_holiday_rule(
     """
     try:
         new_rule = await crud_fixed_holiday_rule.create_fixed_holiday_rule(session=session, rule_data=rule_data)
+        await invalidate_cached(_COUNT_CACHE_PREFIX)
         return FixedHolidayRuleRead.model_validate(new_rule)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -125,6 +140,7 @@ async def update_fixed_holiday_rule(
                 detail=f"Regla de asueto fijo con ID {rule_id} no encontrada",
             )
 
+        await invalidate_cached(_COUNT_CACHE_PREFIX)
         return FixedHolidayRuleRead.model_validate(updated_rule)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -151,3 +167,5 @@ async def delete_fixed_holiday_rule(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Regla de asueto fijo con ID {rule_id} no encontrada",
         )
+
+    await invalidate_cached(_COUNT_CACHE_PREFIX)
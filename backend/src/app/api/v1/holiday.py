@@ -1,18 +1,41 @@
 """API endpoints for Holiday management."""
 
+import asyncio
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
+from ...api.responses import json_response
 from ...core.db.database import async_get_db
+from ...core.utils.cache import cached_count, invalidate_cached
 from ...crud import crud_holiday
+from ...crud.pagination import count_in_own_session
+from ...models.holiday import Holiday
 from ...schemas.annual_holiday import AnnualHolidayRead
 from ...schemas.holiday import HolidayCreate, HolidayRead, HolidayUpdate
 
 router = APIRouter()
 
+# Prefijo de los totales de paginación cacheados; se invalidan al crear, editar o eliminar grupos de asuetos
+_COUNT_CACHE_PREFIX = "count:holidays:"
+
+# Adaptadores precompilados al importar el módulo: validan listas completas en una sola llamada a pydantic-core
+_HOLIDAYS_ADAPTER = TypeAdapter(list[HolidayRead])
+_ANNUAL_HOLIDAYS_ADAPTER = TypeAdapter(list[AnnualHolidayRead])
+
+
+def _dump_holiday_detail(holiday: Holiday) -> dict:
+    """Serializa un grupo de asuetos junto con sus fechas de asueto."""
+    annual_holidays = holiday.annual_holidays
+    holiday_data = HolidayRead.model_validate(holiday).model_dump()
+    holiday_data["annual_holidays"] = _ANNUAL_HOLIDAYS_ADAPTER.validate_python(annual_holidays, from_attributes=True)
+    holiday_data["annual_holidays_count"] = len(annual_holidays)
+    return holiday_data
+
 
 @router.get("/", response_model=dict)
 async def list_holidays(
@@ -21,7 +44,7 @@ async def list_holidays(
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=1000)] = 100,
     year: Annotated[int | None, Query(ge=2020, le=2100)] = None,
-) -> dict:
+) -> Response:
     """List all holiday year groups with optional filters.
 
     Args:
@@ -33,20 +56,19 @@ async def list_holidays(
     Returns:
         Dictionary with data and total count
     """
-    holidays = await crud_holiday.get_holidays(session=session, skip=skip, limit=limit, year=year)
-
-    # Simple count
-    all_holidays = await crud_holiday.get_holidays(session=session, skip=0, limit=10000)
-    total = len(all_holidays)
+    holidays, total = await asyncio.gather(
+        crud_holiday.get_holidays(session=session, skip=skip, limit=limit, year=year),
+        cached_count(
+            f"{_COUNT_CACHE_PREFIX}{year}", lambda: count_in_own_session(crud_holiday.count_holidays, year=year)
+        ),
+    )
 
     # Add count of annual_holidays to each holiday
-    result_data = []
-    for holiday in holidays:
-        holiday_dict = HolidayRead.model_validate(holiday).model_dump()
-        holiday_dict["annual_holidays_count"] = len(holiday.annual_holidays)
-        result_data.append(holiday_dict)
+    result_data = _HOLIDAYS_ADAPTER.validate_python(holidays, from_attributes=True)
+    for holiday_read, holiday in zip(result_data, holidays):
+        holiday_read.annual_holidays_count = len(holiday.annual_holidays)
 
-    return {"data": result_data, "total": total}
+    return json_response(to_json({"data": result_data, "total": total}))
 
 
 @router.get("/{holiday_id}", response_model=dict)
@@ -54,7 +76,7 @@ async def get_holiday(
     holiday_id: int,
     session: Annotated[AsyncSession, Depends(async_get_db)],
     _current_user: Annotated[dict, Depends(get_current_user)],  # cualquier usuario autenticado
-) -> dict:
+) -> Response:
     """Get a specific holiday by ID with all its annual holidays.
 
     Args:
@@ -76,13 +98,7 @@ async def get_holiday(
         )
 
     # Build response with annual holidays
-    holiday_data = HolidayRead.model_validate(holiday).model_dump()
-    holiday_data["annual_holidays"] = [
-        AnnualHolidayRead.model_validate(ah).model_dump() for ah in holiday.annual_holidays
-    ]
-    holiday_data["annual_holidays_count"] = len(holiday.annual_holidays)
-
-    return holiday_data
+    return json_response(to_json(_dump_holiday_detail(holiday)))
 
 
 @router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -110,15 +126,10 @@ async def create_holiday(
     """
     try:
         new_holiday = await crud_holiday.create_holiday(session=session, holiday_data=holiday_data)
+        await invalidate_cached(_COUNT_CACHE_PREFIX)
 
         # Build response with generated annual holidays
-        holiday_response = HolidayRead.model_validate(new_holiday).model_dump()
-        holiday_response["annual_holidays"] = [
-            AnnualHolidayRead.model_validate(ah).model_dump() for ah in new_holiday.annual_holidays
-        ]
-        holiday_response["annual_holidays_count"] = len(new_holiday.annual_holidays)
-
-        return holiday_response
+        return _dump_holiday_detail(new_holiday)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -154,6 +165,7 @@ async def update_holiday(
                 detail=f"Grupo de asuetos con ID {holiday_id} no encontrado",
             )
 
+        await invalidate_cached(_COUNT_CACHE_PREFIX)
         return HolidayRead.model_validate(updated_holiday)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -181,3 +193,5 @@ async def delete_holiday(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Grupo de asuetos con ID {holiday_id} no encontrado",
         )
+
+    await invalidate_cached(_COUNT_CACHE_PREFIX)
@@ -1,15 +1,21 @@
 """API endpoints for Hourly Rate History management."""
 
+import asyncio
 from datetime import date
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_user
+from ...api.responses import json_response
 from ...core.db.database import async_get_db
+from ...core.utils.cache import cached_count, invalidate_cached
 from ...crud import crud_hourly_rate_history
+from ...crud.pagination import count_in_own_session
 from ...schemas.hourly_rate_history import (
     HourlyRateHistoryCreate,
     HourlyRateHistoryRead,
@@ -19,6 +25,13 @@ from ...schemas.hourly_rate_history import (
 
 router = APIRouter()
 
+# Prefijo de los totales de paginación cacheados; se invalidan al crear, corregir o eliminar tarifas
+_COUNT_CACHE_PREFIX = "count:hourly_rates:"
+
+# Adaptadores precompilados al importar el módulo: validan y serializan listas completas en una sola llamada
+_RATES_ADAPTER = TypeAdapter(list[HourlyRateHistoryRead])
+_TIMELINE_ADAPTER = TypeAdapter(list[HourlyRateTimelineItem])
+
 
 @router.get("/", response_model=dict)
 async def list_hourly_rates(
@@ -29,44 +42,66 @@ async def list_hourly_rates(
     is_active: Annotated[bool | None, Query()] = None,
     start_date: Annotated[date | None, Query()] = None,
     end_date: Annotated[date | None, Query()] = None,
-) -> dict:
+    cursor: Annotated[str | None, Query(min_length=1)] = None,
+) -> Response:
     """List all hourly rates with optional filters.
 
     Used by audit team to consult all rates and by the ingestion engine
     to filter by level_id and date to find the applicable rate.
 
+    Pagination is keyset-based: pass the returned ``next_cursor`` as ``cursor`` to get the next page, which costs
+    the same regardless of depth. ``skip`` is kept for existing clients and ignored when ``cursor`` is given.
+
     Args:
         session: Database session
-        skip: Number of records to skip (pagination)
+        skip: Number of records to skip (deprecated, prefer ``cursor``)
         limit: Maximum number of records to return
         level_id: Filter by academic level ID
         is_active: Filter by active status (end_date IS NULL)
         start_date: Filter by start date (rates starting on or after)
         end_date: Filter by end date (rates ending on or before)
+        cursor: Opaque ``next_cursor`` of the previous page
 
     Returns:
-        Dictionary with data and total count
-    """
-    rates = await crud_hourly_rate_history.get_hourly_rates(
-        session=session,
-        skip=skip,
-        limit=limit,
-        level_id=level_id,
-        is_active=is_active,
-        start_date=start_date,
-        end_date=end_date,
-    )
+        Dictionary with data, total count and next_cursor (None on the last page)
 
-    total = await crud_hourly_rate_history.count_hourly_rates(session=session, level_id=level_id, is_active=is_active)
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    # Se pide una fila extra para saber si hay otra página sin depender del total
+    try:
+        rates, total = await asyncio.gather(
+            crud_hourly_rate_history.get_hourly_rates(
+                session=session,
+                skip=skip,
+                limit=limit + 1,
+                level_id=level_id,
+                is_active=is_active,
+                start_date=start_date,
+                end_date=end_date,
+                cursor=cursor,
+            ),
+            cached_count(
+                f"{_COUNT_CACHE_PREFIX}{level_id}:{is_active}",
+                lambda: count_in_own_session(
+                    crud_hourly_rate_history.count_hourly_rates, level_id=level_id, is_active=is_active
+                ),
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+    next_cursor = crud_hourly_rate_history.encode_rate_cursor(rates[limit - 1]) if len(rates) > limit else None
 
-    return {"data": [HourlyRateHistoryRead.model_validate(rate) for rate in rates], "total": total}
+    data = _RATES_ADAPTER.validate_python(rates[:limit], from_attributes=True)
+    payload = {"data": data, "total": total, "next_cursor": next_cursor}
+    return json_response(to_json(payload))
 
 
 @router.get("/{rate_id}", response_model=HourlyRateHistoryRead)
 async def get_hourly_rate(
     rate_id: int,
     session: Annotated[AsyncSession, Depends(async_get_db)],
-) -> HourlyRateHistoryRead:
+) -> Response:
     """Get a specific hourly rate by ID.
 
     Args:
@@ -87,7 +122,7 @@ async def get_hourly_rate(
             detail=f"Tarifa horaria con ID {rate_id} no encontrada",
         )
 
-    return HourlyRateHistoryRead.model_validate(rate)
+    return json_response(HourlyRateHistoryRead.model_validate(rate).model_dump_json())
 
 
 @router.get("/current/{level_id}", response_model=HourlyRateHistoryRead)
@@ -95,7 +130,7 @@ async def get_current_rate(
     level_id: int,
     session: Annotated[AsyncSession, Depends(async_get_db)],
     reference_date: Annotated[date | None, Query()] = None,
-) -> HourlyRateHistoryRead:
+) -> Response:
     """Get the current active rate for a specific academic level.
 
     This endpoint is used by the ingestion engine to determine the applicable
@@ -123,14 +158,14 @@ async def get_current_rate(
             detail=f"No se encontró tarifa vigente para el nivel {level_id} en la fecha {date_str}",
         )
 
-    return HourlyRateHistoryRead.model_validate(rate)
+    return json_response(HourlyRateHistoryRead.model_validate(rate).model_dump_json())
 
 
 @router.get("/timeline/{level_id}", response_model=list[HourlyRateTimelineItem])
 async def get_rate_timeline(
     level_id: int,
     session: Annotated[AsyncSession, Depends(async_get_db)],
-) -> list[HourlyRateTimelineItem]:
+) -> Response:
     """Get complete timeline of rates for a specific academic level.
 
     Used for visualization and audit purposes.
@@ -144,7 +179,10 @@ async def get_rate_timeline(
     """
     rates = await crud_hourly_rate_history.get_rate_timeline(session=session, level_id=level_id)
 
-    return [HourlyRateTimelineItem.from_rate(HourlyRateHistoryRead.model_validate(rate)) for rate in rates]
+    timeline = [
+        HourlyRateTimelineItem.from_rate(rate) for rate in _RATES_ADAPTER.validate_python(rates, from_attributes=True)
+    ]
+    return json_response(_TIMELINE_ADAPTER.dump_json(timeline))
 
 
 @router.post("/", response_model=HourlyRateHistoryRead, status_code=status.HTTP_201_CREATED)
@@ -182,6 +220,7 @@ async def create_hourly_rate(
         new_rate = await crud_hourly_rate_history.create_hourly_rate(
             session=session, rate_data=rate_data, created_by_id=user_id
         )
+        await invalidate_cached(_COUNT_CACHE_PREFIX)
         return HourlyRateHistoryRead.model_validate(new_rate)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -223,6 +262,7 @@ async def update_hourly_rate(
                 detail=f"Tarifa horaria con ID {rate_id} no encontrada",
             )
 
+        await invalidate_cached(_COUNT_CACHE_PREFIX)
         return HourlyRateHistoryRead.model_validate(updated_rate)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -259,6 +299,7 @@ async def delete_hourly_rate(
                 detail=f"Tarifa horaria con ID {rate_id} no encontrada",
             )
 
+        await invalidate_cached(_COUNT_CACHE_PREFIX)
         return {"message": f"Tarifa horaria con ID {rate_id} eliminada exitosamente"}
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -22,6 +22,22 @@ from ...core.security import (
 
 router = APIRouter(tags=["login"])
 
+# Duración de la cookie del refresh token en segundos, calculada una sola vez
+REFRESH_TOKEN_MAX_AGE = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
+REFRESH_TOKEN_MAX_AGE_REMEMBER = REFRESH_TOKEN_EXPIRE_DAYS_REMEMBER * 24 * 60 * 60
+
+
+def _set_refresh_token_cookie(response: Response, refresh_token: str, max_age: int) -> None:
+    """Establecer la cookie HttpOnly con el refresh token."""
+    response.set_cookie(
+        key="refresh_token",
+        value=refresh_token,
+        httponly=True,
+        secure=True,
+        samesite="lax",
+        max_age=max_age,
+    )
+
 
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
@@ -51,9 +67,11 @@ async def login_for_access_token(
     if remember_me:
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES_REMEMBER)
         refresh_token_expires_days = REFRESH_TOKEN_EXPIRE_DAYS_REMEMBER
+        max_age = REFRESH_TOKEN_MAX_AGE_REMEMBER
     else:
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         refresh_token_expires_days = settings.REFRESH_TOKEN_EXPIRE_DAYS
+        max_age = REFRESH_TOKEN_MAX_AGE
 
     # Crear access token con duración apropiada
     access_token = await create_access_token_with_rbac(user_data=user, expires_delta=access_token_expires)
@@ -61,17 +79,9 @@ async def login_for_access_token(
     # Crear refresh token con duración apropiada
     refresh_token_expires = timedelta(days=refresh_token_expires_days)
     refresh_token = await create_refresh_token_with_rbac(user_data=user, expires_delta=refresh_token_expires)
-    max_age = refresh_token_expires_days * 24 * 60 * 60
 
     # Establecer cookie con refresh token
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=True,
-        samesite="lax",
-        max_age=max_age,
-    )
+    _set_refresh_token_cookie(response, refresh_token, max_age)
 
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -94,15 +104,8 @@ async def refresh_access_token(
 
     # Create new refresh token to rotate tokens
     new_refresh_token = await create_refresh_token_with_rbac(user_data=user_data)
-    max_age = settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 
     # Set new refresh token in cookie
-    response.set_cookie(
-        key="refresh_token",
-        value=new_refresh_token,
-        httponly=True,
-        secure=True,
-        max_age=max_age,
-    )
+    _set_refresh_token_cookie(response, new_refresh_token, REFRESH_TOKEN_MAX_AGE)
 
     return {"access_token": new_access_token, "token_type": "bearer"}
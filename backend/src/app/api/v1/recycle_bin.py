@@ -1,41 +1,131 @@
 """RecycleBin endpoints - CRUD operations for deleted items (Admin only)."""
 
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Annotated, Any, cast
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastcrud.paginated import PaginatedListResponse, compute_offset, paginated_response
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_db_readonly, local_session
 from ...core.exceptions.http_exceptions import NotFoundException
+from ...core.utils.cache import invalidate_cached
+from ...crud.crud_academic_level import restore_academic_level
+from ...crud.crud_catalog_coordination import hard_delete_coordination, restore_coordination
+from ...crud.crud_catalog_professor import hard_delete_professor, restore_professor
+from ...crud.crud_catalog_schedule_time import crud_catalog_schedule_time, restore_schedule_time
+from ...crud.crud_catalog_subject import crud_catalog_subject, restore_subject
+from ...crud.crud_faculties import hard_delete_faculty, restore_faculty
 from ...crud.crud_recycle_bin import (
     get_all_deleted_items,
     get_deleted_items_by_type,
     get_recycle_bin_by_id,
+    get_recycle_bin_items_after,
     get_restored_items,
     mark_as_restored,
+    stream_recycle_bin_items,
     update_can_restore,
 )
-from ...schemas.recycle_bin import RecycleBinRead, RecycleBinRestore
+from ...crud.crud_term import restore_term
+from ...crud.crud_users import hard_delete_user, restore_user
+from ...schemas.recycle_bin import RecycleBinCursorPage, RecycleBinRead, RecycleBinRestore
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["recycle-bin"])
 
 
-@router.get("/recycle-bin", response_model=PaginatedListResponse[RecycleBinRead])
+# Valida una página completa de elementos en una sola llamada a pydantic-core
+_RECYCLE_BIN_LIST_ADAPTER = TypeAdapter(list[RecycleBinRead])
+
+
+def _listing_filters(entity_type: str | None, show_restored: bool) -> tuple[str | None, bool | None]:
+    """Traducir los parámetros del listado a ``(entity_type, restored)`` de las consultas por cursor y de exportación.
+
+    Igual que la paginación por página: los restaurados se listan sin filtrar por tipo, un tipo solo muestra
+    elementos no restaurados y sin filtros se listan todos.
+    """
+    if show_restored:
+        return None, True
+    return entity_type, (False if entity_type else None)
+
+
+async def _restore_term(db: AsyncSession, term_id: int) -> bool:
+    return await restore_term(session=db, term_id=term_id)
+
+
+async def _restore_academic_level(db: AsyncSession, level_id: int) -> bool:
+    """Restaurar un nivel académico, lanzando HTTP 400 si otro nivel activo ocupa su lugar."""
+    restore_result = await restore_academic_level(session=db, level_id=level_id)
+
+    # Si hay conflicto detectado, lanzar excepción con el mensaje
+    if restore_result.get("conflict_detected"):
+        conflicting_level = restore_result.get("conflicting_level")
+        message = restore_result.get("message", "Conflicto detectado")
+        logger.warning(f"Conflicto al restaurar: {message}")
+        raise HTTPException(
+            status_code=400,
+            detail={"message": message, "conflict_detected": True, "conflicting_level": conflicting_level},
+        )
+
+    return restore_result.get("success", False)
+
+
+async def _hard_delete_subject(db: AsyncSession, subject_id: int) -> None:
+    await crud_catalog_subject.delete(db=db, id=subject_id)
+    await db.commit()
+
+
+async def _hard_delete_schedule_time(db: AsyncSession, schedule_time_id: int) -> None:
+    await crud_catalog_schedule_time.delete(db=db, id=schedule_time_id)
+    await db.commit()
+
+
+# Tipo de entidad -> (función, conversión del entity_id almacenado, nombre del argumento del id)
+EntityDispatch = tuple[Callable[..., Awaitable[Any]], Callable[[str], Any], str]
+
+RESTORE_DISPATCH: dict[str, EntityDispatch] = {
+    "faculty": (restore_faculty, int, "faculty_id"),
+    "user": (restore_user, UUID, "user_uuid"),
+    "professor": (restore_professor, int, "id"),
+    "subject": (restore_subject, int, "subject_id"),
+    "schedule-time": (restore_schedule_time, int, "schedule_time_id"),
+    "coordination": (restore_coordination, int, "coordination_id"),
+    "terms": (_restore_term, int, "term_id"),
+    "academic-level": (_restore_academic_level, int, "level_id"),
+}
+
+HARD_DELETE_DISPATCH: dict[str, EntityDispatch] = {
+    "faculty": (hard_delete_faculty, int, "faculty_id"),
+    "user": (hard_delete_user, UUID, "user_uuid"),
+    "professor": (hard_delete_professor, int, "id"),
+    "subject": (_hard_delete_subject, int, "subject_id"),
+    "schedule-time": (_hard_delete_schedule_time, int, "schedule_time_id"),
+    "coordination": (hard_delete_coordination, int, "coordination_id"),
+}
+
+
+@router.get("/recycle-bin", response_model=PaginatedListResponse[RecycleBinRead] | RecycleBinCursorPage)
 async def list_recycle_bin(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
+    db: Annotated[AsyncSession, Depends(async_get_db_readonly)],
     current_user: Annotated[dict, Depends(get_current_superuser)],  # Admin only
     page: int = 1,
     items_per_page: int = 10,
     entity_type: str | None = None,
     show_restored: bool = False,
+    cursor: str | None = None,
 ) -> dict:
     """Obtener lista paginada de elementos en la papelera de reciclaje - Solo Admin.
 
+    Por defecto pagina por número de página (OFFSET). Si se envía ``cursor`` (``next_cursor`` de la respuesta
+    anterior, vacío para la primera página) se pagina por keyset sobre ``(deleted_at, id)`` del más reciente al más
+    antiguo, sin OFFSET ni conteo total, y la respuesta incluye ``next_cursor``.
+
     Args:
     ----
         request: Objeto request de FastAPI
@@ -45,43 +135,87 @@ async def list_recycle_bin(
         items_per_page: Items por página (default: 10)
         entity_type: Filtrar por tipo de entidad (opcional)
         show_restored: Mostrar elementos restaurados (default: False)
+        cursor: Cursor de la página anterior para paginar por keyset (opcional)
 
     Returns:
     -------
         Lista paginada de elementos eliminados
     """
-    if show_restored:
-        # Mostrar elementos restaurados
-        items = await get_restored_items(db=db, offset=compute_offset(page, items_per_page), limit=items_per_page)
-        # Crear respuesta paginada manualmente para items restaurados
-        response: dict[str, Any] = {
-            "data": [RecycleBinRead.model_validate(item) for item in items],
-            "total_count": len(items),
-            "page": page,
+    if cursor is not None:
+        # Paginación por cursor con los mismos filtros que cada modo de la paginación por página
+        filter_entity_type, restored = _listing_filters(entity_type, show_restored)
+        try:
+            items_page = await get_recycle_bin_items_after(
+                db=db,
+                cursor=cursor or None,
+                limit=items_per_page,
+                entity_type=filter_entity_type,
+                restored=restored,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        return {
+            "data": _RECYCLE_BIN_LIST_ADAPTER.validate_python(items_page["data"], from_attributes=True),
+            "next_cursor": items_page["next_cursor"],
             "items_per_page": items_per_page,
-            "total_pages": 1,
         }
-        return response
+
+    offset = compute_offset(page, items_per_page)
+    if show_restored:
+        # Mostrar elementos restaurados
+        items_data = await get_restored_items(db=db, offset=offset, limit=items_per_page)
     elif entity_type:
         # Filtrar por tipo de entidad
         items_data = await get_deleted_items_by_type(
-            db=db, entity_type=entity_type, offset=compute_offset(page, items_per_page), limit=items_per_page
+            db=db, entity_type=entity_type, offset=offset, limit=items_per_page
         )
     else:
         # Todos los elementos no restaurados
-        items_data = await get_all_deleted_items(
-            db=db, offset=compute_offset(page, items_per_page), limit=items_per_page
-        )
+        items_data = await get_all_deleted_items(db=db, offset=offset, limit=items_per_page)
 
     response: dict[str, Any] = paginated_response(crud_data=items_data, page=page, items_per_page=items_per_page)
     return response
 
 
+@router.get("/recycle-bin/export")
+async def export_recycle_bin(
+    request: Request,
+    current_user: Annotated[dict, Depends(get_current_superuser)],  # Admin only
+    entity_type: str | None = None,
+    show_restored: bool = False,
+) -> StreamingResponse:
+    """Exportar todos los elementos de la papelera como NDJSON (un elemento por línea) - Solo Admin.
+
+    Usa los mismos filtros que el listado, sin paginar: las filas se leen de la base de datos en lotes y se
+    envían a medida que llegan, sin cargar toda la papelera en memoria.
+
+    Args:
+    ----
+        request: Objeto request de FastAPI
+        current_user: Usuario admin autenticado actual
+        entity_type: Filtrar por tipo de entidad (opcional)
+        show_restored: Exportar elementos restaurados (default: False)
+
+    Returns:
+    -------
+        Respuesta en streaming con ``application/x-ndjson``
+    """
+    filter_entity_type, restored = _listing_filters(entity_type, show_restored)
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        # Sesión propia: la de la dependencia se cierra antes de que empiece a enviarse la respuesta
+        async with local_session() as session:
+            async for item in stream_recycle_bin_items(session, entity_type=filter_entity_type, restored=restored):
+                yield RecycleBinRead.model_validate(item).model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @router.get("/recycle-bin/{recycle_bin_id}", response_model=RecycleBinRead)
 async def get_recycle_bin_item(
     request: Request,
     recycle_bin_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
+    db: Annotated[AsyncSession, Depends(async_get_db_readonly)],
     current_user: Annotated[dict, Depends(get_current_superuser)],  # Admin only
 ) -> RecycleBinRead:
     """Obtener un elemento específico de la papelera de reciclaje - Solo Admin.
@@ -152,72 +286,27 @@ async def restore_from_recycle_bin(
     entity_type = item.get("entity_type")
     entity_id = item.get("entity_id")
 
-    restore_success = False
-
-    if entity_type == "faculty":
-        from ...crud.crud_faculties import restore_faculty
-
-        restore_success = await restore_faculty(db=db, faculty_id=int(entity_id))
-    elif entity_type == "user":
-        from uuid import UUID
-
-        from ...crud.crud_users import restore_user
-
-        restore_success = await restore_user(db=db, user_uuid=UUID(entity_id))
-    elif entity_type == "professor":
-        from ...crud.crud_catalog_professor import restore_professor
-
-        restore_success = await restore_professor(db=db, id=int(entity_id))
-    elif entity_type == "subject":
-        from ...crud.crud_catalog_subject import restore_subject
-
-        restore_success = await restore_subject(db=db, subject_id=int(entity_id))
-    elif entity_type == "schedule-time":
-        from ...crud.crud_catalog_schedule_time import restore_schedule_time
-
-        restore_success = await restore_schedule_time(db=db, schedule_time_id=int(entity_id))
-    elif entity_type == "coordination":
-        from ...crud.crud_catalog_coordination import restore_coordination
-
-        restore_success = await restore_coordination(db=db, coordination_id=int(entity_id))
-    elif entity_type == "terms":
-        from ...crud.crud_term import restore_term
-
-        restore_success = await restore_term(session=db, term_id=int(entity_id))
-    elif entity_type == "academic-level":
-        from ...crud.crud_academic_level import restore_academic_level
-
-        restore_result = await restore_academic_level(session=db, level_id=int(entity_id))
-        restore_success = restore_result.get("success", False)
-
-        # Si hay conflicto detectado, lanzar excepción con el mensaje
-        if restore_result.get("conflict_detected"):
-            conflicting_level = restore_result.get("conflicting_level")
-            message = restore_result.get("message", "Conflicto detectado")
-            logger.warning(f"Conflicto al restaurar: {message}")
-            raise HTTPException(
-                status_code=400,
-                detail={"message": message, "conflict_detected": True, "conflicting_level": conflicting_level},
-            )
-    else:
+    dispatch = RESTORE_DISPATCH.get(entity_type)
+    if dispatch is None:
         raise NotFoundException(f"Tipo de entidad '{entity_type}' no soportado para restauración")
 
+    restore_func, coerce_id, id_kwarg = dispatch
+    restore_success = await restore_func(db=db, **{id_kwarg: coerce_id(entity_id)})
+
     if not restore_success:
         raise NotFoundException(f"Error al restaurar la entidad original '{entity_type}' con id '{entity_id}'")
 
-    # Marcar como restaurado en RecycleBin
-    success = await mark_as_restored(
+    # Marcar como restaurado en RecycleBin; el UPDATE devuelve el registro actualizado
+    updated_item = await mark_as_restored(
         db=db,
         recycle_bin_id=recycle_bin_id,
         restored_by_id=restore_data.restored_by_id,
         restored_by_name=restore_data.restored_by_name,
     )
 
-    if not success:
+    if updated_item is None:
         raise NotFoundException(f"Error al marcar como restaurado el elemento con id '{recycle_bin_id}'")
 
-    # Recuperar el registro actualizado
-    updated_item = await get_recycle_bin_by_id(db=db, recycle_bin_id=recycle_bin_id)
     return cast(RecycleBinRead, updated_item)
 
 
@@ -257,48 +346,18 @@ async def mark_as_permanently_deleted(
     entity_type = item.get("entity_type")
     entity_id = item.get("entity_id")
 
-    # Eliminar físicamente el registro de la entidad original
-    if entity_type == "faculty":
-        from ...crud.crud_faculties import hard_delete_faculty
-
-        await hard_delete_faculty(db=db, faculty_id=int(entity_id))
-        # hard_delete_faculty ya hace commit internamente
-    elif entity_type == "user":
-        from uuid import UUID
-
-        from ...crud.crud_users import hard_delete_user
-
-        await hard_delete_user(db=db, user_uuid=UUID(entity_id))
-        # hard_delete_user ya hace commit internamente
-    elif entity_type == "professor":
-        from ...crud.crud_catalog_professor import hard_delete_professor
-
-        await hard_delete_professor(db=db, id=int(entity_id))
-        # hard_delete_professor ya hace commit internamente
-    elif entity_type == "subject":
-        from ...crud.crud_catalog_subject import crud_catalog_subject
-
-        await crud_catalog_subject.delete(db=db, id=int(entity_id))
-        await db.commit()
-    elif entity_type == "schedule-time":
-        from ...crud.crud_catalog_schedule_time import crud_catalog_schedule_time
+    # Eliminar físicamente el registro de la entidad original (cada función hace su propio commit)
+    dispatch = HARD_DELETE_DISPATCH.get(entity_type)
+    if dispatch is not None:
+        delete_func, coerce_id, id_kwarg = dispatch
+        await delete_func(db=db, **{id_kwarg: coerce_id(entity_id)})
 
-        await crud_catalog_schedule_time.delete(db=db, id=int(entity_id))
-        await db.commit()
-    elif entity_type == "coordination":
-        from ...crud.crud_catalog_coordination import hard_delete_coordination
-
-        await hard_delete_coordination(db=db, coordination_id=int(entity_id))
-    # Agregar más tipos de entidades aquí según sea necesario
+    # Borrar una facultad elimina sus escuelas en cascada (School.fk_faculty ondelete=CASCADE)
+    if entity_type == "faculty":
+        await invalidate_cached("schools:list:")
 
     # Marcar como que no se puede restaurar en RecycleBin (mantener historial)
-    from ...crud.crud_recycle_bin import update_can_restore
-
-    await update_can_restore(db=db, recycle_bin_id=recycle_bin_id, can_restore=False)
-    await db.commit()
-
-    # Recuperar el registro actualizado
-    updated_item = await get_recycle_bin_by_id(db=db, recycle_bin_id=recycle_bin_id)
+    updated_item = await update_can_restore(db=db, recycle_bin_id=recycle_bin_id, can_restore=False)
     return cast(RecycleBinRead, updated_item)
 
 
@@ -328,17 +387,9 @@ async def update_can_restore_status(
     ------
         NotFoundException: Si el elemento no se encuentra
     """
-    # Verificar si el elemento existe
-    item = await get_recycle_bin_by_id(db=db, recycle_bin_id=recycle_bin_id)
-    if item is None:
+    # Actualizar can_restore; si el elemento no existe el UPDATE no devuelve filas
+    updated_item = await update_can_restore(db=db, recycle_bin_id=recycle_bin_id, can_restore=can_restore)
+    if updated_item is None:
         raise NotFoundException(f"No se encontró el elemento con id '{recycle_bin_id}' en la papelera de reciclaje")
 
-    # Actualizar can_restore
-    success = await update_can_restore(db=db, recycle_bin_id=recycle_bin_id, can_restore=can_restore)
-
-    if not success:
-        raise NotFoundException(f"Error al actualizar el elemento con id '{recycle_bin_id}'")
-
-    # Recuperar el registro actualizado
-    updated_item = await get_recycle_bin_by_id(db=db, recycle_bin_id=recycle_bin_id)
     return cast(RecycleBinRead, updated_item)
@@ -8,16 +8,20 @@ from fastcrud.paginated import PaginatedListResponse, compute_offset, paginated_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...core.db.database import async_get_db, async_get_db_readonly
 from ...core.exceptions.http_exceptions import DuplicateValueException, NotFoundException
 from ...core.rbac_scope import get_user_scope_filters
-from ...crud.crud_faculties import get_faculty_by_uuid
-from ...crud.crud_schools import crud_schools, get_school_by_uuid, school_acronym_exists, school_exists
+from ...core.utils.cache import cached_json, invalidate_cached
+from ...crud.crud_schools import crud_schools, get_school_by_uuid, update_school_values, validate_school_values
+from ...crud.pagination import get_multi_with_total
 from ...models.role import UserRoleEnum
 from ...schemas.school import SchoolCreate, SchoolRead, SchoolUpdate
 
 router = APIRouter(prefix="/catalog/schools", tags=["catalog-schools"])
 
+# Prefijo de las respuestas de list_schools cacheadas; se invalidan al crear, editar o eliminar escuelas
+_LIST_CACHE_PREFIX = "schools:list:"
+
 
 @router.post("", response_model=SchoolRead, status_code=201)
 async def create_school(
@@ -44,34 +48,31 @@ async def create_school(
         NotFoundException: Si la facultad no se encuentra
         DuplicateValueException: Si el nombre o acrónimo de la escuela ya existe en la facultad
     """
-    # Validar que la facultad existe
-    faculty = await get_faculty_by_uuid(db=db, faculty_id=school.fk_faculty)
-    if faculty is None:
+    # Validar facultad, nombre y acrónimo en una sola consulta
+    faculty_exists, name_taken, acronym_taken = await validate_school_values(
+        db=db, faculty_id=school.fk_faculty, name=school.name, acronym=school.acronym
+    )
+    if not faculty_exists:
         raise NotFoundException(f"No se encontró la facultad con id '{school.fk_faculty}'")
 
     # Verificar si el nombre de la escuela ya existe en esta facultad
-    if await school_exists(db=db, name=school.name, faculty_id=school.fk_faculty):
+    if name_taken:
         raise DuplicateValueException(f"Ya existe una escuela con el nombre '{school.name}' en esta facultad")
 
     # Verificar si el acrónimo de la escuela ya existe en esta facultad
-    if await school_acronym_exists(db=db, acronym=school.acronym, faculty_id=school.fk_faculty):
+    if acronym_taken:
         raise DuplicateValueException(f"Ya existe una escuela con el acrónimo '{school.acronym}' en esta facultad")
 
-    # Create school
+    # Crear la escuela; la instancia ya tiene el id y los valores por defecto tras el commit
     created_school = await crud_schools.create(db=db, object=school)
-
-    # Retrieve and return the created school
-    school_read = await crud_schools.get(db=db, id=created_school.id, schema_to_select=SchoolRead)
-    if school_read is None:
-        raise NotFoundException("Created school not found")
-
-    return cast(SchoolRead, school_read)
+    await invalidate_cached(_LIST_CACHE_PREFIX)
+    return SchoolRead.model_validate(created_school)
 
 
 @router.get("", response_model=PaginatedListResponse[SchoolRead])
 async def list_schools(
     request: Request,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
+    db: Annotated[AsyncSession, Depends(async_get_db_readonly)],
     current_user: Annotated[dict, Depends(get_current_user)],  # All authenticated users
     page: int = 1,
     items_per_page: int = 10,
@@ -132,11 +133,20 @@ async def list_schools(
         if scope.get("faculty_id") is not None:
             filters["fk_faculty"] = scope["faculty_id"]
 
-    schools_data = await crud_schools.get_multi(
-        db=db, offset=compute_offset(page, items_per_page), limit=items_per_page, **filters
-    )
+    async def load_page() -> dict[str, Any]:
+        # Página y total en una sola consulta (COUNT(*) OVER())
+        schools_data = await get_multi_with_total(
+            crud_schools, db=db, offset=compute_offset(page, items_per_page), limit=items_per_page, **filters
+        )
+        return paginated_response(crud_data=schools_data, page=page, items_per_page=items_per_page)
 
-    response: dict[str, Any] = paginated_response(crud_data=schools_data, page=page, items_per_page=items_per_page)
+    # La clave usa los filtros ya acotados por alcance, así directores y decanos no comparten entradas
+    filters_key = ",".join(
+        f"{key}={sorted(value) if isinstance(value, list) else value}" for key, value in sorted(filters.items())
+    )
+    response: dict[str, Any] = await cached_json(
+        f"{_LIST_CACHE_PREFIX}{page}:{items_per_page}:{filters_key}", load_page
+    )
     return response
 
 
@@ -144,7 +154,7 @@ async def list_schools(
 async def get_school(
     request: Request,
     school_id: int,
-    db: Annotated[AsyncSession, Depends(async_get_db)],
+    db: Annotated[AsyncSession, Depends(async_get_db_readonly)],
     current_user: Annotated[dict, Depends(get_current_user)],  # All authenticated users
 ) -> SchoolRead:
     """Obtener una escuela específica por UUID con su facultad - Accesible para todos los usuarios autenticados.
@@ -203,28 +213,32 @@ async def update_school(
     if db_school is None:
         raise NotFoundException(f"No se encontró la escuela con id '{school_id}'")
 
-    # Si se está cambiando la facultad, validar que la nueva facultad existe
-    if values.fk_faculty is not None and values.fk_faculty != db_school["fk_faculty"]:
-        faculty = await get_faculty_by_uuid(db=db, faculty_id=values.fk_faculty)
-        if faculty is None:
-            raise NotFoundException(f"No se encontró la facultad con id '{values.fk_faculty}'")
+    # Validar en una sola consulta solo lo que cambia: la nueva facultad y el nombre/acrónimo en la facultad destino
+    target_faculty_id = values.fk_faculty if values.fk_faculty is not None else db_school["fk_faculty"]
+    faculty_exists, name_taken, acronym_taken = await validate_school_values(
+        db=db,
+        faculty_id=target_faculty_id,
+        name=values.name if values.name is not None and values.name != db_school["name"] else None,
+        acronym=values.acronym if values.acronym is not None and values.acronym != db_school["acronym"] else None,
+        check_faculty=values.fk_faculty is not None and values.fk_faculty != db_school["fk_faculty"],
+    )
+    if not faculty_exists:
+        raise NotFoundException(f"No se encontró la facultad con id '{values.fk_faculty}'")
 
     # Verificar si el nuevo nombre entra en conflicto con una escuela existente en la misma facultad
-    target_faculty_id = values.fk_faculty if values.fk_faculty is not None else db_school["fk_faculty"]
-    if values.name is not None and values.name != db_school["name"]:
-        if await school_exists(db=db, name=values.name, faculty_id=target_faculty_id):
-            raise DuplicateValueException(f"Ya existe una escuela con el nombre '{values.name}' en esta facultad")
+    if name_taken:
+        raise DuplicateValueException(f"Ya existe una escuela con el nombre '{values.name}' en esta facultad")
 
     # Verificar si el nuevo acrónimo entra en conflicto con una escuela existente en la misma facultad
-    if values.acronym is not None and values.acronym != db_school["acronym"]:
-        if await school_acronym_exists(db=db, acronym=values.acronym, faculty_id=target_faculty_id):
-            raise DuplicateValueException(f"Ya existe una escuela con el acrónimo '{values.acronym}' en esta facultad")
+    if acronym_taken:
+        raise DuplicateValueException(f"Ya existe una escuela con el acrónimo '{values.acronym}' en esta facultad")
 
-    # Update school
-    await crud_schools.update(db=db, object=values, id=school_id)
+    # Actualizar y devolver la escuela actualizada en la misma sentencia
+    updated_school = await update_school_values(db=db, school_id=school_id, values=values)
+    if updated_school is None:
+        raise NotFoundException(f"No se encontró la escuela con id '{school_id}'")
 
-    # Retrieve and return updated school
-    updated_school = await get_school_by_uuid(db=db, school_id=school_id)
+    await invalidate_cached(_LIST_CACHE_PREFIX)
     return cast(SchoolRead, updated_school)
 
 
@@ -257,3 +271,4 @@ async def delete_school(
 
     # Delete school (cascade will handle related records)
     await crud_schools.delete(db=db, id=school_id)
+    await invalidate_cached(_LIST_CACHE_PREFIX)
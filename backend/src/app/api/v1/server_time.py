@@ -1,6 +1,6 @@
 """Server time endpoint for UTC time synchronization."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 
 from fastapi import APIRouter
 
@@ -10,4 +10,6 @@ router = APIRouter()
 @router.get("/")
 async def get_server_time():
     """Get current server time in UTC."""
-    return {"server_time_utc": datetime.utcnow().isoformat(), "timestamp": datetime.utcnow().timestamp()}
+    # Single timezone-aware read so both fields describe the same instant
+    now = datetime.now(UTC)
+    return {"server_time_utc": now.isoformat(), "timestamp": now.timestamp()}
@@ -133,6 +133,13 @@ class PostgresSettings(DatabaseSettings):
     POSTGRES_SYNC_PREFIX: str = "postgresql://"
     POSTGRES_ASYNC_PREFIX: str = "postgresql+asyncpg://"
     POSTGRES_URL: str | None = None
+    # Pool de conexiones por proceso: con 4 workers de gunicorn, (10 + 10) * 4 = 80 conexiones como máximo, por debajo
+    # del max_connections=100 por defecto de PostgreSQL
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: int = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
 
     @property
     def POSTGRES_URI(self) -> str:
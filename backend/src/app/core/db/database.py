@@ -16,11 +16,35 @@ DATABASE_PREFIX = settings.POSTGRES_ASYNC_PREFIX
 DATABASE_URL = f"{DATABASE_PREFIX}{DATABASE_URI}"
 
 
-async_engine = create_async_engine(DATABASE_URL, echo=False, future=True)
+async_engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    future=True,
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+    pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+)
 
 local_session = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
 
+# Same pool in autocommit mode: each statement runs on its own, without the BEGIN/ROLLBACK pair around the request
+readonly_session = async_sessionmaker(
+    bind=async_engine.execution_options(isolation_level="AUTOCOMMIT"), class_=AsyncSession, expire_on_commit=False
+)
+
 
 async def async_get_db() -> AsyncGenerator[AsyncSession, None]:
     async with local_session() as db:
         yield db
+
+
+async def async_get_db_readonly() -> AsyncGenerator[AsyncSession, None]:
+    """Session in autocommit mode, for endpoints that only read.
+
+    Every statement commits as soon as it runs and nothing can be rolled back, so this session must never be used
+    to write; endpoints that write use ``async_get_db``.
+    """
+    async with readonly_session() as db:
+        yield db
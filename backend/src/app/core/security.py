@@ -1,3 +1,6 @@
+import asyncio
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 from enum import Enum
 from typing import Any, Literal, cast
@@ -12,7 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..crud.crud_users import crud_users
 from .config import settings
 from .schemas import TokenData
-from .utils.redis_blacklist import add_token_to_blacklist, is_token_blacklisted
+from .utils.redis_blacklist import add_token_to_blacklist, add_tokens_to_blacklist, is_token_blacklisted
 
 SECRET_KEY: SecretStr = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
@@ -23,6 +26,12 @@ REFRESH_TOKEN_EXPIRE_DAYS_REMEMBER = settings.REFRESH_TOKEN_EXPIRE_DAYS_REMEMBER
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login")
 
+# Claims de tokens ya verificados por verify_token_with_rbac: (token, tipo) -> (vence_en, claims).
+# Evita decodificar y verificar la firma del mismo JWT en cada request; la blacklist se sigue consultando siempre.
+_VERIFIED_CLAIMS_CACHE_SIZE = 1024
+_VERIFIED_CLAIMS_CACHE_TTL = 60
+_verified_claims_cache: OrderedDict[tuple[str, str], tuple[float, dict[str, Any]]] = OrderedDict()
+
 
 class TokenType(str, Enum):
     ACCESS = "access"
@@ -42,7 +51,8 @@ _pwd_context = PasswordHasher(
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        _pwd_context.verify(hashed_password, plain_password)
+        # Argon2 tarda decenas de ms y libera el GIL: verificar en un hilo para no bloquear el event loop
+        await asyncio.to_thread(_pwd_context.verify, hashed_password, plain_password)
         return True
     except Exception:
         return False
@@ -174,11 +184,19 @@ async def verify_token_with_rbac(token: str, expected_token_type: TokenType, db:
     dict[str, Any] | None
         Dictionary containing RBAC claims if the token is valid, None otherwise.
     """
-    # Verificar blacklist en Redis en lugar de PostgreSQL
+    # Verificar blacklist en Redis en lugar de PostgreSQL (siempre, también para tokens ya verificados)
     blacklisted = await is_token_blacklisted(token)
     if blacklisted:
         return None
 
+    cache_key = (token, expected_token_type)
+    cached = _verified_claims_cache.get(cache_key)
+    if cached is not None:
+        if cached[0] > time.time():
+            _verified_claims_cache.move_to_end(cache_key)
+            return dict(cached[1])
+        del _verified_claims_cache[cache_key]
+
     try:
         payload = jwt.decode(token, SECRET_KEY.get_secret_value(), algorithms=[ALGORITHM])
         username_or_email: str | None = payload.get("sub")
@@ -197,7 +215,15 @@ async def verify_token_with_rbac(token: str, expected_token_type: TokenType, db:
             "is_deleted": payload.get("is_deleted"),
         }
 
-        return rbac_claims
+        # Guardar los claims hasta que venza el token, como máximo _VERIFIED_CLAIMS_CACHE_TTL segundos
+        expires_at = time.time() + _VERIFIED_CLAIMS_CACHE_TTL
+        if payload.get("exp") is not None:
+            expires_at = min(expires_at, float(payload["exp"]))
+        _verified_claims_cache[cache_key] = (expires_at, rbac_claims)
+        if len(_verified_claims_cache) > _VERIFIED_CLAIMS_CACHE_SIZE:
+            _verified_claims_cache.popitem(last=False)
+
+        return dict(rbac_claims)
 
     except JWTError:
         return None
@@ -251,6 +277,7 @@ async def blacklist_tokens(access_token: str, refresh_token: str, db: AsyncSessi
     db: AsyncSession
         Database session for performing database operations (no longer usado, mantenido para compatibilidad).
     """
+    pending: dict[str, int] = {}
     for token in [access_token, refresh_token]:
         payload = jwt.decode(token, SECRET_KEY.get_secret_value(), algorithms=[ALGORITHM])
         exp_timestamp = payload.get("exp")
@@ -262,7 +289,10 @@ async def blacklist_tokens(access_token: str, refresh_token: str, db: AsyncSessi
 
             # Solo agregar a blacklist si el token aún no ha expirado
             if seconds_until_expiry > 0:
-                await add_token_to_blacklist(token, seconds_until_expiry)
+                pending[token] = seconds_until_expiry
+
+    # Ambos tokens se guardan en un solo viaje a Redis
+    await add_tokens_to_blacklist(pending)
 
 
 async def blacklist_token(token: str, db: AsyncSession) -> None:
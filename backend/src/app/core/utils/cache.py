@@ -1,12 +1,13 @@
 import functools
 import json
 import re
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from fastapi import Request
 from fastapi.encoders import jsonable_encoder
 from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
 
 from ..exceptions.cache_exceptions import CacheIdentificationInferenceError, InvalidRequestError, MissingClientError
 
@@ -183,6 +184,81 @@ async def _delete_keys_by_pattern(pattern: str) -> None:
             break
 
 
+async def cached_json(key: str, loader: Callable[[], Awaitable[Any]], expiration: int = 30) -> Any:
+    """Return a value cached in Redis under ``key`` as JSON, computing it with ``loader`` on a miss.
+
+    Meant for values that are read far more often than their table is written, such as list responses and
+    pagination totals: the caller builds the key from every value that shapes the result and drops the entries
+    with ``invalidate_cached`` when it writes the table.
+
+    Parameters
+    ----------
+    key: str
+        Cache key, usually a prefix shared by the endpoint plus the filter and pagination values.
+    loader: Callable[[], Awaitable[Any]]
+        Coroutine factory that computes the value.
+    expiration: int, optional
+        Time to live of the cached value in seconds. Defaults to 30.
+
+    Returns
+    -------
+    Any
+        The value in its JSON-compatible form (``jsonable_encoder``), cached or freshly computed. If Redis is not
+        configured or fails, ``loader`` is used directly.
+    """
+    if client is not None:
+        try:
+            cached = await client.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except RedisError:
+            pass
+
+    result = jsonable_encoder(await loader())
+
+    if client is not None:
+        try:
+            await client.set(key, json.dumps(result), ex=expiration)
+        except RedisError:
+            pass
+
+    return result
+
+
+async def cached_count(key: str, loader: Callable[[], Awaitable[int]], expiration: int = 30) -> int:
+    """Return a row count cached with ``cached_json``.
+
+    Parameters
+    ----------
+    key: str
+        Cache key, usually a prefix shared by the endpoint plus the filter values.
+    loader: Callable[[], Awaitable[int]]
+        Coroutine factory that runs the ``COUNT(*)`` query.
+    expiration: int, optional
+        Time to live of the cached count in seconds. Defaults to 30.
+
+    Returns
+    -------
+    int
+        The cached or freshly computed count.
+    """
+    return int(await cached_json(key, loader, expiration))
+
+
+async def invalidate_cached(prefix: str) -> None:
+    """Drop every value cached by ``cached_json`` under keys starting with ``prefix``.
+
+    Parameters
+    ----------
+    prefix: str
+        Key prefix of the values to invalidate. Example: 'schools:list:'
+    """
+    try:
+        await _delete_keys_by_pattern(prefix + "*")
+    except RedisError:
+        pass
+
+
 def cache(
     key_prefix: str,
     resource_id_name: Any = None,
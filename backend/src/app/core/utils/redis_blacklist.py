@@ -38,6 +38,32 @@ async def add_token_to_blacklist(token: str, expires_in_seconds: int) -> None:
         pass
 
 
+async def add_tokens_to_blacklist(tokens: dict[str, int]) -> None:
+    """Agregar varios tokens a la blacklist en Redis en un solo round-trip.
+
+    Args:
+    ----
+        tokens: Diccionario token -> segundos hasta que expire el token
+
+    Note:
+    ----
+        Los ``SETEX`` se envían en un pipeline sin transacción (un único viaje a Redis).
+        Si Redis no está disponible, la operación se omite silenciosamente.
+    """
+    if redis_client is None or not tokens:
+        return
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for token, expires_in_seconds in tokens.items():
+            pipe.setex(f"blacklist:token:{token}", expires_in_seconds, "1")
+        await pipe.execute()
+    except Exception:
+        # Si falla la escritura, omitir silenciosamente
+        # Los tokens expirarán naturalmente por su TTL
+        pass
+
+
 async def is_token_blacklisted(token: str) -> bool:
     """Verificar si un token está en la blacklist.
 
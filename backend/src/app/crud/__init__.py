@@ -2,8 +2,6 @@
 
 from .crud_faculties import (
     crud_faculties,
-    faculty_acronym_exists,
-    faculty_exists,
     get_active_faculties,
     get_faculty_by_uuid,
 )
@@ -33,8 +31,6 @@ __all__ = [
     "crud_user_scope",
     "get_faculty_by_uuid",
     "get_active_faculties",
-    "faculty_exists",
-    "faculty_acronym_exists",
     "get_school_by_uuid",
     "get_schools_by_faculty",
     "get_active_schools",
@@ -1,6 +1,6 @@
 """CRUD operations for BillingReport."""
 
-from sqlalchemy import desc, select
+from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.billing_report import (
@@ -109,6 +109,8 @@ class BillingReportCRUD:
         # Marcar como editado si hay cambios en los items
         if obj_in.payment_summaries is not None or obj_in.monthly_items is not None:
             db_obj.is_edited = True
+            # Forzar updated_at aunque el reporte ya estuviera editado (versiona la caché de dashboards)
+            db_obj.updated_at = func.now()
 
         # Actualizar campos del reporte principal
         update_data = obj_in.model_dump(exclude_unset=True, exclude={"payment_summaries", "monthly_items"})
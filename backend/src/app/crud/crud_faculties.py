@@ -1,14 +1,34 @@
 """Operaciones CRUD para el modelo Faculty."""
 
 from datetime import UTC, datetime
+from typing import NoReturn
 
 from fastcrud import FastCRUD
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 
 from ..models.faculty import Faculty
+from ..schemas.faculty import FacultyCreate
+from .pagination import decode_cursor, encode_cursor
 
 # Crear instancia CRUD para Faculty
 crud_faculties = FastCRUD(Faculty)
 
+# Columnas de FacultyRead devueltas por los UPDATE ... RETURNING
+_FACULTY_READ_COLUMNS = (
+    Faculty.id,
+    Faculty.name,
+    Faculty.acronym,
+    Faculty.is_active,
+    Faculty.deleted,
+    Faculty.created_at,
+    Faculty.updated_at,
+    Faculty.deleted_at,
+)
+
+# Índices únicos de Faculty y el campo que protege cada uno
+_UNIQUE_INDEX_FIELDS = {"ix_faculty_name": ("name", "nombre"), "ix_faculty_acronym": ("acronym", "acrónimo")}
+
 
 async def get_faculty_by_id(db, faculty_id: int):
     """Obtener facultad por ID."""
@@ -20,39 +40,89 @@ async def get_active_faculties(db, offset: int = 0, limit: int = 100):
     return await crud_faculties.get_multi(db=db, offset=offset, limit=limit, is_active=True)
 
 
-async def faculty_exists(db, name: str) -> bool:
-    """Verificar si existe una facultad con el nombre dado."""
-    result = await crud_faculties.exists(db=db, name=name)
-    return result
-
+def _raise_duplicate_value(error: IntegrityError, values: dict) -> NoReturn:
+    """Traducir la violación de un índice único de Faculty a ``ValueError`` con el campo afectado.
+
+    Cualquier otra violación de integridad se vuelve a lanzar sin cambios.
+    """
+    error_str = str(error.orig)
+    for index_name, (field, label) in _UNIQUE_INDEX_FIELDS.items():
+        if index_name in error_str:
+            raise ValueError(f"Ya existe una facultad con el {label} '{values[field]}'") from error
+    raise error
+
+
+async def insert_faculty(db, faculty: FacultyCreate) -> Faculty:
+    """Crear una facultad dejando que los índices únicos detecten nombres o acrónimos repetidos.
+
+    Returns
+    -------
+        La facultad creada, con el id obtenido por el ``INSERT ... RETURNING``
+
+    Raises
+    ------
+        ValueError: Si el nombre o el acrónimo ya pertenece a otra facultad
+    """
+    try:
+        return await crud_faculties.create(db=db, object=faculty)
+    except IntegrityError as e:
+        await db.rollback()
+        _raise_duplicate_value(e, faculty.model_dump())
+
+
+async def update_faculty_returning(db, faculty_id: int, values: dict) -> dict | None:
+    """Actualizar una facultad y devolver la fila resultante en un solo ``UPDATE ... RETURNING``.
+
+    La unicidad de nombre y acrónimo la garantizan los índices únicos, sin consultas previas.
+
+    Returns
+    -------
+        Datos de la facultad actualizada o ``None`` si no existe
+
+    Raises
+    ------
+        ValueError: Si el nuevo nombre o acrónimo ya pertenece a otra facultad
+    """
+    stmt = (
+        update(Faculty)
+        .where(Faculty.id == faculty_id)
+        .values(**values, updated_at=datetime.now(UTC))
+        .returning(*_FACULTY_READ_COLUMNS)
+    )
+    try:
+        row = (await db.execute(stmt)).mappings().one_or_none()
+    except IntegrityError as e:
+        await db.rollback()
+        _raise_duplicate_value(e, values)
+    await db.commit()
+    return dict(row) if row is not None else None
 
-async def faculty_acronym_exists(db, acronym: str) -> bool:
-    """Verificar si existe una facultad con el acrónimo dado."""
-    result = await crud_faculties.exists(db=db, acronym=acronym)
-    return result
 
+async def delete_faculty_returning_id(db, faculty_id: int) -> int | None:
+    """Eliminar una facultad en un solo ``UPDATE ... RETURNING id``.
 
-# Soft Delete operations
-async def soft_delete_faculty(db, faculty_id: int) -> bool:
-    """Marcar una facultad como eliminada (soft delete)."""
-    from ..schemas.faculty import FacultyUpdate
+    Equivale a ``crud_faculties.delete``: como el modelo tiene ``deleted_at`` pero no ``is_deleted``, FastCRUD solo
+    marca ``deleted_at``; aquí se hace lo mismo sin su verificación previa de existencia ni conteo.
 
-    update_data = FacultyUpdate(deleted=True, deleted_at=datetime.now(UTC))
-
-    await crud_faculties.update(db=db, object=update_data, id=faculty_id)
+    Returns
+    -------
+        ID de la facultad eliminada o ``None`` si no existe
+    """
+    stmt = update(Faculty).where(Faculty.id == faculty_id).values(deleted_at=datetime.now(UTC)).returning(Faculty.id)
+    deleted_id = (await db.execute(stmt)).scalar_one_or_none()
     await db.commit()
-    return True
+    return deleted_id
 
 
-async def restore_faculty(db, faculty_id: int) -> bool:
-    """Restaurar una facultad eliminada (revertir soft delete)."""
-    from ..schemas.faculty import FacultyUpdate
+# Soft Delete operations
+async def soft_delete_faculty(db, faculty_id: int) -> dict | None:
+    """Marcar una facultad como eliminada (soft delete) y devolver la fila actualizada."""
+    return await update_faculty_returning(db, faculty_id, {"deleted": True, "deleted_at": datetime.now(UTC)})
 
-    update_data = FacultyUpdate(deleted=False, deleted_at=None)
 
-    await crud_faculties.update(db=db, object=update_data, id=faculty_id)
-    await db.commit()
-    return True
+async def restore_faculty(db, faculty_id: int) -> dict | None:
+    """Restaurar una facultad eliminada (revertir soft delete) y devolver la fila actualizada."""
+    return await update_faculty_returning(db, faculty_id, {"deleted": False, "deleted_at": None})
 
 
 async def get_deleted_faculties(db, offset: int = 0, limit: int = 100):
@@ -69,6 +139,40 @@ async def get_non_deleted_faculties(db, offset: int = 0, limit: int = 100, is_ac
     return await crud_faculties.get_multi(db=db, offset=offset, limit=limit, **filters)
 
 
+async def get_non_deleted_faculties_after(
+    db, cursor: str | None = None, limit: int = 100, is_active: bool | None = None
+) -> dict:
+    """Obtener facultades no eliminadas con paginación por cursor (keyset sobre id, sin OFFSET).
+
+    Se pide una fila extra para saber si hay más páginas sin contar la tabla.
+
+    Args:
+    ----
+        cursor: ``next_cursor`` de la página anterior; ``None`` para la primera página
+        limit: Cantidad máxima de facultades
+        is_active: Filtrar por estado activo (opcional)
+
+    Returns:
+    -------
+        ``{"data": [...], "next_cursor": str | None}``
+
+    Raises:
+    ------
+        ValueError: Si el cursor no es válido
+    """
+    stmt = select(*_FACULTY_READ_COLUMNS).where(Faculty.deleted.is_(False))
+    if cursor is not None:
+        (after_id,) = decode_cursor(cursor, int)
+        stmt = stmt.where(Faculty.id > after_id)
+    if is_active is not None:
+        stmt = stmt.where(Faculty.is_active == is_active)
+
+    rows = (await db.execute(stmt.order_by(Faculty.id).limit(limit + 1))).mappings().all()
+    data = [dict(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(data[-1]["id"]) if len(rows) > limit else None
+    return {"data": data, "next_cursor": next_cursor}
+
+
 async def hard_delete_faculty(db, faculty_id: int) -> bool:
     """Eliminar permanentemente una facultad de la base de datos."""
     from sqlalchemy import delete
@@ -1,6 +1,7 @@
 """CRUD operations for Fixed Holiday Rule."""
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, delete, exists, func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.fixed_holiday_rule import FixedHolidayRule
@@ -54,6 +55,65 @@ async def get_fixed_holiday_rules(
     return list(result.scalars().all())
 
 
+async def count_fixed_holiday_rules(session: AsyncSession, month: int | None = None) -> int:
+    """Count fixed holiday rules with the same filters as the list query.
+
+    Args:
+        session: Database session
+        month: Filter by specific month (1-12)
+
+    Returns:
+        Count of fixed holiday rules
+    """
+    stmt = select(func.count()).select_from(FixedHolidayRule)
+
+    if month is not None:
+        stmt = stmt.where(FixedHolidayRule.month == month)
+
+    result = await session.execute(stmt)
+    return result.scalar_one()
+
+
+def _duplicate_date_error(month: int, day: int) -> ValueError:
+    """Build the error raised when another rule already uses the given month/day.
+
+    Args:
+        month: Month of the conflicting date
+        day: Day of the conflicting date
+
+    Returns:
+        ValueError with a user-facing message
+    """
+    # Convertir mes a nombre para mensaje más amigable
+    month_names = [
+        "",
+        "Enero",
+        "Febrero",
+        "Marzo",
+        "Abril",
+        "Mayo",
+        "Junio",
+        "Julio",
+        "Agosto",
+        "Septiembre",
+        "Octubre",
+        "Noviembre",
+        "Diciembre",
+    ]
+    month_name = month_names[month] if 1 <= month <= 12 else f"Mes {month}"
+    return ValueError(f"Ya existe un asueto fijo para el {day} de {month_name}")
+
+
+def _is_duplicate_date(error: IntegrityError) -> bool:
+    """Tell whether an IntegrityError comes from the unique (month, day) index.
+
+    The index only exists on databases created from the current models, so it
+    backs up the month/day pre-check against concurrent writes rather than
+    replacing it.
+    """
+    return "ix_fixed_holiday_rules_month_day" in str(error.orig)
+
+
 async def create_fixed_holiday_rule(session: AsyncSession, rule_data: FixedHolidayRuleCreate) -> FixedHolidayRule:
     """Create a new fixed holiday rule.
 
@@ -71,31 +131,12 @@ async def create_fixed_holiday_rule(session: AsyncSession, rule_data: FixedHolid
 
     # Check if a rule already exists for this month/day
     existing = await session.execute(
-        select(FixedHolidayRule).where(
-            and_(FixedHolidayRule.month == rule_data.month, FixedHolidayRule.day == rule_data.day)
-        )
+        select(FixedHolidayRule.id)
+        .where(and_(FixedHolidayRule.month == rule_data.month, FixedHolidayRule.day == rule_data.day))
+        .limit(1)
     )
-    existing_rule = existing.scalar_one_or_none()
-
-    if existing_rule:
-        # Convertir mes a nombre para mensaje más amigable
-        month_names = [
-            "",
-            "Enero",
-            "Febrero",
-            "Marzo",
-            "Abril",
-            "Mayo",
-            "Junio",
-            "Julio",
-            "Agosto",
-            "Septiembre",
-            "Octubre",
-            "Noviembre",
-            "Diciembre",
-        ]
-        month_name = month_names[rule_data.month] if 1 <= rule_data.month <= 12 else f"Mes {rule_data.month}"
-        raise ValueError(f"Ya existe un asueto fijo para el {rule_data.day} de {month_name}")
+    if existing.scalar_one_or_none() is not None:
+        raise _duplicate_date_error(rule_data.month, rule_data.day)
 
     # Create new rule
     new_rule = FixedHolidayRule(
@@ -107,9 +148,15 @@ async def create_fixed_holiday_rule(session: AsyncSession, rule_data: FixedHolid
     )
 
     session.add(new_rule)
-    await session.commit()
-    await session.refresh(new_rule)
-
+    try:
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if _is_duplicate_date(e):
+            raise _duplicate_date_error(rule_data.month, rule_data.day) from e
+        raise
+
+    # No refresh needed: the id comes back from the INSERT and the session keeps attributes after commit
     return new_rule
 
 
@@ -129,55 +176,61 @@ async def update_fixed_holiday_rule(
     Raises:
         ValueError: If the updated month/day conflicts with another rule
     """
-    rule = await get_fixed_holiday_rule(session, rule_id)
-    if not rule:
-        return None
+    values = rule_data.model_dump(exclude_none=True)
+    if not values:
+        return await get_fixed_holiday_rule(session, rule_id)
 
     # Check for conflicts if month or day is being updated
-    if rule_data.month is not None or rule_data.day is not None:
-        new_month = rule_data.month if rule_data.month is not None else rule.month
-        new_day = rule_data.day if rule_data.day is not None else rule.day
-
-        # Check if another rule exists with the new month/day
-        existing = await session.execute(
-            select(FixedHolidayRule).where(
-                and_(
-                    FixedHolidayRule.month == new_month,
-                    FixedHolidayRule.day == new_day,
-                    FixedHolidayRule.id != rule_id,
+    new_month = rule_data.month
+    new_day = rule_data.day
+    if new_month is not None or new_day is not None:
+        # Only a partial date change needs the stored month/day to complete it
+        if new_month is None or new_day is None:
+            current = (
+                await session.execute(
+                    select(FixedHolidayRule.month, FixedHolidayRule.day).where(FixedHolidayRule.id == rule_id)
+                )
+            ).one_or_none()
+            if current is None:
+                return None
+            new_month = new_month if new_month is not None else current.month
+            new_day = new_day if new_day is not None else current.day
+
+        # Check that the rule exists and whether another rule has the new month/day, in one statement, so a
+        # missing rule is still reported as not found instead of as a conflict
+        rule_exists, date_taken = (
+            await session.execute(
+                select(
+                    exists().where(FixedHolidayRule.id == rule_id),
+                    exists().where(
+                        and_(
+                            FixedHolidayRule.month == new_month,
+                            FixedHolidayRule.day == new_day,
+                            FixedHolidayRule.id != rule_id,
+                        )
+                    ),
                 )
             )
+        ).one()
+        if not rule_exists:
+            return None
+        if date_taken:
+            raise _duplicate_date_error(new_month, new_day)
+
+    # UPDATE ... RETURNING reports a missing rule and returns the updated row in one statement
+    try:
+        result = await session.execute(
+            update(FixedHolidayRule).where(FixedHolidayRule.id == rule_id).values(**values).returning(FixedHolidayRule)
         )
-        if existing.scalar_one_or_none():
-            # Convertir mes a nombre para mensaje más amigable
-            month_names = [
-                "",
-                "Enero",
-                "Febrero",
-                "Marzo",
-                "Abril",
-                "Mayo",
-                "Junio",
-                "Julio",
-                "Agosto",
-                "Septiembre",
-                "Octubre",
-                "Noviembre",
-                "Diciembre",
-            ]
-            month_name = month_names[new_month] if 1 <= new_month <= 12 else f"Mes {new_month}"
-            raise ValueError(f"Ya existe un asueto fijo para el {new_day} de {month_name}")
-
-    # Update fields
-    if rule_data.name is not None:
-        rule.name = rule_data.name
-    if rule_data.month is not None:
-        rule.month = rule_data.month
-    if rule_data.day is not None:
-        rule.day = rule_data.day
+        rule = result.scalar_one_or_none()
+    except IntegrityError as e:
+        await session.rollback()
+        # A concurrent write took the same date after the check
+        if _is_duplicate_date(e) and new_month is not None and new_day is not None:
+            raise _duplicate_date_error(new_month, new_day) from e
+        raise
 
     await session.commit()
-    await session.refresh(rule)
 
     return rule
 
@@ -192,11 +245,11 @@ async def delete_fixed_holiday_rule(session: AsyncSession, rule_id: int) -> bool
     Returns:
         True if deleted, False if not found
     """
-    rule = await get_fixed_holiday_rule(session, rule_id)
-    if not rule:
+    result = await session.execute(
+        delete(FixedHolidayRule).where(FixedHolidayRule.id == rule_id).returning(FixedHolidayRule.id)
+    )
+    if result.scalar_one_or_none() is None:
         return False
 
-    await session.delete(rule)
     await session.commit()
-
     return True
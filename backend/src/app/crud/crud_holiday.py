@@ -2,9 +2,10 @@
 
 from datetime import date, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from ..models.annual_holiday import AnnualHoliday
 from ..models.fixed_holiday_rule import FixedHolidayRule
@@ -80,6 +81,11 @@ def generate_extended_easter_break(year: int) -> list[date]:
     return break_dates
 
 
+# Load annual holidays with a single SELECT ... IN and forbid any other lazy load
+# (including the AnnualHoliday.holiday back-reference) so an accidental N+1 raises instead of querying
+_HOLIDAY_LOAD_OPTIONS = (selectinload(Holiday.annual_holidays).raiseload("*"), raiseload("*"))
+
+
 async def get_holiday(session: AsyncSession, holiday_id: int) -> Holiday | None:
     """Get a holiday by ID with its annual holidays.
 
@@ -90,9 +96,7 @@ async def get_holiday(session: AsyncSession, holiday_id: int) -> Holiday | None:
     Returns:
         Holiday object or None if not found
     """
-    result = await session.execute(
-        select(Holiday).options(selectinload(Holiday.annual_holidays)).where(Holiday.id == holiday_id)
-    )
+    result = await session.execute(select(Holiday).options(*_HOLIDAY_LOAD_OPTIONS).where(Holiday.id == holiday_id))
     return result.scalar_one_or_none()
 
 
@@ -113,7 +117,7 @@ async def get_holidays(
     Returns:
         List of Holiday objects
     """
-    stmt = select(Holiday).options(selectinload(Holiday.annual_holidays))
+    stmt = select(Holiday).options(*_HOLIDAY_LOAD_OPTIONS)
 
     # Apply filters
     if year is not None:
@@ -129,6 +133,25 @@ async def get_holidays(
     return list(result.scalars().all())
 
 
+async def count_holidays(session: AsyncSession, year: int | None = None) -> int:
+    """Count holidays with the same filters as the list query.
+
+    Args:
+        session: Database session
+        year: Filter by specific year
+
+    Returns:
+        Count of holidays
+    """
+    stmt = select(func.count()).select_from(Holiday)
+
+    if year is not None:
+        stmt = stmt.where(Holiday.year == year)
+
+    result = await session.execute(stmt)
+    return result.scalar_one()
+
+
 async def create_holiday(session: AsyncSession, holiday_data: HolidayCreate) -> Holiday:
     """Create a new holiday year group and auto-generate annual holidays.
 
@@ -208,6 +231,11 @@ async def create_holiday(session: AsyncSession, holiday_data: HolidayCreate) ->
     return new_holiday
 
 
+def _is_duplicate_year(error: IntegrityError) -> bool:
+    """Tell whether an IntegrityError comes from the unique index on year."""
+    return "ix_holidays_year" in str(error.orig)
+
+
 async def update_holiday(session: AsyncSession, holiday_id: int, holiday_data: HolidayUpdate) -> Holiday | None:
     """Update an existing holiday.
 
@@ -222,29 +250,23 @@ async def update_holiday(session: AsyncSession, holiday_id: int, holiday_data: H
     Raises:
         ValueError: If the updated year conflicts with another holiday
     """
-    holiday = await get_holiday(session, holiday_id)
-    if not holiday:
-        return None
-
-    # Check for conflicts if year is being updated
-    if holiday_data.year is not None and holiday_data.year != holiday.year:
-        existing = await session.execute(
-            select(Holiday).where(
-                Holiday.year == holiday_data.year,
-                Holiday.id != holiday_id,
-            )
+    values = holiday_data.model_dump(exclude_none=True)
+    if not values:
+        return await get_holiday(session, holiday_id)
+
+    # Single UPDATE ... RETURNING: a missing row yields no result and the unique
+    # index on year reports conflicts, so no lookup query is needed beforehand.
+    try:
+        result = await session.execute(
+            update(Holiday).where(Holiday.id == holiday_id).values(**values).returning(Holiday)
         )
-        if existing.scalar_one_or_none():
-            raise ValueError(f"Ya existe otro grupo de asuetos para el año {holiday_data.year}")
-
-    # Update fields
-    if holiday_data.year is not None:
-        holiday.year = holiday_data.year
-    if holiday_data.description is not None:
-        holiday.description = holiday_data.description
-
-    await session.commit()
-    await session.refresh(holiday)
+        holiday = result.scalar_one_or_none()
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if _is_duplicate_year(e):
+            raise ValueError(f"Ya existe otro grupo de asuetos para el año {holiday_data.year}") from e
+        raise
 
     return holiday
 
@@ -259,12 +281,12 @@ async def delete_holiday(session: AsyncSession, holiday_id: int) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    holiday = await get_holiday(session, holiday_id)
-    if not holiday:
+    # annual_holidays.holiday_id is declared ON DELETE CASCADE, so the database removes
+    # the child rows without loading them into the session first
+    result = await session.execute(delete(Holiday).where(Holiday.id == holiday_id).returning(Holiday.id))
+    deleted_id = result.scalar_one_or_none()
+    if deleted_id is None:
         return False
 
-    # Cascade delete will automatically remove all annual_holidays
-    await session.delete(holiday)
     await session.commit()
-
     return True
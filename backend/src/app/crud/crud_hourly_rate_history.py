@@ -3,11 +3,19 @@
 from datetime import date, datetime, timedelta
 from uuid import UUID
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, delete, exists, func, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
 
 from ..models.hourly_rate_history import HourlyRateHistory
 from ..schemas.hourly_rate_history import HourlyRateHistoryCreate, HourlyRateHistoryUpdate
+from .pagination import decode_cursor, encode_cursor
+
+# HourlyRateHistoryRead needs every rate column plus its academic level, so the level is joined into the same
+# SELECT instead of the model's default selectin round-trip, and any other lazy load (such as
+# AcademicLevel.hourly_rates) raises instead of querying
+_RATE_READ_OPTIONS = (joinedload(HourlyRateHistory.academic_level).raiseload("*"), raiseload("*"))
 
 
 async def get_hourly_rate(session: AsyncSession, rate_id: int) -> HourlyRateHistory | None:
@@ -20,10 +28,26 @@ async def get_hourly_rate(session: AsyncSession, rate_id: int) -> HourlyRateHist
     Returns:
         HourlyRateHistory object or None if not found
     """
-    result = await session.execute(select(HourlyRateHistory).where(HourlyRateHistory.id == rate_id))
+    result = await session.execute(
+        select(HourlyRateHistory).options(*_RATE_READ_OPTIONS).where(HourlyRateHistory.id == rate_id)
+    )
     return result.scalar_one_or_none()
 
 
+def encode_rate_cursor(rate: HourlyRateHistory) -> str:
+    """Encode the ``(level_id, start_date, id)`` position of a rate as an opaque cursor."""
+    return encode_cursor(rate.level_id, rate.start_date, rate.id)
+
+
+def _decode_rate_cursor(cursor: str) -> tuple[int, datetime, int]:
+    """Decode a cursor produced by ``encode_rate_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    return decode_cursor(cursor, int, datetime.fromisoformat, int)
+
+
 async def get_hourly_rates(
     session: AsyncSession,
     skip: int = 0,
@@ -32,22 +56,32 @@ async def get_hourly_rates(
     is_active: bool | None = None,
     start_date: datetime | None = None,
     end_date: datetime | None = None,
+    cursor: str | None = None,
 ) -> list[HourlyRateHistory]:
     """Get list of hourly rates with optional filters.
 
+    Rates are ordered by level, newest start date first, with the id as tie-breaker. When ``cursor`` is given the
+    page starts right after the position it encodes in this order (keyset pagination) and ``skip`` is ignored, so deep
+    pages cost the same as the first one. The cursor carries the whole sort key, so it stays valid when the rate it
+    was built from is later edited or deleted.
+
     Args:
         session: Database session
-        skip: Number of records to skip
+        skip: Number of records to skip (ignored when ``cursor`` is given)
         limit: Maximum number of records to return
         level_id: Filter by academic level ID
         is_active: Filter by active status (end_date IS NULL)
         start_date: Filter by start date (rates starting on or after this date)
         end_date: Filter by end date (rates ending on or before this date)
+        cursor: ``encode_rate_cursor`` of the last rate of the previous page
 
     Returns:
         List of HourlyRateHistory objects
+
+    Raises:
+        ValueError: If the cursor is malformed
     """
-    stmt = select(HourlyRateHistory)
+    stmt = select(HourlyRateHistory).options(*_RATE_READ_OPTIONS)
 
     # Apply filters
     if level_id is not None:
@@ -71,10 +105,27 @@ async def get_hourly_rates(
         )
 
     # Order by level_id, then start_date descending (newest first)
-    stmt = stmt.order_by(HourlyRateHistory.level_id, HourlyRateHistory.start_date.desc())
+    stmt = stmt.order_by(HourlyRateHistory.level_id, HourlyRateHistory.start_date.desc(), HourlyRateHistory.id.desc())
 
-    # Apply pagination
-    stmt = stmt.offset(skip).limit(limit)
+    # Apply pagination: seek past the cursor position in the same order, or fall back to OFFSET
+    if cursor is not None:
+        cursor_level, cursor_start, cursor_id = _decode_rate_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                HourlyRateHistory.level_id > cursor_level,
+                and_(
+                    HourlyRateHistory.level_id == cursor_level,
+                    or_(
+                        HourlyRateHistory.start_date < cursor_start,
+                        and_(HourlyRateHistory.start_date == cursor_start, HourlyRateHistory.id < cursor_id),
+                    ),
+                ),
+            )
+        )
+    else:
+        stmt = stmt.offset(skip)
+
+    stmt = stmt.limit(limit)
 
     result = await session.execute(stmt)
     return list(result.scalars().all())
@@ -99,21 +150,55 @@ async def get_current_rate(
     if reference_date is None:
         reference_date = date.today()
 
-    stmt = select(HourlyRateHistory).where(
-        and_(
-            HourlyRateHistory.level_id == level_id,
-            HourlyRateHistory.start_date <= reference_date,
-            or_(
-                HourlyRateHistory.end_date.is_(None),
-                HourlyRateHistory.end_date >= reference_date,
-            ),
+    # Newest rate starting on or before the date: walks ix_hourly_rate_level_start_desc and stops at the first match
+    stmt = (
+        select(HourlyRateHistory)
+        .where(
+            and_(
+                HourlyRateHistory.level_id == level_id,
+                HourlyRateHistory.start_date <= reference_date,
+                or_(
+                    HourlyRateHistory.end_date.is_(None),
+                    HourlyRateHistory.end_date >= reference_date,
+                ),
+            )
         )
+        .order_by(HourlyRateHistory.start_date.desc(), HourlyRateHistory.id.desc())
+        .limit(1)
     )
 
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def get_current_rate_cached(
+    session: AsyncSession,
+    level_id: int,
+    reference_date: date,
+    rate_cache: dict[tuple[int, date], HourlyRateHistory | None],
+) -> HourlyRateHistory | None:
+    """Get the current rate for a level and date through a caller-owned cache.
+
+    Billing calculations ask for the rate of the same level and month once per schedule block, always with the
+    first day of the month as ``reference_date``, so each (level_id, month) pair is queried once per calculation.
+    Rates that do not exist are cached as ``None`` too. The cache lives in the calling request, so rate changes
+    never need to invalidate it.
+
+    Args:
+        session: Database session
+        level_id: Academic level ID
+        reference_date: Reference date
+        rate_cache: Dict shared across the calls of one calculation, keyed by (level_id, reference_date)
+
+    Returns:
+        HourlyRateHistory object or None if no rate found
+    """
+    key = (level_id, reference_date)
+    if key not in rate_cache:
+        rate_cache[key] = await get_current_rate(session, level_id, reference_date)
+    return rate_cache[key]
+
+
 async def get_rate_timeline(session: AsyncSession, level_id: int) -> list[HourlyRateHistory]:
     """Get complete timeline of rates for a specific level.
 
@@ -126,6 +211,7 @@ async def get_rate_timeline(session: AsyncSession, level_id: int) -> list[Hourly
     """
     stmt = (
         select(HourlyRateHistory)
+        .options(*_RATE_READ_OPTIONS)
         .where(HourlyRateHistory.level_id == level_id)
         .order_by(HourlyRateHistory.start_date.desc())
     )
@@ -199,11 +285,18 @@ async def create_hourly_rate(
 ) -> HourlyRateHistory:
     """Create a new hourly rate (Salary Increase).
 
-    This is the CRITICAL endpoint. It executes an atomic transaction:
-    1. Validates no date overlap
-    2. Finds the previous active rate (end_date = NULL) for same level_id
-    3. Sets its end_date to 1 second before the new start_date
-    4. Creates the new rate with end_date = NULL
+    This is the CRITICAL endpoint. It executes an atomic transaction in a single
+    INSERT ... SELECT statement whose CTE:
+    1. Sets the end_date of the previous active rate (end_date = NULL) for the
+       same level_id to 1 second before the new start_date
+    2. Validates no date overlap with the remaining rates of the level
+    3. Creates the new rate with end_date = NULL (skipped on overlap)
+
+    The overlap check runs in the same statement as the insert, so it does not
+    depend on any index. Databases created from the current models also carry a
+    unique partial index on (level_id) WHERE end_date IS NULL; there, a concurrent
+    creation for the same level fails instead of leaving two active rates.
+    Tables created before that index was added do not get it from create_all.
 
     Args:
         session: Database session
@@ -216,50 +309,75 @@ async def create_hourly_rate(
     Raises:
         ValueError: If validation fails (overlap detected, no level found, etc.)
     """
-    # Find the current active rate for this level
-    current_active_rate = await session.execute(
-        select(HourlyRateHistory).where(
-            and_(
-                HourlyRateHistory.level_id == rate_data.level_id,
-                HourlyRateHistory.end_date.is_(None),
-            )
+    now = datetime.utcnow()
+
+    # Close the current active rate for this level
+    closed_rate = (
+        update(HourlyRateHistory)
+        .where(
+            HourlyRateHistory.level_id == rate_data.level_id,
+            HourlyRateHistory.end_date.is_(None),
         )
+        .values(end_date=rate_data.start_date - timedelta(seconds=1), updated_at=now)
+        .returning(HourlyRateHistory.id)
+        .cte("closed_rate")
     )
-    active_rate = current_active_rate.scalar_one_or_none()
-
-    # If there's an active rate, close it first
-    if active_rate:
-        # Set end_date to 1 second before the new start_date
-        active_rate.end_date = rate_data.start_date - timedelta(seconds=1)
 
-    # Now check for date overlap (excluding the rate we just closed)
-    has_overlap = await check_date_overlap(
-        session=session,
-        level_id=rate_data.level_id,
-        start_date=rate_data.start_date,
-        end_date=None,  # New rates are always active (end_date = NULL)
-        exclude_rate_id=active_rate.id if active_rate else None,
+    # Same rule as check_date_overlap() for an open-ended rate, excluding the rate closed above
+    # (the CTE update is not visible to the rest of the statement). Reading the CTE here also
+    # makes PostgreSQL finish the UPDATE before the new active row is inserted.
+    overlapping_rate = select(HourlyRateHistory.id).where(
+        HourlyRateHistory.level_id == rate_data.level_id,
+        HourlyRateHistory.id.not_in(select(closed_rate.c.id)),
+        or_(
+            HourlyRateHistory.end_date.is_(None),
+            HourlyRateHistory.end_date >= rate_data.start_date,
+        ),
     )
 
-    if has_overlap:
-        raise ValueError(f"Ya existe una tarifa vigente que se solapa con la fecha {rate_data.start_date}")
-
     # Create new rate (always with end_date = NULL for new rates)
-    new_rate = HourlyRateHistory(
-        id=None,  # Dejar que la base de datos genere el ID automáticamente
-        level_id=rate_data.level_id,
-        rate_per_hour=rate_data.rate_per_hour,
-        start_date=rate_data.start_date,
-        end_date=None,  # Always NULL for new rates
-        created_by_id=created_by_id,
-        created_at=datetime.utcnow(),  # Establecer explícitamente para evitar lambda
+    new_rate_values = {
+        "level_id": rate_data.level_id,
+        "rate_per_hour": rate_data.rate_per_hour,
+        "start_date": rate_data.start_date,
+        "created_by_id": created_by_id,
+        "created_at": now,
+    }
+    stmt = (
+        insert(HourlyRateHistory)
+        .from_select(
+            list(new_rate_values),
+            select(
+                *(
+                    literal(value, HourlyRateHistory.__table__.c[column].type)
+                    for column, value in new_rate_values.items()
+                )
+            ).where(~exists(overlapping_rate)),
+        )
+        .returning(HourlyRateHistory.id)
+        .add_cte(closed_rate)
     )
 
-    session.add(new_rate)
+    try:
+        new_rate_id = (await session.execute(stmt)).scalar_one_or_none()
+    except IntegrityError as e:
+        await session.rollback()
+        # Only raised where the one-active-rate index exists and a concurrent creation won the race
+        if "ix_hourly_rate_one_active_per_level" in str(e.orig):
+            raise ValueError(f"Ya existe una tarifa vigente que se solapa con la fecha {rate_data.start_date}") from e
+        raise
+
+    if new_rate_id is None:
+        # Overlap detected: also discard the end_date set on the previous rate
+        await session.rollback()
+        raise ValueError(f"Ya existe una tarifa vigente que se solapa con la fecha {rate_data.start_date}")
+
     await session.commit()
-    await session.refresh(new_rate)
 
-    return new_rate
+    result = await session.execute(
+        select(HourlyRateHistory).options(*_RATE_READ_OPTIONS).where(HourlyRateHistory.id == new_rate_id)
+    )
+    return result.scalar_one()
 
 
 async def update_hourly_rate(
@@ -315,8 +433,9 @@ async def update_hourly_rate(
     if rate_data.end_date is not None:
         rate.end_date = rate_data.end_date
 
+    # No refresh needed: the session keeps loaded state after commit and the
+    # updated_at onupdate value is applied to the instance during flush
     await session.commit()
-    await session.refresh(rate)
 
     return rate
 
@@ -336,7 +455,7 @@ async def count_hourly_rates(
     Returns:
         Count of hourly rates
     """
-    stmt = select(HourlyRateHistory)
+    stmt = select(func.count()).select_from(HourlyRateHistory)
 
     if level_id is not None:
         stmt = stmt.where(HourlyRateHistory.level_id == level_id)
@@ -348,7 +467,7 @@ async def count_hourly_rates(
             stmt = stmt.where(HourlyRateHistory.end_date.isnot(None))
 
     result = await session.execute(stmt)
-    return len(list(result.scalars().all()))
+    return result.scalar_one()
 
 
 async def delete_hourly_rate(session: AsyncSession, rate_id: int) -> bool:
@@ -369,10 +488,15 @@ async def delete_hourly_rate(session: AsyncSession, rate_id: int) -> bool:
     """
     from datetime import datetime, timedelta
 
-    # Get the rate to delete
-    stmt = select(HourlyRateHistory).where(HourlyRateHistory.id == rate_id)
+    # Only the columns needed for the checks below; loading the entity would also
+    # pull its academic level through the selectin relationship
+    stmt = select(
+        HourlyRateHistory.created_at,
+        HourlyRateHistory.end_date,
+        HourlyRateHistory.level_id,
+    ).where(HourlyRateHistory.id == rate_id)
     result = await session.execute(stmt)
-    rate_to_delete = result.scalar_one_or_none()
+    rate_to_delete = result.one_or_none()
 
     if not rate_to_delete:
         return False
@@ -383,28 +507,30 @@ async def delete_hourly_rate(session: AsyncSession, rate_id: int) -> bool:
     if time_diff >= timedelta(hours=24):
         raise ValueError("No se puede eliminar esta tarifa. Ha pasado más de 24 horas desde su creación.")
 
+    # Delete the rate first: the one-active-rate-per-level index would reject reactivating
+    # the previous rate while this one is still active
+    await session.execute(delete(HourlyRateHistory).where(HourlyRateHistory.id == rate_id))
+
     # If this is the current active rate, reactivate the previous one
     if rate_to_delete.end_date is None:  # This is the current active rate
-        # Find the previous rate for the same level
-        prev_stmt = (
-            select(HourlyRateHistory)
+        # Reactivate the most recently ended rate for the same level in a single UPDATE
+        previous_rate_id = (
+            select(HourlyRateHistory.id)
             .where(
                 HourlyRateHistory.level_id == rate_to_delete.level_id,
-                HourlyRateHistory.id != rate_to_delete.id,
+                HourlyRateHistory.id != rate_id,
                 HourlyRateHistory.end_date.isnot(None),
             )
             .order_by(HourlyRateHistory.end_date.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(HourlyRateHistory)
+            .where(HourlyRateHistory.id == previous_rate_id)
+            .values(end_date=None, updated_at=datetime.utcnow())
         )
-        prev_result = await session.execute(prev_stmt)
-        previous_rate = prev_result.scalar_one_or_none()
-
-        if previous_rate:
-            # Reactivate the previous rate by setting end_date to None
-            previous_rate.end_date = None
-            previous_rate.updated_at = datetime.utcnow()
 
-    # Delete the rate
-    await session.delete(rate_to_delete)
     await session.commit()
 
     return True
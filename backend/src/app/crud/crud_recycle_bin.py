@@ -1,12 +1,14 @@
 """Operaciones CRUD para el modelo RecycleBin."""
 
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from uuid import UUID
 
 from fastcrud import FastCRUD
+from sqlalchemy import Select, select, tuple_, update
 
 from ..models.recycle_bin import RecycleBin
-from ..schemas.recycle_bin import RecycleBinUpdate
+from .pagination import decode_cursor, encode_cursor, fetch_page_with_total, get_multi_with_total
 
 # Crear instancia CRUD para RecycleBin
 crud_recycle_bin = FastCRUD(RecycleBin)
@@ -19,38 +21,94 @@ async def get_recycle_bin_by_id(db, recycle_bin_id: int):
 
 async def get_all_deleted_items(db, offset: int = 0, limit: int = 100):
     """Obtener todos los elementos en la papelera de reciclaje (incluyendo restaurados)."""
-    from sqlalchemy import desc, select
-
-    # Query personalizada con ordenamiento descendente por deleted_at
-    stmt = select(RecycleBin).order_by(desc(RecycleBin.deleted_at)).offset(offset).limit(limit)
-    result = await db.execute(stmt)
-    items = result.scalars().all()
-
-    # Contar total de registros
-    from sqlalchemy import func
-
-    count_stmt = select(func.count()).select_from(RecycleBin)
-    count_result = await db.execute(count_stmt)
-    total = count_result.scalar() or 0
-
-    return {"data": items, "total_count": total}
+    # Ordenamiento descendente por deleted_at; la página y el total salen de una sola consulta
+    stmt = select(RecycleBin).order_by(RecycleBin.deleted_at.desc())
+    rows, total = await fetch_page_with_total(db, stmt, offset=offset, limit=limit)
+    return {"data": [row.RecycleBin for row in rows], "total_count": total}
 
 
 async def get_deleted_items_by_type(db, entity_type: str, offset: int = 0, limit: int = 100):
     """Obtener elementos eliminados por tipo de entidad."""
-    return await crud_recycle_bin.get_multi(
-        db=db, offset=offset, limit=limit, entity_type=entity_type, restored_at=None
+    return await get_multi_with_total(
+        crud_recycle_bin, db=db, offset=offset, limit=limit, entity_type=entity_type, restored_at=None
     )
 
 
 async def get_restored_items(db, offset: int = 0, limit: int = 100):
-    """Obtener elementos que han sido restaurados."""
-    # Necesitamos usar una query personalizada para esto
-    from sqlalchemy import select
+    """Obtener elementos que han sido restaurados, con el total en la misma consulta."""
+    stmt = select(RecycleBin).where(RecycleBin.restored_at.isnot(None)).order_by(RecycleBin.deleted_at.desc())
+    rows, total = await fetch_page_with_total(db, stmt, offset=offset, limit=limit)
+    return {"data": [row.RecycleBin for row in rows], "total_count": total}
+
 
-    stmt = select(RecycleBin).where(RecycleBin.restored_at.isnot(None)).offset(offset).limit(limit)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+def _select_items_newest_first(entity_type: str | None, restored: bool | None) -> Select:
+    """Consulta de elementos de la papelera filtrada, ordenada por ``(deleted_at, id)`` descendente."""
+    stmt = select(RecycleBin)
+    if entity_type is not None:
+        stmt = stmt.where(RecycleBin.entity_type == entity_type)
+    if restored is not None:
+        stmt = stmt.where(RecycleBin.restored_at.isnot(None) if restored else RecycleBin.restored_at.is_(None))
+    return stmt.order_by(RecycleBin.deleted_at.desc(), RecycleBin.id.desc())
+
+
+async def get_recycle_bin_items_after(
+    db,
+    cursor: str | None = None,
+    limit: int = 100,
+    entity_type: str | None = None,
+    restored: bool | None = None,
+) -> dict:
+    """Obtener elementos de la papelera con paginación por cursor (keyset sobre ``(deleted_at, id)``, sin OFFSET).
+
+    Los elementos se ordenan del más reciente al más antiguo. Se pide una fila extra para saber si hay más páginas
+    sin contar la tabla.
+
+    Args:
+    ----
+        cursor: ``next_cursor`` de la página anterior; ``None`` para la primera página
+        limit: Cantidad máxima de elementos
+        entity_type: Filtrar por tipo de entidad (opcional)
+        restored: ``True`` solo restaurados, ``False`` solo no restaurados, ``None`` todos
+
+    Returns:
+    -------
+        ``{"data": [...], "next_cursor": str | None}``
+
+    Raises:
+    ------
+        ValueError: Si el cursor no es válido
+    """
+    stmt = _select_items_newest_first(entity_type, restored)
+    if cursor is not None:
+        position = decode_cursor(cursor, datetime.fromisoformat, int)
+        stmt = stmt.where(tuple_(RecycleBin.deleted_at, RecycleBin.id) < tuple_(*position))
+
+    items = (await db.execute(stmt.limit(limit + 1))).scalars().all()
+
+    data = items[:limit]
+    next_cursor = encode_cursor(data[-1].deleted_at, data[-1].id) if len(items) > limit else None
+    return {"data": data, "next_cursor": next_cursor}
+
+
+async def stream_recycle_bin_items(
+    db, entity_type: str | None = None, restored: bool | None = None, batch_size: int = 100
+) -> AsyncIterator[RecycleBin]:
+    """Recorrer todos los elementos de la papelera (más recientes primero) sin cargarlos a la vez en memoria.
+
+    Usa un cursor del servidor con ``yield_per``: las filas llegan en lotes de ``batch_size``, así la memoria no
+    crece con el tamaño de la papelera. La sesión debe seguir abierta mientras se consume el iterador.
+
+    Args:
+    ----
+        db: Sesión de base de datos
+        entity_type: Filtrar por tipo de entidad (opcional)
+        restored: ``True`` solo restaurados, ``False`` solo no restaurados, ``None`` todos
+        batch_size: Filas por lote traídas del servidor
+    """
+    stmt = _select_items_newest_first(entity_type, restored).execution_options(yield_per=batch_size)
+    result = await db.stream_scalars(stmt)
+    async for item in result:
+        yield item
 
 
 async def create_recycle_bin_entry(
@@ -79,27 +137,48 @@ async def create_recycle_bin_entry(
     return await crud_recycle_bin.create(db=db, object=entry_data)
 
 
-async def mark_as_restored(db, recycle_bin_id: int, restored_by_id: str, restored_by_name: str) -> bool:
-    """Marcar un registro en RecycleBin como restaurado."""
-    update_data = RecycleBinUpdate(
+async def _update_returning(db, recycle_bin_id: int, **values) -> dict | None:
+    """Actualizar un registro de RecycleBin y devolver la fila resultante (``UPDATE ... RETURNING``).
+
+    Reemplaza ``crud_recycle_bin.update`` (que cuenta las filas antes de actualizar) seguido de un ``get`` para
+    releer el registro: ambos pasos quedan en una sola sentencia.
+    """
+    stmt = (
+        update(RecycleBin)
+        .where(RecycleBin.id == recycle_bin_id)
+        .values(**values, updated_at=datetime.now(UTC))
+        .returning(*RecycleBin.__table__.columns)
+    )
+    row = (await db.execute(stmt)).mappings().one_or_none()
+    await db.commit()
+    return dict(row) if row is not None else None
+
+
+async def mark_as_restored(db, recycle_bin_id: int, restored_by_id: str, restored_by_name: str) -> dict | None:
+    """Marcar un registro en RecycleBin como restaurado.
+
+    Returns:
+    -------
+        El registro actualizado, o None si no existe
+    """
+    return await _update_returning(
+        db,
+        recycle_bin_id,
         restored_at=datetime.now(UTC),
         restored_by_id=restored_by_id,
         restored_by_name=restored_by_name,
         can_restore=False,  # Ya fue restaurado, no se puede restaurar de nuevo
     )
 
-    await crud_recycle_bin.update(db=db, object=update_data, id=recycle_bin_id)
-    await db.commit()
-    return True
-
 
-async def update_can_restore(db, recycle_bin_id: int, can_restore: bool) -> bool:
-    """Actualizar si un registro puede ser restaurado."""
-    update_data = RecycleBinUpdate(can_restore=can_restore)
+async def update_can_restore(db, recycle_bin_id: int, can_restore: bool) -> dict | None:
+    """Actualizar si un registro puede ser restaurado.
 
-    await crud_recycle_bin.update(db=db, object=update_data, id=recycle_bin_id)
-    await db.commit()
-    return True
+    Returns:
+    -------
+        El registro actualizado, o None si no existe
+    """
+    return await _update_returning(db, recycle_bin_id, can_restore=can_restore)
 
 
 async def delete_recycle_bin_entry(db, recycle_bin_id: int) -> None:
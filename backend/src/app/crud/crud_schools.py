@@ -1,8 +1,13 @@
 """Operaciones CRUD para el modelo School."""
 
+from datetime import UTC, datetime
+
 from fastcrud import FastCRUD
+from sqlalchemy import exists, select, update
 
+from ..models.faculty import Faculty
 from ..models.school import School
+from ..schemas.school import SchoolUpdate
 
 # Crear instancia CRUD para School
 crud_schools = FastCRUD(School)
@@ -35,5 +40,58 @@ async def school_acronym_exists(db, acronym: str, faculty_id: int) -> bool:
     return result
 
 
+async def validate_school_values(
+    db, faculty_id: int, name: str | None = None, acronym: str | None = None, check_faculty: bool = True
+) -> tuple[bool, bool, bool]:
+    """Validar facultad, nombre y acrónimo de una escuela en una sola consulta.
+
+    Cada verificación es un ``EXISTS`` dentro del mismo ``SELECT``; las que no aplican (``name``/``acronym`` en
+    None o ``check_faculty=False``) no se incluyen.
+
+    Args:
+    ----
+        db: Sesión de base de datos
+        faculty_id: ID de la facultad de la escuela
+        name: Nombre a verificar en la facultad (opcional)
+        acronym: Acrónimo a verificar en la facultad (opcional)
+        check_faculty: Si se debe verificar que la facultad existe
+
+    Returns:
+    -------
+        Tupla ``(facultad_existe, nombre_en_uso, acronimo_en_uso)``
+    """
+    checks = {}
+    if check_faculty:
+        checks["faculty_exists"] = exists().where(Faculty.id == faculty_id)
+    if name is not None:
+        checks["name_taken"] = exists().where(School.fk_faculty == faculty_id, School.name == name)
+    if acronym is not None:
+        checks["acronym_taken"] = exists().where(School.fk_faculty == faculty_id, School.acronym == acronym)
+
+    if not checks:
+        return True, False, False
+
+    row = (await db.execute(select(*(check.label(key) for key, check in checks.items())))).one()._mapping
+    return row.get("faculty_exists", True), row.get("name_taken", False), row.get("acronym_taken", False)
+
+
+async def update_school_values(db, school_id: int, values: SchoolUpdate) -> dict | None:
+    """Actualizar una escuela y devolver la fila actualizada (``UPDATE ... RETURNING``).
+
+    Returns:
+    -------
+        La escuela actualizada, o None si no existe
+    """
+    stmt = (
+        update(School)
+        .where(School.id == school_id)
+        .values(**values.model_dump(exclude_unset=True), updated_at=datetime.now(UTC))
+        .returning(*School.__table__.columns)
+    )
+    row = (await db.execute(stmt)).mappings().one_or_none()
+    await db.commit()
+    return dict(row) if row is not None else None
+
+
 # Alias para compatibilidad
 get_school_by_uuid = get_school_by_id
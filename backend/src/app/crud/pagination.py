@@ -0,0 +1,118 @@
+"""Paginación con total en una sola consulta para los CRUD basados en FastCRUD, y cursores opacos para keyset."""
+
+import base64
+import binascii
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import date
+from typing import Any
+
+from fastcrud import FastCRUD
+from sqlalchemy import Row, Select, func, select
+
+from ..core.db.database import local_session
+
+
+def encode_cursor(*key: Any) -> str:
+    """Codificar la clave de orden de la última fila de una página como cursor opaco.
+
+    Las fechas se guardan en formato ISO y el resto de valores con ``str``; ``decode_cursor`` recibe la conversión
+    inversa de cada uno.
+    """
+    parts = (value.isoformat() if isinstance(value, date) else str(value) for value in key)
+    return base64.urlsafe_b64encode("|".join(parts).encode()).decode()
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[str], Any]) -> tuple:
+    """Decodificar un cursor generado por ``encode_cursor``, aplicando a cada valor su conversión.
+
+    Args:
+    ----
+        cursor: Cursor recibido del cliente
+        *parsers: Conversión de cada valor de la clave, en el mismo orden (``int``, ``datetime.fromisoformat``...)
+
+    Returns:
+    -------
+        Tupla con los valores de la clave ya convertidos
+
+    Raises:
+    ------
+        ValueError: Si el cursor no tiene el formato esperado
+    """
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        if len(parts) != len(parsers):
+            raise ValueError(f"Se esperaban {len(parsers)} valores y el cursor trae {len(parts)}")
+        return tuple(parse(part) for parse, part in zip(parsers, parts, strict=True))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Cursor de paginación inválido") from e
+
+
+async def fetch_page_with_total(db, stmt: Select, offset: int = 0, limit: int = 100) -> tuple[Sequence[Row], int]:
+    """Ejecutar una consulta paginada y obtener el total de filas en el mismo round-trip.
+
+    El total se calcula con ``COUNT(*) OVER()`` junto con las filas de la página. Solo si la página queda fuera de
+    rango (sin filas) se cuenta por separado.
+
+    Args:
+    ----
+        db: Sesión de base de datos
+        stmt: Consulta ya filtrada y ordenada, sin ``OFFSET`` ni ``LIMIT``
+        offset: Cantidad de filas a omitir
+        limit: Cantidad máxima de filas
+
+    Returns:
+    -------
+        Tupla ``(filas, total)``; cada fila trae las columnas de ``stmt`` seguidas de ``total_count``
+    """
+    page_stmt = stmt.add_columns(func.count().over().label("total_count")).offset(offset).limit(limit)
+    rows = (await db.execute(page_stmt)).all()
+    if rows:
+        return rows, rows[0].total_count
+    if not offset:
+        return rows, 0
+
+    # Página fuera de rango: contar aparte
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    return rows, (await db.execute(count_stmt)).scalar_one()
+
+
+async def get_multi_with_total(crud: FastCRUD, db, offset: int = 0, limit: int = 100, **kwargs: Any) -> dict:
+    """Equivalente a ``crud.get_multi`` que obtiene la página y el total en un solo round-trip.
+
+    El total sale de ``fetch_page_with_total`` en lugar del ``SELECT COUNT(*)`` aparte que hace FastCRUD.
+
+    Args:
+    ----
+        crud: Instancia FastCRUD del modelo
+        db: Sesión de base de datos
+        offset: Cantidad de filas a omitir
+        limit: Cantidad máxima de filas
+        **kwargs: Filtros con la misma sintaxis de FastCRUD (``campo``, ``campo__in``, etc.)
+
+    Returns:
+    -------
+        ``{"data": [...], "total_count": int}``, con la misma forma que ``get_multi``
+    """
+    rows, total_count = await fetch_page_with_total(db, await crud.select(**kwargs), offset=offset, limit=limit)
+    data = [{key: value for key, value in row._mapping.items() if key != "total_count"} for row in rows]
+    return {"data": data, "total_count": total_count}
+
+
+async def count_in_own_session(count_fn: Callable[..., Awaitable[int]], **filters: Any) -> int:
+    """Ejecutar una función de conteo del CRUD en una sesión propia.
+
+    Los listados obtienen el total en paralelo con la consulta de la página, y una ``AsyncSession`` no puede ejecutar
+    dos sentencias a la vez, así que el conteo toma otra sesión del pool. Normalmente se pasa a ``cached_count``
+    como su loader.
+
+    Args:
+    ----
+        count_fn: Función de conteo del CRUD que recibe la sesión como ``session`` más los filtros
+        **filters: Filtros que se pasan a ``count_fn``
+
+    Returns:
+    -------
+        El total devuelto por ``count_fn``
+    """
+    async with local_session() as session:
+        return await count_fn(session=session, **filters)
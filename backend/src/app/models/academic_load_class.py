@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -120,6 +120,17 @@ class AcademicLoadClass(Base):
     # Relaciones
     academic_load_file: Mapped[AcademicLoadFile] = relationship("AcademicLoadFile", init=False)
 
+    # Índice para el conteo de secciones únicas por tipo de clase (dashboards) con index-only scan
+    __table_args__ = (
+        Index(
+            "ix_academic_load_classes_file_sections",
+            "academic_load_file_id",
+            "class_type",
+            "class_section",
+            "subject_code",
+        ),
+    )
+
     def __repr__(self) -> str:
         return (
             f"<AcademicLoadClass(id={self.id}, "
@@ -72,4 +72,19 @@ class AcademicLoadFile(Base):
             unique=True,
             postgresql_where=(is_active.is_(True)),
         ),
+        # Cargas activas por ciclo y escuela (dashboards: term_id = / IN y school_id IN con is_active)
+        Index(
+            "ix_academic_load_files_term_school_active",
+            "term_id",
+            "school_id",
+            postgresql_where=(is_active.is_(True)),
+        ),
+        # Versiones de un ciclo y escuela en el orden del dashboard de director (activa primero, luego más recientes)
+        Index(
+            "ix_academic_load_files_school_term_versions",
+            "school_id",
+            "term_id",
+            is_active.desc(),
+            upload_date.desc(),
+        ),
     )
@@ -88,6 +88,9 @@ class BillingReport(Base):
     # Clave Primaria (al final para evitar problemas con dataclasses)
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True, init=False)
 
+    # Índice para obtener la planilla más reciente de cada carga (DISTINCT ON / ORDER BY created_at DESC)
+    __table_args__ = (Index("ix_billing_reports_file_created", "academic_load_file_id", created_at.desc()),)
+
     @property
     def term_term(self) -> int | None:
         """Obtener el número del ciclo desde academic_load_file.term."""
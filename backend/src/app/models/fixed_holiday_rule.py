@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Integer, String
+from sqlalchemy import Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..core.db.database import Base
@@ -36,6 +36,9 @@ class FixedHolidayRule(Base):
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.utcnow(), nullable=False)
     updated_at: Mapped[datetime | None] = mapped_column(default=None, onupdate=lambda: datetime.utcnow(), nullable=True)
 
+    # One rule per calendar date; backs up the month/day check in create/update against concurrent writes
+    __table_args__ = (Index("ix_fixed_holiday_rules_month_day", "month", "day", unique=True),)
+
     def __repr__(self) -> str:
         """String representation of FixedHolidayRule."""
         return f"<FixedHolidayRule(id={self.id}, name={self.name}, date={self.month}/{self.day})>"
@@ -64,6 +64,13 @@ class HourlyRateHistory(Base):
     __table_args__ = (
         Index("ix_hourly_rate_level_dates", "level_id", "start_date", "end_date"),
         Index("ix_hourly_rate_active", "level_id", "end_date"),
+        # Matches the list order (level, newest first, id tie-breaker) and serves the per-level
+        # timeline and current-rate lookups with a forward range scan
+        Index("ix_hourly_rate_level_start_desc", "level_id", start_date.desc(), id.desc()),
+        # Only one active rate per level: a concurrent second creation fails instead of racing.
+        # Like the index above, it only exists on tables created with it: create_all does not add
+        # indexes to an existing table
+        Index("ix_hourly_rate_one_active_per_level", "level_id", unique=True, postgresql_where=end_date.is_(None)),
     )
 
     def __repr__(self) -> str:
@@ -3,7 +3,7 @@
 import uuid as uuid_pkg
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -85,3 +85,6 @@ class RecycleBin(Base):
             f"<RecycleBin(id={self.id}, entity_type='{self.entity_type}', "
             f"entity_id={self.entity_id}, entity_name='{self.entity_display_name}')>"
         )
+
+    # Orden de la papelera (más recientes primero, id como desempate) para la paginación por cursor
+    __table_args__ = (Index("ix_recycle_bin_deleted_at_id", "deleted_at", "id"),)
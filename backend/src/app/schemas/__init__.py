@@ -12,7 +12,7 @@ from .catalog_subject import (
     CatalogSubjectUpdate,
     SubjectSchoolRead,
 )
-from .faculty import FacultyCreate, FacultyRead, FacultyReadWithSchools, FacultyUpdate
+from .faculty import FacultyCreate, FacultyCursorPage, FacultyRead, FacultyReadWithSchools, FacultyUpdate
 from .fixed_holiday_rule import (
     FixedHolidayRuleCreate,
     FixedHolidayRuleInternal,
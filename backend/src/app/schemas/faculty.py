@@ -50,6 +50,14 @@ class FacultyRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class FacultyCursorPage(BaseModel):
+    """Schema de una página de facultades con paginación por cursor (keyset sobre id)."""
+
+    data: list[FacultyRead]
+    next_cursor: str | None = None
+    items_per_page: int
+
+
 class FacultyReadWithSchools(FacultyRead):
     """Schema para leer datos de Facultad con escuelas relacionadas."""
 
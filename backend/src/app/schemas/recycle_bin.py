@@ -60,6 +60,14 @@ class RecycleBinRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RecycleBinCursorPage(BaseModel):
+    """Schema de una página de la papelera con paginación por cursor (keyset sobre deleted_at e id)."""
+
+    data: list[RecycleBinRead]
+    next_cursor: str | None = None
+    items_per_page: int
+
+
 class RecycleBinRestore(BaseModel):
     """Schema para restaurar un registro desde RecycleBin."""
 
@@ -36,6 +36,7 @@ def mock_redis_pools():
     mock_cache_client.delete = AsyncMock(return_value=True)
     mock_cache_client.exists = AsyncMock(return_value=False)
     mock_cache_client.setex = AsyncMock(return_value=True)
+    mock_cache_client.scan = AsyncMock(return_value=(0, []))
     mock_cache_client.aclose = AsyncMock()
 
     # Mock Redis queue pool
@@ -0,0 +1,797 @@
+"""Pruebas de los dashboards de director y consolidados (decano y vicerrector) contra PostgreSQL."""
+
+import json
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+
+_LEVEL_COLUMNS = (
+    "payment_rate_grado",
+    "payment_rate_maestria_1",
+    "payment_rate_maestria_2",
+    "payment_rate_doctor",
+    "payment_rate_bilingue",
+)
+
+
+class DashboardSeed:
+    """Datos de prueba confirmados en la base de datos y eliminados al terminar la prueba.
+
+    Los dashboards lanzan sus consultas en paralelo, cada una en su propia sesión, así que los datos tienen que estar
+    confirmados y no pueden vivir en una transacción que se revierte.
+    """
+
+    def __init__(self, sessionmaker):
+        self.sessionmaker = sessionmaker
+        self.tag = uuid4().hex[:8]
+        self.user_uuid = None
+        self.faculty_ids: list[int] = []
+        self.term_ids: list[int] = []
+        self._clock = datetime(2090, 1, 1, tzinfo=UTC)
+
+    def _tick(self) -> datetime:
+        """Marca de tiempo creciente: cada planilla o carga sembrada es más reciente que la anterior."""
+        self._clock += timedelta(minutes=1)
+        return self._clock
+
+    async def _insert(self, model, values: dict):
+        from sqlalchemy import insert
+
+        async with self.sessionmaker() as session:
+            (primary_key,) = model.__table__.primary_key.columns
+            row_id = (await session.execute(insert(model).values(**values).returning(primary_key))).scalar_one()
+            await session.commit()
+        return row_id
+
+    async def user(self):
+        from src.app.models.user import User
+
+        if self.user_uuid is None:
+            self.user_uuid = await self._insert(
+                User,
+                {
+                    "uuid": uuid4(),
+                    "name": "Dashboard test",
+                    "username": f"dash{self.tag}",
+                    "email": f"dash{self.tag}@example.com",
+                    "hashed_password": "x",
+                    "created_at": datetime.now(UTC),
+                },
+            )
+        return self.user_uuid
+
+    async def faculty(self) -> int:
+        from src.app.models.faculty import Faculty
+
+        index = len(self.faculty_ids)
+        faculty_id = await self._insert(
+            Faculty,
+            {
+                "name": f"Facultad {self.tag} {index}",
+                "acronym": f"F{self.tag}{index}",
+                "is_active": True,
+                "deleted": False,
+                "created_at": datetime.now(UTC),
+            },
+        )
+        self.faculty_ids.append(faculty_id)
+        return faculty_id
+
+    async def school(self, faculty_id: int, acronym: str) -> int:
+        from src.app.models.school import School
+
+        return await self._insert(
+            School,
+            {
+                "name": f"Escuela {acronym}",
+                "acronym": acronym,
+                "fk_faculty": faculty_id,
+                "is_active": True,
+                "created_at": datetime.now(UTC),
+            },
+        )
+
+    async def term(self, term: int, year: int) -> int:
+        from src.app.models.term import Term
+
+        term_id = await self._insert(
+            Term,
+            {"term": term, "year": year, "start_date": date(year, 7, 1), "end_date": date(year, 12, 15)},
+        )
+        self.term_ids.append(term_id)
+        return term_id
+
+    async def load_file(self, faculty_id: int, school_id: int, term_id: int, *, is_active: bool = True, version=1):
+        from src.app.models.academic_load_file import AcademicLoadFile
+
+        return await self._insert(
+            AcademicLoadFile,
+            {
+                "user_id": await self.user(),
+                "user_name": "Dashboard test",
+                "faculty_id": faculty_id,
+                "school_id": school_id,
+                "term_id": term_id,
+                "original_filename": "carga.xlsx",
+                "original_file_path": "/tmp/carga.xlsx",
+                "upload_date": self._tick(),
+                "ingestion_status": "completed",
+                "version": version,
+                "is_active": is_active,
+            },
+        )
+
+    async def report(self, file_id: int, *, summaries=(), items=()) -> int:
+        """Crear una planilla con sus payment_summaries y monthly_items.
+
+        ``summaries`` son tuplas ``(días, horario, duración, (tasas de los cinco niveles))`` e ``items`` tuplas
+        ``(días, horario, duración, año, mes, sesiones, horas, dólares)``.
+        """
+        from sqlalchemy import insert
+
+        from src.app.models.billing_report import BillingReport, BillingReportMonthlyItem, BillingReportPaymentSummary
+
+        report_id = await self._insert(
+            BillingReport,
+            {
+                "user_id": await self.user(),
+                "user_name": "Dashboard test",
+                "academic_load_file_id": file_id,
+                "created_at": self._tick(),
+            },
+        )
+        async with self.sessionmaker() as session:
+            if summaries:
+                await session.execute(
+                    insert(BillingReportPaymentSummary),
+                    [
+                        {
+                            "billing_report_id": report_id,
+                            "class_days": days,
+                            "class_schedule": schedule,
+                            "class_duration": duration,
+                            **{column: Decimal(str(rate)) for column, rate in zip(_LEVEL_COLUMNS, rates, strict=True)},
+                        }
+                        for days, schedule, duration, rates in summaries
+                    ],
+                )
+            if items:
+                await session.execute(
+                    insert(BillingReportMonthlyItem),
+                    [
+                        {
+                            "billing_report_id": report_id,
+                            "class_days": days,
+                            "class_schedule": schedule,
+                            "class_duration": duration,
+                            "year": year,
+                            "month": month,
+                            "month_name": f"{month:02d}",
+                            "sessions": sessions,
+                            "real_time_minutes": sessions * duration,
+                            "total_class_hours": Decimal(str(hours)),
+                            "total_dollars": Decimal(str(dollars)),
+                        }
+                        for days, schedule, duration, year, month, sessions, hours, dollars in items
+                    ],
+                )
+            await session.commit()
+        return report_id
+
+    async def update(self, model, row_id: int, **values) -> None:
+        """Actualizar una fila sembrada, confirmando el cambio para las sesiones del dashboard."""
+        from sqlalchemy import update
+
+        async with self.sessionmaker() as session:
+            await session.execute(update(model).where(model.id == row_id).values(**values))
+            await session.commit()
+
+    async def cleanup(self) -> None:
+        """Eliminar todo lo sembrado; las planillas, sus detalles y las escuelas se borran en cascada."""
+        from sqlalchemy import delete
+
+        from src.app.models.academic_load_file import AcademicLoadFile
+        from src.app.models.faculty import Faculty
+        from src.app.models.term import Term
+        from src.app.models.user import User
+
+        async with self.sessionmaker() as session:
+            if self.faculty_ids:
+                await session.execute(delete(AcademicLoadFile).where(AcademicLoadFile.faculty_id.in_(self.faculty_ids)))
+                await session.execute(delete(Faculty).where(Faculty.id.in_(self.faculty_ids)))
+            if self.term_ids:
+                await session.execute(delete(Term).where(Term.id.in_(self.term_ids)))
+            if self.user_uuid is not None:
+                await session.execute(delete(User).where(User.uuid == self.user_uuid))
+            await session.commit()
+
+
+@pytest_asyncio.fixture
+async def dashboard_seed():
+    """Sembrador de datos sobre PostgreSQL, con las sesiones propias del módulo de dashboards apuntando a él.
+
+    Redis se desactiva y los cachés en proceso de KPIs y ciclos se vacían antes y después de cada prueba.
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from src.app.api.v1 import dashboard
+    from src.app.core.config import settings
+    from src.app.core.db.database import Base
+
+    engine = create_async_engine(f"{settings.POSTGRES_ASYNC_PREFIX}{settings.POSTGRES_URI}", poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, checkfirst=True)
+    except (OSError, ConnectionError) as e:
+        await engine.dispose()
+        pytest.skip(f"Requires real database connection: {e}")
+
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    seed = DashboardSeed(sessionmaker)
+    dashboard._report_kpis_cache.clear()
+    dashboard._terms_cache.clear()
+    try:
+        with (
+            patch("src.app.api.v1.dashboard.local_session", sessionmaker),
+            patch("src.app.core.utils.cache.client", None),
+        ):
+            yield seed
+    finally:
+        dashboard._report_kpis_cache.clear()
+        dashboard._terms_cache.clear()
+        await seed.cleanup()
+        await engine.dispose()
+
+
+def _baseline_kpis(reports: list[tuple[list, list]]) -> dict:
+    """KPIs consolidados según el cálculo original en Python (``_get_kpis_for_report`` sumado por planilla).
+
+    ``reports`` es una lista de ``(summaries, items)`` con las mismas tuplas que ``DashboardSeed.report``.
+    """
+    paid_full = paid_partial = paid_none = 0
+    for summaries, _ in reports:
+        for *_, rates in summaries:
+            s = sum(float(rate) for rate in rates)
+            if s == 0:
+                paid_none += 1
+            elif s >= 1.0:
+                paid_full += 1
+            else:
+                paid_partial += 1
+    total_groups = paid_full + paid_partial + paid_none
+    return {
+        "has_billing_report": True,
+        "total_hours": sum(item[6] for _, items in reports for item in items),
+        "total_dollars": sum(item[7] for _, items in reports for item in items),
+        "paid_groups_full": paid_full,
+        "paid_groups_partial": paid_partial,
+        "paid_groups_none": paid_none,
+        "coverage_rate": (paid_full + paid_partial) / total_groups if total_groups else 0.0,
+    }
+
+
+def _baseline_charts(reports: list[tuple[list, list]], *, top_blocks: bool = False) -> dict:
+    """Charts según el cálculo original en Python, recorriendo las planillas en el orden recibido.
+
+    Heatmap y stacked conservan el orden de primera aparición, el trend se ordena por mes y los top blocks (solo del
+    dashboard de director, con una planilla) unen niveles y montos por bloque y toman los 10 de más dólares.
+    """
+    heatmap: dict[tuple[str, str], list[float]] = {}
+    stacked: dict[str, list[float]] = {}
+    trend: dict[str, list[float]] = {}
+    for summaries, items in reports:
+        for days, schedule, _, _, _, _, hours, dollars in items:
+            cell = heatmap.setdefault((days, schedule), [0.0, 0.0])
+            cell[0] += hours
+            cell[1] += dollars
+        for _, schedule, _, rates in summaries:
+            levels = stacked.setdefault(schedule, [0.0] * 5)
+            for i, rate in enumerate(rates):
+                levels[i] += rate
+        for _, _, _, year, month, sessions, hours, dollars in items:
+            month_totals = trend.setdefault(f"{year}-{month:02d}", [0, 0.0, 0.0])
+            month_totals[0] += sessions
+            month_totals[1] += hours
+            month_totals[2] += dollars
+
+    level_keys = ("GDO", "M1", "M2", "DR", "BLG")
+    charts = {
+        "heatmap": [
+            {"day": day, "schedule": schedule, "hours": hours, "dollars": dollars}
+            for (day, schedule), (hours, dollars) in heatmap.items()
+        ],
+        "stacked_by_schedule": [
+            {"schedule": schedule, **dict(zip(level_keys, levels, strict=True))} for schedule, levels in stacked.items()
+        ],
+        "monthly_trend": [
+            {"month": month, "sessions": sessions, "hours": hours, "dollars": dollars}
+            for month, (sessions, hours, dollars) in sorted(trend.items())
+        ],
+    }
+    if top_blocks:
+        ((summaries, items),) = reports
+        blocks: dict[tuple[str, str, int], dict] = {}
+        empty_block = {"hours": 0.0, "dollars": 0.0, **dict.fromkeys(level_keys, 0.0)}
+        for days, schedule, duration, rates in summaries:
+            block = blocks.setdefault((days, schedule, duration), dict(empty_block))
+            for key, rate in zip(level_keys, rates, strict=True):
+                block[key] += rate
+        for days, schedule, duration, _, _, _, hours, dollars in items:
+            block = blocks.setdefault((days, schedule, duration), dict(empty_block))
+            block["hours"] += hours
+            block["dollars"] += dollars
+        top = sorted(blocks.items(), key=lambda kv: kv[1]["dollars"], reverse=True)[:10]
+        charts["top_blocks"] = [
+            {"class_days": days, "class_schedule": schedule, "class_duration": duration, **block}
+            for (days, schedule, duration), block in top
+        ]
+    return charts
+
+
+def _rounded(value):
+    """Redondear los floats de una estructura anidada para compararla sin errores de punto flotante."""
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item) for item in value]
+    return value
+
+
+def _payload(response) -> dict:
+    """Cuerpo de la respuesta de un dashboard, sea el modelo vacío o el JSON ya serializado."""
+    if hasattr(response, "model_dump"):
+        return response.model_dump(mode="json")
+    return json.loads(response.body)
+
+
+# Planilla de director: bloques con varias filas por horario (stacked), un bloque solo con niveles, otro solo con
+# montos, meses desordenados y un cambio de año en el trend
+DIRECTOR_SUMMARIES = [
+    ("Lu-Mi", "07:00-08:40", 100, (1, 0, 0, 0, 0)),
+    ("Ma-Ju", "09:00-10:40", 100, (0, 0, 0, 0, 0)),
+    ("Sa", "07:00-08:40", 50, (0, 0, 0, 1, 0.5)),
+    ("Vi", "13:00-14:40", 100, (0.25, 0, 0, 0, 0)),
+]
+DIRECTOR_ITEMS = [
+    ("Lu-Mi", "07:00-08:40", 100, 2091, 9, 8, 13.33, 300.0),
+    ("Lu-Mi", "07:00-08:40", 100, 2091, 8, 8, 13.33, 300.0),
+    ("Ma-Ju", "09:00-10:40", 100, 2091, 8, 6, 10.0, 250.5),
+    ("Sa", "07:00-08:40", 50, 2091, 8, 4, 3.33, 80.0),
+    ("Lu-Vi", "18:00-19:40", 100, 2091, 10, 10, 16.67, 410.0),
+    ("Sa", "07:00-08:40", 50, 2092, 1, 2, 1.67, 40.0),
+]
+COMPARE_SUMMARIES = [
+    ("Lu-Mi", "07:00-08:40", 100, (0.5, 0, 0, 0, 0)),
+    ("Ma-Ju", "09:00-10:40", 100, (1, 0, 0, 0, 0)),
+]
+COMPARE_ITEMS = [("Lu-Mi", "07:00-08:40", 100, 2090, 8, 8, 13.33, 280.0)]
+
+
+class TestConsolidatedKpis:
+    """Pruebas de los KPIs agregados en SQL por ``_fetch_consolidated_kpis``."""
+
+    async def test_group_buckets_match_python_classification(self, dashboard_seed):
+        """Prueba que cada suma de tasas caiga en el mismo grupo que en el cálculo en Python, incluida una negativa."""
+        from src.app.api.v1.dashboard import _fetch_consolidated_kpis
+
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "EKP")
+        term_id = await dashboard_seed.term(1, 2090)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+        # Sumas de tasas 0, 0.5, 1, 1.25 y -0.5
+        rates = [(0, 0, 0, 0, 0), (0.5, 0, 0, 0, 0), (1, 0, 0, 0, 0), (0.5, 0.5, 0.25, 0, 0), (-0.5, 0, 0, 0, 0)]
+        summaries = [("Lu-Mi", f"0{i}:00-0{i}:50", 50, r) for i, r in enumerate(rates)]
+        items = [
+            ("Lu-Mi", "08:00-08:50", 50, 2090, 8, 4, 12.5, 250.0),
+            ("Lu-Mi", "08:00-08:50", 50, 2090, 9, 3, 7.25, 145.5),
+        ]
+        report_id = await dashboard_seed.report(file_id, summaries=summaries, items=items)
+
+        kpis = await _fetch_consolidated_kpis([report_id])
+
+        assert kpis.model_dump() == pytest.approx(_baseline_kpis([(summaries, items)]))
+        assert (kpis.paid_groups_full, kpis.paid_groups_partial, kpis.paid_groups_none) == (2, 2, 1)
+        assert kpis.paid_groups_full + kpis.paid_groups_partial + kpis.paid_groups_none == len(rates)
+
+    async def test_no_reports(self, dashboard_seed):
+        """Prueba que sin planillas se devuelvan los KPIs vacíos."""
+        from src.app.api.v1.dashboard import _fetch_consolidated_kpis
+        from src.app.schemas.dashboard import DashboardKPIs
+
+        assert await _fetch_consolidated_kpis([]) == DashboardKPIs()
+
+
+async def _report_row(seed: DashboardSeed, report_id: int):
+    """Fila de la planilla con las columnas que versionan sus KPIs, como la leen los dashboards."""
+    from sqlalchemy import select
+
+    from src.app.api.v1.dashboard import _REPORT_VERSION_COLUMNS
+    from src.app.models.billing_report import BillingReport
+
+    async with seed.sessionmaker() as session:
+        return (await session.execute(select(*_REPORT_VERSION_COLUMNS).filter(BillingReport.id == report_id))).one()
+
+
+async def _director_dashboard(seed: DashboardSeed, school_id: int, term_id: int, db=None):
+    """Llamar al dashboard de director con la escuela asignada al director por RBAC."""
+    from src.app.api.v1.dashboard import get_director_dashboard
+    from src.app.models.role import UserRoleEnum
+
+    current_user = {"role": UserRoleEnum.DIRECTOR, "user_uuid": await seed.user()}
+    with patch("src.app.api.v1.dashboard.get_user_scope_filters", AsyncMock(return_value={"school_ids": [school_id]})):
+        if db is not None:
+            return await get_director_dashboard(current_user, db, term_id=term_id, file_id=None, compare_term_id=None)
+        async with seed.sessionmaker() as session:
+            return await get_director_dashboard(
+                current_user, session, term_id=term_id, file_id=None, compare_term_id=None
+            )
+
+
+async def _vicerrector_dashboard(seed: DashboardSeed, faculty_id: int, term_id: int):
+    """Llamar al dashboard de vicerrector filtrado por una facultad sembrada."""
+    from src.app.api.v1.dashboard import get_vicerrector_dashboard
+    from src.app.models.role import UserRoleEnum
+
+    current_user = {"role": UserRoleEnum.VICERRECTOR, "user_uuid": await seed.user()}
+    async with seed.sessionmaker() as session:
+        return await get_vicerrector_dashboard(
+            current_user, session, term_id=term_id, faculty_id=faculty_id, school_id=None, compare_term_id=None
+        )
+
+
+class TestDirectorDashboard:
+    """Pruebas del dashboard de director."""
+
+    async def test_empty_dataset(self, dashboard_seed):
+        """Prueba que una escuela sin cargas en el ciclo devuelva la estructura vacía con el contexto."""
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "EDV")
+        term_id = await dashboard_seed.term(1, 2091)
+
+        payload = _payload(await _director_dashboard(dashboard_seed, school_id, term_id))
+
+        assert payload["kpis"] == {**_baseline_kpis([]), "has_billing_report": False}
+        assert payload["charts"] == dict.fromkeys(
+            (
+                "heatmap",
+                "stacked_by_schedule",
+                "monthly_trend",
+                "top_blocks",
+                "comparative_sections",
+                "sections_by_school",
+            ),
+            [],
+        )
+        assert payload["tables"] == {"recent_loads": []}
+        assert payload["context"]["term_term"] == 1
+        assert payload["context"]["term_year"] == 2091
+        assert payload["context"]["school_acronym"] == "EDV"
+        assert payload["context"]["file_versions"] == []
+
+    async def test_aggregations_match_python_computation(self, dashboard_seed):
+        """Prueba que KPIs, charts y comparación coincidan con el cálculo original en Python."""
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "EDA")
+        cmp_term_id = await dashboard_seed.term(1, 2090)
+        term_id = await dashboard_seed.term(1, 2091)
+        cmp_file_id = await dashboard_seed.load_file(faculty_id, school_id, cmp_term_id)
+        await dashboard_seed.report(cmp_file_id, summaries=COMPARE_SUMMARIES, items=COMPARE_ITEMS)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+        # Una planilla anterior de la misma carga no se usa
+        await dashboard_seed.report(file_id, summaries=COMPARE_SUMMARIES, items=COMPARE_ITEMS)
+        await dashboard_seed.report(file_id, summaries=DIRECTOR_SUMMARIES, items=DIRECTOR_ITEMS)
+
+        payload = _payload(await _director_dashboard(dashboard_seed, school_id, term_id))
+
+        reports = [(DIRECTOR_SUMMARIES, DIRECTOR_ITEMS)]
+        assert _rounded(payload["kpis"]) == _rounded(_baseline_kpis(reports))
+        assert _rounded(payload["charts"]) == _rounded(_baseline_charts(reports, top_blocks=True))
+        assert payload["context"]["file_id_selected"] == file_id
+        assert [load["has_billing_report"] for load in payload["tables"]["recent_loads"]] == [True]
+
+        cmp_kpis = _baseline_kpis([(COMPARE_SUMMARIES, COMPARE_ITEMS)])
+        compare = payload["comparison"]["compare"]
+        assert compare["term_id"] == cmp_term_id
+        assert compare["term_label"] == "01/2090"
+        assert compare["total_dollars"] == pytest.approx(cmp_kpis["total_dollars"])
+        assert compare["coverage"] == {
+            "full": cmp_kpis["paid_groups_full"],
+            "partial": cmp_kpis["paid_groups_partial"],
+            "none": cmp_kpis["paid_groups_none"],
+        }
+
+
+class TestConsolidatedDashboard:
+    """Pruebas del dashboard consolidado, a través de los endpoints de vicerrector y decano."""
+
+    async def test_empty_dataset(self, dashboard_seed):
+        """Prueba que una facultad sin cargas en el ciclo devuelva la estructura vacía con sus escuelas."""
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "ECV")
+        term_id = await dashboard_seed.term(1, 2091)
+
+        payload = _payload(await _vicerrector_dashboard(dashboard_seed, faculty_id, term_id))
+
+        assert payload["kpis"]["has_billing_report"] is False
+        assert payload["charts"] == {"heatmap": [], "stacked_by_schedule": [], "monthly_trend": []}
+        assert payload["tables"] == {"recent_loads": []}
+        assert payload["context"]["faculty_id"] == faculty_id
+        assert payload["context"]["school_ids"] == [school_id]
+        assert payload["context"]["school_acronyms"] == ["ECV"]
+
+    async def test_files_without_reports(self, dashboard_seed):
+        """Prueba que cargas sin planilla devuelvan la estructura vacía con las versiones de las cargas."""
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "ECS")
+        term_id = await dashboard_seed.term(1, 2091)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+
+        payload = _payload(await _vicerrector_dashboard(dashboard_seed, faculty_id, term_id))
+
+        assert payload["kpis"]["has_billing_report"] is False
+        assert payload["charts"] == {"heatmap": [], "stacked_by_schedule": [], "monthly_trend": []}
+        assert [version["file_id"] for version in payload["context"]["file_versions"]] == [file_id]
+
+    async def _seed_faculty_with_reports(self, seed: DashboardSeed) -> tuple[int, int, list[tuple[list, list]]]:
+        """Facultad con dos escuelas y sus planillas vigentes, más planillas que el consolidado debe ignorar.
+
+        Devuelve la facultad, el ciclo y las planillas vigentes de la más reciente a la más antigua.
+        """
+        faculty_id = await seed.faculty()
+        school_a = await seed.school(faculty_id, "ECA")
+        school_b = await seed.school(faculty_id, "ECB")
+        cmp_term_id = await seed.term(1, 2090)
+        term_id = await seed.term(1, 2091)
+        cmp_file_id = await seed.load_file(faculty_id, school_a, cmp_term_id)
+        await seed.report(cmp_file_id, summaries=COMPARE_SUMMARIES, items=COMPARE_ITEMS)
+
+        summaries_b = [
+            ("Lu-Mi", "07:00-08:40", 100, (0, 1, 0, 0, 0)),
+            ("Ju", "15:00-16:40", 100, (0, 0, 0, 0, 0)),
+        ]
+        items_b = [
+            ("Lu-Mi", "07:00-08:40", 100, 2091, 8, 8, 13.33, 150.0),
+            ("Ju", "15:00-16:40", 100, 2091, 11, 6, 10.0, 99.5),
+        ]
+        file_a = await seed.load_file(faculty_id, school_a, term_id)
+        # Planilla anterior de la carga de A y planilla de una versión inactiva de B: no se consolidan
+        await seed.report(file_a, summaries=summaries_b, items=items_b)
+        inactive_b = await seed.load_file(faculty_id, school_b, term_id, is_active=False)
+        await seed.report(inactive_b, summaries=DIRECTOR_SUMMARIES, items=DIRECTOR_ITEMS)
+        file_b = await seed.load_file(faculty_id, school_b, term_id, version=2)
+        await seed.report(file_b, summaries=summaries_b, items=items_b)
+        await seed.report(file_a, summaries=DIRECTOR_SUMMARIES, items=DIRECTOR_ITEMS)
+        return faculty_id, term_id, [(DIRECTOR_SUMMARIES, DIRECTOR_ITEMS), (summaries_b, items_b)]
+
+    async def test_aggregations_match_python_computation(self, dashboard_seed):
+        """Prueba que KPIs y charts consolidados coincidan con el cálculo original en Python."""
+        faculty_id, term_id, reports = await self._seed_faculty_with_reports(dashboard_seed)
+
+        payload = _payload(await _vicerrector_dashboard(dashboard_seed, faculty_id, term_id))
+
+        expected_charts = _baseline_charts(reports)
+        assert _rounded(payload["kpis"]) == _rounded(_baseline_kpis(reports))
+        assert _rounded({key: payload["charts"][key] for key in expected_charts}) == _rounded(expected_charts)
+
+    async def test_decano_consolidates_own_faculty(self, dashboard_seed):
+        """Prueba que el decano obtenga los mismos KPIs y charts que el vicerrector filtrando su facultad."""
+        from src.app.api.v1.dashboard import get_decano_dashboard
+        from src.app.models.role import UserRoleEnum
+
+        faculty_id, term_id, reports = await self._seed_faculty_with_reports(dashboard_seed)
+        current_user = {"role": UserRoleEnum.DECANO, "user_uuid": await dashboard_seed.user()}
+
+        with patch(
+            "src.app.api.v1.dashboard.get_user_scope_filters", AsyncMock(return_value={"faculty_id": faculty_id})
+        ):
+            async with dashboard_seed.sessionmaker() as session:
+                response = await get_decano_dashboard(
+                    current_user, session, term_id=term_id, school_id=None, compare_term_id=None
+                )
+
+        payload = _payload(response)
+        expected_charts = _baseline_charts(reports)
+        assert _rounded(payload["kpis"]) == _rounded(_baseline_kpis(reports))
+        assert _rounded({key: payload["charts"][key] for key in expected_charts}) == _rounded(expected_charts)
+
+
+class TestReportKpisMemo:
+    """Pruebas de los KPIs por planilla memorizados por ``_report_kpis``."""
+
+    async def test_memoized_by_report_version(self, dashboard_seed):
+        """Prueba que los KPIs se reutilicen sin consultar y se recalculen cuando la planilla se edita."""
+        from src.app.api.v1 import dashboard
+        from src.app.models.billing_report import BillingReport
+
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "EMK")
+        term_id = await dashboard_seed.term(1, 2091)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+        report_id = await dashboard_seed.report(file_id, summaries=COMPARE_SUMMARIES, items=COMPARE_ITEMS)
+        row = await _report_row(dashboard_seed, report_id)
+
+        kpis = await dashboard._report_kpis(row)
+        assert kpis.model_dump() == pytest.approx(_baseline_kpis([(COMPARE_SUMMARIES, COMPARE_ITEMS)]))
+        assert list(dashboard._report_kpis_cache) == [(report_id, row.created_at)]
+
+        # Un acierto no consulta la base de datos y devuelve una copia que se puede modificar
+        kpis.total_dollars = 0.0
+        with patch("src.app.api.v1.dashboard._fetch_consolidated_kpis", AsyncMock(side_effect=AssertionError)):
+            cached = await dashboard._report_kpis(row)
+        assert cached.total_dollars == pytest.approx(280.0)
+
+        # Editar la planilla cambia su updated_at y, con él, la clave del memo
+        await dashboard_seed.report(file_id)
+        edited_at = row.created_at + timedelta(hours=1)
+        await dashboard_seed.update(BillingReport, report_id, updated_at=edited_at)
+        with patch("src.app.api.v1.dashboard._fetch_consolidated_kpis", AsyncMock(return_value=cached)) as fetch:
+            await dashboard._report_kpis(await _report_row(dashboard_seed, report_id))
+        fetch.assert_awaited_once_with([report_id])
+        assert list(dashboard._report_kpis_cache) == [(report_id, row.created_at), (report_id, edited_at)]
+
+
+class TestDashboardCacheKeys:
+    """Pruebas de las claves versionadas de los dashboards cacheados en Redis."""
+
+    async def test_no_key_without_redis(self, dashboard_seed):
+        """Prueba que sin cliente de Redis no se calcule clave ni se consulte la versión."""
+        from src.app.api.v1.dashboard import _consolidated_cache_key, _director_cache_key
+
+        with patch("src.app.api.v1.dashboard._fetch_all", AsyncMock(side_effect=AssertionError)):
+            assert await _director_cache_key(school_id=1, term_id=1, file_id=None, compare_term_id=None) is None
+            assert (
+                await _consolidated_cache_key(
+                    term_id=1,
+                    compare_term_id=None,
+                    scope_faculty_id=None,
+                    school_id=None,
+                    target_school_ids=[1],
+                    term_ids=[1],
+                )
+                is None
+            )
+
+    async def test_director_key_follows_school_data(self, dashboard_seed):
+        """Prueba que la clave de director cambie con planillas nuevas o editadas y con el estado de las cargas."""
+        from src.app.api.v1.dashboard import _director_cache_key
+        from src.app.models.academic_load_file import AcademicLoadFile
+        from src.app.models.billing_report import BillingReport
+
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "EKD")
+        term_id = await dashboard_seed.term(1, 2091)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+
+        async def key():
+            return await _director_cache_key(school_id=school_id, term_id=term_id, file_id=None, compare_term_id=None)
+
+        with patch("src.app.core.utils.cache.client", MagicMock()):
+            keys = [await key()]
+            assert keys[0].startswith(f"dashboard:director:{school_id}:{term_id}:None:None:")
+            assert await key() == keys[0]
+
+            report_id = await dashboard_seed.report(file_id)
+            keys.append(await key())
+            await dashboard_seed.update(BillingReport, report_id, updated_at=datetime(2095, 1, 1, tzinfo=UTC))
+            keys.append(await key())
+            await dashboard_seed.update(AcademicLoadFile, file_id, ingestion_status="failed")
+            keys.append(await key())
+            await dashboard_seed.update(AcademicLoadFile, file_id, is_active=False)
+            keys.append(await key())
+
+        assert len(set(keys)) == len(keys)
+
+    async def test_consolidated_key_follows_active_files(self, dashboard_seed):
+        """Prueba que la clave consolidada cambie con las cargas activas y sus planillas, y no con las inactivas."""
+        from src.app.api.v1.dashboard import _consolidated_cache_key
+        from src.app.models.academic_load_file import AcademicLoadFile
+
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "EKC")
+        term_id = await dashboard_seed.term(1, 2091)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+        inactive_id = await dashboard_seed.load_file(faculty_id, school_id, term_id, is_active=False)
+
+        async def key():
+            return await _consolidated_cache_key(
+                term_id=term_id,
+                compare_term_id=None,
+                scope_faculty_id=faculty_id,
+                school_id=None,
+                target_school_ids=[school_id],
+                term_ids=[term_id],
+            )
+
+        with patch("src.app.core.utils.cache.client", MagicMock()):
+            initial = await key()
+            assert initial.startswith(f"dashboard:consolidated:{term_id}:None:{faculty_id}:None:{school_id}:")
+
+            await dashboard_seed.report(inactive_id)
+            assert await key() == initial
+
+            await dashboard_seed.report(file_id)
+            with_report = await key()
+            assert with_report != initial
+
+            await dashboard_seed.update(AcademicLoadFile, file_id, ingestion_status="failed")
+            assert await key() not in (initial, with_report)
+
+    async def test_director_response_served_from_cache(self, dashboard_seed):
+        """Prueba que la respuesta se guarde bajo la clave versionada y luego se sirva sin consultar la carga."""
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "EKR")
+        term_id = await dashboard_seed.term(1, 2091)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+        await dashboard_seed.report(file_id, summaries=COMPARE_SUMMARIES, items=COMPARE_ITEMS)
+        client = MagicMock()
+        client.get = AsyncMock(return_value=None)
+        client.setex = AsyncMock()
+
+        with patch("src.app.core.utils.cache.client", client):
+            response = await _director_dashboard(dashboard_seed, school_id, term_id)
+            cache_key, _, payload = client.setex.await_args.args
+            assert cache_key.startswith(f"dashboard:director:{school_id}:{term_id}:")
+            assert response.body == payload.encode()
+
+            client.get = AsyncMock(return_value=payload)
+            db = MagicMock()
+            db.execute = AsyncMock(side_effect=AssertionError)
+            cached = await _director_dashboard(dashboard_seed, school_id, term_id, db=db)
+
+        client.get.assert_awaited_once_with(cache_key)
+        assert cached.body == response.body
+
+
+class TestInProcessCaches:
+    """Pruebas de los cachés LRU en proceso de ciclos y de KPIs por planilla."""
+
+    async def test_terms_cache_evicts_least_recently_used(self, dashboard_seed):
+        """Prueba que el caché de ciclos descarte el menos usado y no guarde ciclos inexistentes."""
+        from src.app.api.v1 import dashboard
+
+        prev_id = await dashboard_seed.term(1, 2090)
+        first_id = await dashboard_seed.term(1, 2091)
+        second_id = await dashboard_seed.term(2, 2091)
+        third_id = await dashboard_seed.term(3, 2091)
+
+        with patch("src.app.api.v1.dashboard._TERMS_CACHE_SIZE", 2):
+            term, cmp_term = await dashboard._fetch_terms(first_id, None)
+            assert (term.id, cmp_term.id) == (first_id, prev_id)
+            await dashboard._fetch_terms(second_id, None)
+            # Un acierto no consulta y pasa a ser el más reciente
+            with patch("src.app.api.v1.dashboard.local_session", MagicMock(side_effect=AssertionError)):
+                term, cmp_term = await dashboard._fetch_terms(first_id, None)
+            assert (term.id, cmp_term.id) == (first_id, prev_id)
+            await dashboard._fetch_terms(third_id, None)
+
+            assert list(dashboard._terms_cache) == [(first_id, None), (third_id, None)]
+            assert await dashboard._fetch_terms(max(dashboard_seed.term_ids) + 1000, None) == (None, None)
+            assert list(dashboard._terms_cache) == [(first_id, None), (third_id, None)]
+
+    async def test_report_kpis_cache_evicts_least_recently_used(self, dashboard_seed):
+        """Prueba que el memo de KPIs por planilla descarte la planilla usada hace más tiempo."""
+        from src.app.api.v1 import dashboard
+
+        faculty_id = await dashboard_seed.faculty()
+        school_id = await dashboard_seed.school(faculty_id, "ELR")
+        term_id = await dashboard_seed.term(1, 2091)
+        file_id = await dashboard_seed.load_file(faculty_id, school_id, term_id)
+        rows = [await _report_row(dashboard_seed, await dashboard_seed.report(file_id)) for _ in range(3)]
+
+        with patch("src.app.api.v1.dashboard._REPORT_KPIS_CACHE_SIZE", 2):
+            for row in (rows[0], rows[1], rows[0], rows[2]):
+                await dashboard._report_kpis(row)
+
+        assert list(dashboard._report_kpis_cache) == [
+            (rows[0].id, rows[0].created_at),
+            (rows[2].id, rows[2].created_at),
+        ]
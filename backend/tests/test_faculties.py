@@ -1,8 +1,10 @@
 """Unit tests for faculties API endpoints."""
 
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from fastapi import HTTPException
 
 from src.app.api.v1.faculties import (
     create_faculty,
@@ -14,7 +16,7 @@ from src.app.api.v1.faculties import (
     update_faculty,
 )
 from src.app.core.exceptions.http_exceptions import DuplicateValueException, NotFoundException
-from src.app.schemas.faculty import FacultyCreate, FacultyUpdate
+from src.app.schemas.faculty import FacultyCreate, FacultyRead, FacultyUpdate
 
 
 class TestCreateFaculty:
@@ -25,37 +27,35 @@ class TestCreateFaculty:
         """Test successful faculty creation."""
         faculty_data = FacultyCreate(name="Facultad de Ingeniería", acronym="FI", is_active=True)
 
-        mock_created_faculty = Mock(id=1)
-        mock_faculty_read = {
-            "id": 1,
-            "name": "Facultad de Ingeniería",
-            "acronym": "FI",
-            "is_active": True,
-        }
-
-        with patch("src.app.api.v1.faculties.faculty_exists") as mock_exists:
-            mock_exists.return_value = False
+        mock_created_faculty = Mock(
+            id=1,
+            is_active=True,
+            deleted=False,
+            created_at=datetime(2025, 1, 1, tzinfo=UTC),
+            updated_at=None,
+            deleted_at=None,
+        )
+        mock_created_faculty.name = "Facultad de Ingeniería"
+        mock_created_faculty.acronym = "FI"
 
-            with patch("src.app.api.v1.faculties.faculty_acronym_exists") as mock_acronym_exists:
-                mock_acronym_exists.return_value = False
+        with patch("src.app.api.v1.faculties.insert_faculty", new_callable=AsyncMock) as mock_insert:
+            mock_insert.return_value = mock_created_faculty
 
-                with patch("src.app.api.v1.faculties.crud_faculties") as mock_crud:
-                    mock_crud.create = AsyncMock(return_value=mock_created_faculty)
-                    mock_crud.get = AsyncMock(return_value=mock_faculty_read)
+            result = await create_faculty(Mock(), faculty_data, mock_db, current_admin_user_dict)
 
-                    result = await create_faculty(Mock(), faculty_data, mock_db, current_admin_user_dict)
-
-                    assert result == mock_faculty_read
-                    mock_crud.create.assert_called_once()
-                    mock_crud.get.assert_called_once()
+            assert isinstance(result, FacultyRead)
+            assert result.id == 1
+            assert result.name == "Facultad de Ingeniería"
+            assert result.acronym == "FI"
+            mock_insert.assert_called_once_with(db=mock_db, faculty=faculty_data)
 
     @pytest.mark.asyncio
     async def test_create_faculty_duplicate_name(self, mock_db, current_admin_user_dict):
         """Test faculty creation with duplicate name."""
         faculty_data = FacultyCreate(name="Facultad Existente", acronym="FE", is_active=True)
 
-        with patch("src.app.api.v1.faculties.faculty_exists") as mock_exists:
-            mock_exists.return_value = True
+        with patch("src.app.api.v1.faculties.insert_faculty", new_callable=AsyncMock) as mock_insert:
+            mock_insert.side_effect = ValueError("Ya existe una facultad con el nombre 'Facultad Existente'")
 
             with pytest.raises(DuplicateValueException, match="Ya existe una facultad con el nombre"):
                 await create_faculty(Mock(), faculty_data, mock_db, current_admin_user_dict)
@@ -65,14 +65,11 @@ class TestCreateFaculty:
         """Test faculty creation with duplicate acronym."""
         faculty_data = FacultyCreate(name="Nueva Facultad", acronym="FI", is_active=True)
 
-        with patch("src.app.api.v1.faculties.faculty_exists") as mock_exists:
-            mock_exists.return_value = False
-
-            with patch("src.app.api.v1.faculties.faculty_acronym_exists") as mock_acronym_exists:
-                mock_acronym_exists.return_value = True
+        with patch("src.app.api.v1.faculties.insert_faculty", new_callable=AsyncMock) as mock_insert:
+            mock_insert.side_effect = ValueError("Ya existe una facultad con el acrónimo 'FI'")
 
-                with pytest.raises(DuplicateValueException, match="Ya existe una facultad con el acrónimo"):
-                    await create_faculty(Mock(), faculty_data, mock_db, current_admin_user_dict)
+            with pytest.raises(DuplicateValueException, match="Ya existe una facultad con el acrónimo"):
+                await create_faculty(Mock(), faculty_data, mock_db, current_admin_user_dict)
 
 
 class TestListFaculties:
@@ -96,6 +93,34 @@ class TestListFaculties:
                 mock_get_faculties.assert_called_once()
                 mock_paginated.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_list_faculties_by_cursor(self, mock_db, current_user_dict):
+        """Test keyset pagination when a cursor is provided."""
+        mock_page = {"data": [{"id": 3}, {"id": 4}], "next_cursor": "NA=="}
+
+        with patch("src.app.api.v1.faculties.get_non_deleted_faculties_after") as mock_get_after:
+            mock_get_after.return_value = mock_page
+
+            with patch("src.app.api.v1.faculties.get_non_deleted_faculties") as mock_get_faculties:
+                result = await list_faculties(
+                    Mock(), mock_db, current_user_dict, page=1, items_per_page=2, is_active=None, cursor="Mg=="
+                )
+
+                assert result == {"data": [{"id": 3}, {"id": 4}], "next_cursor": "NA==", "items_per_page": 2}
+                mock_get_after.assert_called_once_with(db=mock_db, cursor="Mg==", limit=2, is_active=None)
+                mock_get_faculties.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_list_faculties_invalid_cursor(self, mock_db, current_user_dict):
+        """Test that a malformed cursor is rejected with 400."""
+        with patch("src.app.api.v1.faculties.get_non_deleted_faculties_after") as mock_get_after:
+            mock_get_after.side_effect = ValueError("Cursor de paginación inválido")
+
+            with pytest.raises(HTTPException) as exc_info:
+                await list_faculties(Mock(), mock_db, current_user_dict, page=1, items_per_page=2, cursor="%%%")
+
+            assert exc_info.value.status_code == 400
+
 
 class TestGetFaculty:
     """Test get faculty by ID endpoint."""
@@ -140,31 +165,19 @@ class TestUpdateFaculty:
         faculty_id = 1
         update_data = FacultyUpdate(name="Nuevo Nombre")
 
-        mock_existing_faculty = {
-            "id": 1,
-            "name": "Nombre Anterior",
-            "acronym": "FI",
-        }
-
         mock_updated_faculty = {
             "id": 1,
             "name": "Nuevo Nombre",
             "acronym": "FI",
         }
 
-        with patch("src.app.api.v1.faculties.get_faculty_by_uuid") as mock_get:
-            mock_get.side_effect = [mock_existing_faculty, mock_updated_faculty]
-
-            with patch("src.app.api.v1.faculties.faculty_exists") as mock_exists:
-                mock_exists.return_value = False
-
-                with patch("src.app.api.v1.faculties.crud_faculties") as mock_crud:
-                    mock_crud.update = AsyncMock()
+        with patch("src.app.api.v1.faculties.update_faculty_returning") as mock_update:
+            mock_update.return_value = mock_updated_faculty
 
-                    result = await update_faculty(Mock(), faculty_id, update_data, mock_db, current_admin_user_dict)
+            result = await update_faculty(Mock(), faculty_id, update_data, mock_db, current_admin_user_dict)
 
-                    assert result == mock_updated_faculty
-                    mock_crud.update.assert_called_once()
+            assert result == mock_updated_faculty
+            mock_update.assert_called_once_with(db=mock_db, faculty_id=faculty_id, values={"name": "Nuevo Nombre"})
 
     @pytest.mark.asyncio
     async def test_update_faculty_not_found(self, mock_db, current_admin_user_dict):
@@ -172,12 +185,23 @@ class TestUpdateFaculty:
         faculty_id = 999
         update_data = FacultyUpdate(name="Nuevo Nombre")
 
-        with patch("src.app.api.v1.faculties.get_faculty_by_uuid") as mock_get:
-            mock_get.return_value = None
+        with patch("src.app.api.v1.faculties.update_faculty_returning") as mock_update:
+            mock_update.return_value = None
 
             with pytest.raises(NotFoundException, match="No se encontró la facultad"):
                 await update_faculty(Mock(), faculty_id, update_data, mock_db, current_admin_user_dict)
 
+    @pytest.mark.asyncio
+    async def test_update_faculty_duplicate_acronym(self, mock_db, current_admin_user_dict):
+        """Test faculty update when the unique index rejects the new acronym."""
+        update_data = FacultyUpdate(acronym="FI")
+
+        with patch("src.app.api.v1.faculties.update_faculty_returning") as mock_update:
+            mock_update.side_effect = ValueError("Ya existe una facultad con el acrónimo 'FI'")
+
+            with pytest.raises(DuplicateValueException, match="Ya existe una facultad con el acrónimo 'FI'"):
+                await update_faculty(Mock(), 1, update_data, mock_db, current_admin_user_dict)
+
 
 class TestDeleteFaculty:
     """Test faculty deletion endpoint."""
@@ -186,22 +210,23 @@ class TestDeleteFaculty:
     async def test_delete_faculty_success(self, mock_db, current_admin_user_dict):
         """Test successful faculty deletion."""
         faculty_id = 1
-        mock_faculty = {
-            "id": 1,
-            "name": "Facultad de Ingeniería",
-            "acronym": "FI",
-        }
 
-        with patch("src.app.api.v1.faculties.get_faculty_by_uuid") as mock_get:
-            mock_get.return_value = mock_faculty
+        with patch("src.app.api.v1.faculties.delete_faculty_returning_id") as mock_delete:
+            mock_delete.return_value = faculty_id
 
-            with patch("src.app.api.v1.faculties.crud_faculties") as mock_crud:
-                mock_crud.delete = AsyncMock()
+            result = await delete_faculty(Mock(), faculty_id, mock_db, current_admin_user_dict)
 
-                result = await delete_faculty(Mock(), faculty_id, mock_db, current_admin_user_dict)
+            assert result is None
+            mock_delete.assert_called_once_with(db=mock_db, faculty_id=faculty_id)
 
-                assert result is None
-                mock_crud.delete.assert_called_once_with(db=mock_db, id=faculty_id)
+    @pytest.mark.asyncio
+    async def test_delete_faculty_not_found(self, mock_db, current_admin_user_dict):
+        """Test faculty deletion when faculty doesn't exist."""
+        with patch("src.app.api.v1.faculties.delete_faculty_returning_id") as mock_delete:
+            mock_delete.return_value = None
+
+            with pytest.raises(NotFoundException, match="No se encontró la facultad"):
+                await delete_faculty(Mock(), 999, mock_db, current_admin_user_dict)
 
 
 class TestSoftDeleteFaculty:
@@ -218,10 +243,10 @@ class TestSoftDeleteFaculty:
         }
 
         with patch("src.app.api.v1.faculties.get_faculty_by_uuid") as mock_get:
-            mock_get.side_effect = [mock_faculty, mock_faculty]
+            mock_get.return_value = mock_faculty
 
             with patch("src.app.api.v1.faculties.soft_delete_faculty") as mock_soft_delete:
-                mock_soft_delete.return_value = True
+                mock_soft_delete.return_value = mock_faculty
 
                 with patch("src.app.api.v1.faculties.create_recycle_bin_entry") as mock_recycle:
                     mock_recycle.return_value = None
@@ -248,10 +273,10 @@ class TestRestoreFaculty:
         }
 
         with patch("src.app.api.v1.faculties.get_faculty_by_uuid") as mock_get:
-            mock_get.side_effect = [mock_faculty, mock_faculty]
+            mock_get.return_value = mock_faculty
 
             with patch("src.app.api.v1.faculties.restore_faculty") as mock_restore:
-                mock_restore.return_value = True
+                mock_restore.return_value = mock_faculty
 
                 with patch("src.app.api.v1.faculties.find_recycle_bin_entry") as mock_find:
                     mock_find.return_value = {"id": 1}
@@ -1,7 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+import pytest_asyncio
 
 
 class TestHourlyRateHistoryValidation:
@@ -195,3 +197,231 @@ class TestHourlyRateTimelineItem:
 
         assert timeline_item.is_active is False
         assert timeline_item.end_date == datetime(2024, 12, 31)
+
+
+class TestGetCurrentRateCached:
+    """Pruebas del caché de tarifas vigentes compartido por un cálculo de planilla."""
+
+    pytestmark = pytest.mark.asyncio
+
+    async def test_repeated_level_and_month_queries_once(self):
+        """Prueba que un (nivel, mes) repetido no vuelva a consultar la base de datos."""
+        from src.app.crud.crud_hourly_rate_history import get_current_rate_cached
+
+        rate = Mock()
+        rate_cache = {}
+        with patch(
+            "src.app.crud.crud_hourly_rate_history.get_current_rate", new_callable=AsyncMock, return_value=rate
+        ) as mock_get_current_rate:
+            first = await get_current_rate_cached(Mock(), 1, date(2025, 3, 1), rate_cache)
+            second = await get_current_rate_cached(Mock(), 1, date(2025, 3, 1), rate_cache)
+
+        assert first is rate
+        assert second is rate
+        mock_get_current_rate.assert_awaited_once()
+        assert rate_cache == {(1, date(2025, 3, 1)): rate}
+
+    async def test_missing_rate_is_cached(self):
+        """Prueba que un resultado ``None`` también se reutilice sin volver a consultar."""
+        from src.app.crud.crud_hourly_rate_history import get_current_rate_cached
+
+        rate_cache = {}
+        with patch(
+            "src.app.crud.crud_hourly_rate_history.get_current_rate", new_callable=AsyncMock, return_value=None
+        ) as mock_get_current_rate:
+            assert await get_current_rate_cached(Mock(), 2, date(2025, 4, 1), rate_cache) is None
+            assert await get_current_rate_cached(Mock(), 2, date(2025, 4, 1), rate_cache) is None
+
+        mock_get_current_rate.assert_awaited_once()
+        assert rate_cache == {(2, date(2025, 4, 1)): None}
+
+    async def test_different_months_query_separately(self):
+        """Prueba que cada mes distinto del mismo nivel se consulte una vez."""
+        from src.app.crud.crud_hourly_rate_history import get_current_rate_cached
+
+        rate_cache = {}
+        with patch(
+            "src.app.crud.crud_hourly_rate_history.get_current_rate", new_callable=AsyncMock, return_value=None
+        ) as mock_get_current_rate:
+            await get_current_rate_cached(Mock(), 1, date(2025, 3, 1), rate_cache)
+            await get_current_rate_cached(Mock(), 1, date(2025, 4, 1), rate_cache)
+
+        assert mock_get_current_rate.await_count == 2
+
+
+@pytest_asyncio.fixture
+async def rate_db_session():
+    """Sesión sobre PostgreSQL dentro de una transacción que se revierte al terminar.
+
+    Crea las tablas e índices que falten (incluido el índice parcial de una tarifa vigente por nivel) dentro de la
+    misma transacción, y los ``commit`` de la sesión se convierten en savepoints.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from src.app.core.config import settings
+    from src.app.core.db.database import Base
+    from src.app.models.hourly_rate_history import HourlyRateHistory
+
+    engine = create_async_engine(f"{settings.POSTGRES_ASYNC_PREFIX}{settings.POSTGRES_URI}", poolclass=NullPool)
+    try:
+        conn = await engine.connect()
+    except (OSError, ConnectionError) as e:
+        await engine.dispose()
+        pytest.skip(f"Requires real database connection: {e}")
+
+    transaction = await conn.begin()
+    try:
+        await conn.run_sync(Base.metadata.create_all, checkfirst=True)
+        for index in HourlyRateHistory.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
+        async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False) as session:
+            yield session
+    finally:
+        await transaction.rollback()
+        await conn.close()
+        await engine.dispose()
+
+
+class TestCreateHourlyRateDatabase:
+    """Pruebas de create_hourly_rate contra PostgreSQL."""
+
+    pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+
+    @staticmethod
+    async def _create_level(session) -> int:
+        from src.app.models.academic_level import AcademicLevel
+
+        level = AcademicLevel(code="ZZT", name="Nivel de prueba", priority=99)
+        session.add(level)
+        await session.flush()
+        return level.id
+
+    @staticmethod
+    async def _rates(session, level_id: int) -> list:
+        from sqlalchemy import select
+
+        from src.app.models.hourly_rate_history import HourlyRateHistory
+
+        result = await session.execute(
+            select(HourlyRateHistory.id, HourlyRateHistory.start_date, HourlyRateHistory.end_date)
+            .where(HourlyRateHistory.level_id == level_id)
+            .order_by(HourlyRateHistory.start_date)
+        )
+        return list(result.all())
+
+    async def test_create_closes_previous_rate_and_inserts_new_one(self, rate_db_session):
+        """Prueba que una nueva tarifa cierre la vigente y quede como la única activa."""
+        from src.app.crud.crud_hourly_rate_history import create_hourly_rate
+        from src.app.schemas.hourly_rate_history import HourlyRateHistoryCreate
+
+        level_id = await self._create_level(rate_db_session)
+        first = await create_hourly_rate(
+            rate_db_session,
+            HourlyRateHistoryCreate(level_id=level_id, rate_per_hour=Decimal("15.00"), start_date=datetime(2025, 1, 1)),
+        )
+        second = await create_hourly_rate(
+            rate_db_session,
+            HourlyRateHistoryCreate(level_id=level_id, rate_per_hour=Decimal("17.50"), start_date=datetime(2025, 7, 1)),
+        )
+
+        assert second.end_date is None
+        assert second.rate_per_hour == Decimal("17.50")
+        assert second.academic_level.id == level_id
+        assert await self._rates(rate_db_session, level_id) == [
+            (first.id, datetime(2025, 1, 1), datetime(2025, 7, 1) - timedelta(seconds=1)),
+            (second.id, datetime(2025, 7, 1), None),
+        ]
+
+    async def test_create_overlap_keeps_previous_rate_active(self, rate_db_session):
+        """Prueba que una tarifa que se solapa no se cree ni cierre la tarifa vigente."""
+        from src.app.crud.crud_hourly_rate_history import create_hourly_rate
+        from src.app.schemas.hourly_rate_history import HourlyRateHistoryCreate
+
+        level_id = await self._create_level(rate_db_session)
+        first = await create_hourly_rate(
+            rate_db_session,
+            HourlyRateHistoryCreate(level_id=level_id, rate_per_hour=Decimal("15.00"), start_date=datetime(2025, 1, 1)),
+        )
+        second = await create_hourly_rate(
+            rate_db_session,
+            HourlyRateHistoryCreate(level_id=level_id, rate_per_hour=Decimal("16.00"), start_date=datetime(2025, 3, 1)),
+        )
+        # The failed creation rolls the session back and expires loaded rows
+        expected = [
+            (first.id, datetime(2025, 1, 1), datetime(2025, 3, 1) - timedelta(seconds=1)),
+            (second.id, datetime(2025, 3, 1), None),
+        ]
+
+        with pytest.raises(ValueError, match="se solapa"):
+            await create_hourly_rate(
+                rate_db_session,
+                HourlyRateHistoryCreate(
+                    level_id=level_id, rate_per_hour=Decimal("18.00"), start_date=datetime(2025, 2, 1)
+                ),
+            )
+
+        assert await self._rates(rate_db_session, level_id) == expected
+
+
+class TestHourlyRateCursor:
+    """Pruebas del cursor opaco del listado de tarifas."""
+
+    def test_cursor_round_trip(self):
+        """Prueba que el cursor conserve la clave de orden completa de la tarifa."""
+        from types import SimpleNamespace
+
+        from src.app.crud.crud_hourly_rate_history import _decode_rate_cursor, encode_rate_cursor
+
+        rate = SimpleNamespace(level_id=3, start_date=datetime(2025, 7, 1, 8, 30), id=42)
+
+        assert _decode_rate_cursor(encode_rate_cursor(rate)) == (3, datetime(2025, 7, 1, 8, 30), 42)
+
+    @pytest.mark.parametrize("cursor", ["no-es-un-cursor", "", "MXwy"])
+    def test_malformed_cursor_raises_value_error(self, cursor):
+        """Prueba que un cursor que no se puede decodificar se rechace."""
+        from src.app.crud.crud_hourly_rate_history import _decode_rate_cursor
+
+        with pytest.raises(ValueError, match="Cursor"):
+            _decode_rate_cursor(cursor)
+
+
+class TestListHourlyRatesCursorDatabase:
+    """Pruebas de la paginación por cursor de get_hourly_rates contra PostgreSQL."""
+
+    pytestmark = [pytest.mark.asyncio, pytest.mark.integration]
+
+    @staticmethod
+    async def _create_rates(session) -> tuple[int, list]:
+        from src.app.crud.crud_hourly_rate_history import create_hourly_rate
+        from src.app.models.academic_level import AcademicLevel
+        from src.app.schemas.hourly_rate_history import HourlyRateHistoryCreate
+
+        level = AcademicLevel(code="ZZC", name="Nivel de prueba cursor", priority=98)
+        session.add(level)
+        await session.flush()
+        rates = [
+            await create_hourly_rate(
+                session,
+                HourlyRateHistoryCreate(
+                    level_id=level.id, rate_per_hour=Decimal("15.00") + month, start_date=datetime(2025, month, 1)
+                ),
+            )
+            for month in (1, 2, 3, 4)
+        ]
+        # Orden del listado: la tarifa más reciente primero
+        return level.id, rates[::-1]
+
+    async def test_cursor_survives_deleting_its_rate(self, rate_db_session):
+        """Prueba que el cursor siga paginando aunque se elimine la tarifa con la que se generó."""
+        from src.app.crud.crud_hourly_rate_history import delete_hourly_rate, encode_rate_cursor, get_hourly_rates
+
+        level_id, rates = await self._create_rates(rate_db_session)
+        first_page = await get_hourly_rates(rate_db_session, limit=1, level_id=level_id)
+        assert [rate.id for rate in first_page] == [rates[0].id]
+
+        cursor = encode_rate_cursor(first_page[0])
+        assert await delete_hourly_rate(rate_db_session, rates[0].id)
+
+        next_page = await get_hourly_rates(rate_db_session, limit=2, level_id=level_id, cursor=cursor)
+        assert [rate.id for rate in next_page] == [rates[1].id, rates[2].id]
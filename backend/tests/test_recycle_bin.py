@@ -1,10 +1,16 @@
 """Unit tests for recycle bin API endpoints."""
 
-from unittest.mock import Mock, patch
+import json
+from unittest.mock import AsyncMock, Mock, patch
+from uuid import UUID
 
 import pytest
+from fastapi import HTTPException
 
 from src.app.api.v1.recycle_bin import (
+    HARD_DELETE_DISPATCH,
+    RESTORE_DISPATCH,
+    export_recycle_bin,
     get_recycle_bin_item,
     list_recycle_bin,
     mark_as_permanently_deleted,
@@ -53,6 +59,74 @@ class TestListRecycleBin:
                 assert result == expected_response
                 mock_get_by_type.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_list_recycle_bin_with_cursor(self, mock_db, current_admin_user_dict):
+        """Test keyset pagination keeps the entity type filter and returns next_cursor."""
+        with patch("src.app.api.v1.recycle_bin.get_recycle_bin_items_after") as mock_get_after:
+            mock_get_after.return_value = {"data": [], "next_cursor": None}
+
+            result = await list_recycle_bin(
+                Mock(), mock_db, current_admin_user_dict, items_per_page=5, entity_type="user", cursor="abc"
+            )
+
+            assert result == {"data": [], "next_cursor": None, "items_per_page": 5}
+            mock_get_after.assert_called_once_with(
+                db=mock_db, cursor="abc", limit=5, entity_type="user", restored=False
+            )
+
+    @pytest.mark.asyncio
+    async def test_list_recycle_bin_invalid_cursor(self, mock_db, current_admin_user_dict):
+        """Test an invalid cursor is rejected with 400."""
+        with patch("src.app.api.v1.recycle_bin.get_recycle_bin_items_after") as mock_get_after:
+            mock_get_after.side_effect = ValueError("Cursor de paginación inválido")
+
+            with pytest.raises(HTTPException) as exc_info:
+                await list_recycle_bin(Mock(), mock_db, current_admin_user_dict, cursor="invalid")
+
+            assert exc_info.value.status_code == 400
+
+
+class TestExportRecycleBin:
+    """Test recycle bin NDJSON export endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_export_streams_one_item_per_line(self, current_admin_user_dict):
+        """Test that exported items are streamed as NDJSON lines with the listing filters."""
+        items = [
+            {
+                "id": item_id,
+                "entity_type": "user",
+                "entity_id": str(item_id),
+                "entity_display_name": f"User {item_id}",
+                "deleted_by_id": "123e4567-e89b-12d3-a456-426614174000",
+                "deleted_by_name": "Admin",
+                "reason": None,
+                "restored_at": None,
+                "restored_by_id": None,
+                "restored_by_name": None,
+                "can_restore": True,
+                "deleted_at": "2026-01-01T00:00:00Z",
+                "created_at": "2026-01-01T00:00:00Z",
+                "updated_at": None,
+            }
+            for item_id in (2, 1)
+        ]
+
+        async def fake_stream(session, entity_type=None, restored=None):
+            for item in items:
+                yield item
+
+        session_cm = AsyncMock()
+        with patch("src.app.api.v1.recycle_bin.local_session", return_value=session_cm):
+            with patch("src.app.api.v1.recycle_bin.stream_recycle_bin_items", side_effect=fake_stream) as mock_stream:
+                response = await export_recycle_bin(Mock(), current_admin_user_dict, entity_type="user")
+                lines = [line async for line in response.body_iterator]
+
+        assert response.media_type == "application/x-ndjson"
+        assert [json.loads(line)["id"] for line in lines] == [2, 1]
+        assert all(line.endswith("\n") for line in lines)
+        mock_stream.assert_called_once_with(session_cm.__aenter__.return_value, entity_type="user", restored=False)
+
 
 class TestGetRecycleBinItem:
     """Test get recycle bin item by ID."""
@@ -109,14 +183,12 @@ class TestRestoreFromRecycleBin:
         )
 
         with patch("src.app.api.v1.recycle_bin.get_recycle_bin_by_id") as mock_get:
-            mock_get.side_effect = [mock_item, mock_item]
-
-            # Mock the dynamically imported restore_user function
-            with patch("src.app.crud.crud_users.restore_user") as mock_restore:
-                mock_restore.return_value = True
+            mock_get.return_value = mock_item
 
+            mock_restore = AsyncMock(return_value=True)
+            with patch.dict(RESTORE_DISPATCH, {"user": (mock_restore, UUID, "user_uuid")}):
                 with patch("src.app.api.v1.recycle_bin.mark_as_restored") as mock_mark:
-                    mock_mark.return_value = True
+                    mock_mark.return_value = mock_item
 
                     result = await restore_from_recycle_bin(
                         Mock(), item_id, restore_data, mock_db, current_admin_user_dict
@@ -143,14 +215,12 @@ class TestRestoreFromRecycleBin:
         )
 
         with patch("src.app.api.v1.recycle_bin.get_recycle_bin_by_id") as mock_get:
-            mock_get.side_effect = [mock_item, mock_item]
-
-            # Mock the dynamically imported restore_faculty function
-            with patch("src.app.crud.crud_faculties.restore_faculty") as mock_restore:
-                mock_restore.return_value = True
+            mock_get.return_value = mock_item
 
+            mock_restore = AsyncMock(return_value=True)
+            with patch.dict(RESTORE_DISPATCH, {"faculty": (mock_restore, int, "faculty_id")}):
                 with patch("src.app.api.v1.recycle_bin.mark_as_restored") as mock_mark:
-                    mock_mark.return_value = True
+                    mock_mark.return_value = mock_item
 
                     result = await restore_from_recycle_bin(
                         Mock(), item_id, restore_data, mock_db, current_admin_user_dict
@@ -196,14 +266,12 @@ class TestPermanentDelete:
         }
 
         with patch("src.app.api.v1.recycle_bin.get_recycle_bin_by_id") as mock_get:
-            mock_get.side_effect = [mock_item, mock_item]
-
-            # Mock the dynamically imported hard_delete_user function
-            with patch("src.app.crud.crud_users.hard_delete_user") as mock_hard_delete:
-                mock_hard_delete.return_value = None
+            mock_get.return_value = mock_item
 
-                with patch("src.app.crud.crud_recycle_bin.update_can_restore") as mock_update:
-                    mock_update.return_value = None
+            mock_hard_delete = AsyncMock(return_value=None)
+            with patch.dict(HARD_DELETE_DISPATCH, {"user": (mock_hard_delete, UUID, "user_uuid")}):
+                with patch("src.app.api.v1.recycle_bin.update_can_restore") as mock_update:
+                    mock_update.return_value = mock_item
 
                     result = await mark_as_permanently_deleted(Mock(), item_id, mock_db, current_admin_user_dict)
 
@@ -223,19 +291,22 @@ class TestPermanentDelete:
         }
 
         with patch("src.app.api.v1.recycle_bin.get_recycle_bin_by_id") as mock_get:
-            mock_get.side_effect = [mock_item, mock_item]
-
-            # Mock the dynamically imported hard_delete_faculty function
-            with patch("src.app.crud.crud_faculties.hard_delete_faculty") as mock_hard_delete:
-                mock_hard_delete.return_value = None
+            mock_get.return_value = mock_item
 
-                with patch("src.app.crud.crud_recycle_bin.update_can_restore") as mock_update:
-                    mock_update.return_value = None
+            mock_hard_delete = AsyncMock(return_value=None)
+            with patch.dict(HARD_DELETE_DISPATCH, {"faculty": (mock_hard_delete, int, "faculty_id")}):
+                with (
+                    patch("src.app.api.v1.recycle_bin.update_can_restore") as mock_update,
+                    patch("src.app.api.v1.recycle_bin.invalidate_cached", new_callable=AsyncMock) as mock_invalidate,
+                ):
+                    mock_update.return_value = mock_item
 
                     result = await mark_as_permanently_deleted(Mock(), item_id, mock_db, current_admin_user_dict)
 
                     assert result == mock_item
                     mock_hard_delete.assert_called_once()
+                    # Las escuelas de la facultad se borran en cascada, así que el listado cacheado se invalida
+                    mock_invalidate.assert_awaited_once_with("schools:list:")
 
     @pytest.mark.asyncio
     async def test_permanent_delete_not_found(self, mock_db, current_admin_user_dict):
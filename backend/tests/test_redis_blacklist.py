@@ -6,6 +6,7 @@ import pytest
 
 from src.app.core.utils.redis_blacklist import (
     add_token_to_blacklist,
+    add_tokens_to_blacklist,
     is_token_blacklisted,
     remove_token_from_blacklist,
 )
@@ -31,6 +32,29 @@ class TestRedisBlacklist:
             # Should not raise an exception, should fail gracefully
             await add_token_to_blacklist("test_token", 3600)
 
+    @pytest.mark.asyncio
+    async def test_add_tokens_to_blacklist_uses_single_pipeline(self):
+        """Test that several tokens are written in one pipelined round-trip."""
+        mock_pipe = Mock()
+        mock_pipe.execute = AsyncMock()
+        mock_client = Mock()
+        mock_client.pipeline.return_value = mock_pipe
+
+        with patch("src.app.core.utils.redis_blacklist.redis_client", mock_client):
+            await add_tokens_to_blacklist({"access_token": 1800, "refresh_token": 604800})
+
+            mock_client.pipeline.assert_called_once_with(transaction=False)
+            mock_pipe.setex.assert_any_call("blacklist:token:access_token", 1800, "1")
+            mock_pipe.setex.assert_any_call("blacklist:token:refresh_token", 604800, "1")
+            mock_pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_tokens_to_blacklist_redis_unavailable(self):
+        """Test bulk token addition when Redis is unavailable."""
+        with patch("src.app.core.utils.redis_blacklist.redis_client", None):
+            # Should not raise an exception, should fail gracefully
+            await add_tokens_to_blacklist({"test_token": 3600})
+
     @pytest.mark.asyncio
     async def test_is_token_blacklisted_success(self):
         """Test successful token blacklist check."""
@@ -1,5 +1,6 @@
 """Unit tests for schools API endpoints."""
 
+import json
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -12,6 +13,7 @@ from src.app.api.v1.schools import (
     update_school,
 )
 from src.app.core.exceptions.http_exceptions import DuplicateValueException, NotFoundException
+from src.app.models.school import School
 from src.app.schemas.school import SchoolCreate, SchoolUpdate
 
 
@@ -23,42 +25,30 @@ class TestCreateSchool:
         """Test successful school creation."""
         school_data = SchoolCreate(name="Escuela de Sistemas", acronym="ESI", fk_faculty=1, is_active=True)
 
-        mock_created_school = Mock(id=1)
-        mock_school_read = {
-            "id": 1,
-            "name": "Escuela de Sistemas",
-            "acronym": "ESI",
-            "fk_faculty": 1,
-            "is_active": True,
-        }
-
-        mock_faculty = {"id": 1, "name": "Facultad de Ingeniería"}
-
-        with patch("src.app.api.v1.schools.get_faculty_by_uuid") as mock_get_faculty:
-            mock_get_faculty.return_value = mock_faculty
+        mock_created_school = School(name="Escuela de Sistemas", acronym="ESI", fk_faculty=1, is_active=True, id=1)
 
-            with patch("src.app.api.v1.schools.school_exists") as mock_exists:
-                mock_exists.return_value = False
+        with patch("src.app.api.v1.schools.validate_school_values", new_callable=AsyncMock) as mock_validate:
+            mock_validate.return_value = (True, False, False)
 
-                with patch("src.app.api.v1.schools.school_acronym_exists") as mock_acronym_exists:
-                    mock_acronym_exists.return_value = False
-
-                    with patch("src.app.api.v1.schools.crud_schools") as mock_crud:
-                        mock_crud.create = AsyncMock(return_value=mock_created_school)
-                        mock_crud.get = AsyncMock(return_value=mock_school_read)
+            with patch("src.app.api.v1.schools.crud_schools") as mock_crud:
+                mock_crud.create = AsyncMock(return_value=mock_created_school)
 
-                        result = await create_school(Mock(), school_data, mock_db, current_admin_user_dict)
+                result = await create_school(Mock(), school_data, mock_db, current_admin_user_dict)
 
-                        assert result == mock_school_read
-                        mock_crud.create.assert_called_once()
+                assert result.id == 1
+                assert result.name == "Escuela de Sistemas"
+                mock_validate.assert_called_once_with(
+                    db=mock_db, faculty_id=1, name="Escuela de Sistemas", acronym="ESI"
+                )
+                mock_crud.create.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_create_school_faculty_not_found(self, mock_db, current_admin_user_dict):
         """Test school creation when faculty doesn't exist."""
         school_data = SchoolCreate(name="Escuela de Sistemas", acronym="ESI", fk_faculty=999, is_active=True)
 
-        with patch("src.app.api.v1.schools.get_faculty_by_uuid") as mock_get_faculty:
-            mock_get_faculty.return_value = None
+        with patch("src.app.api.v1.schools.validate_school_values", new_callable=AsyncMock) as mock_validate:
+            mock_validate.return_value = (False, False, False)
 
             with pytest.raises(NotFoundException, match="No se encontró la facultad"):
                 await create_school(Mock(), school_data, mock_db, current_admin_user_dict)
@@ -68,16 +58,11 @@ class TestCreateSchool:
         """Test school creation with duplicate name in same faculty."""
         school_data = SchoolCreate(name="Escuela Existente", acronym="EE", fk_faculty=1, is_active=True)
 
-        mock_faculty = {"id": 1, "name": "Facultad de Ingeniería"}
-
-        with patch("src.app.api.v1.schools.get_faculty_by_uuid") as mock_get_faculty:
-            mock_get_faculty.return_value = mock_faculty
+        with patch("src.app.api.v1.schools.validate_school_values", new_callable=AsyncMock) as mock_validate:
+            mock_validate.return_value = (True, True, False)
 
-            with patch("src.app.api.v1.schools.school_exists") as mock_exists:
-                mock_exists.return_value = True
-
-                with pytest.raises(DuplicateValueException, match="Ya existe una escuela con el nombre"):
-                    await create_school(Mock(), school_data, mock_db, current_admin_user_dict)
+            with pytest.raises(DuplicateValueException, match="Ya existe una escuela con el nombre"):
+                await create_school(Mock(), school_data, mock_db, current_admin_user_dict)
 
 
 class TestListSchools:
@@ -88,8 +73,8 @@ class TestListSchools:
         """Test successful schools list retrieval."""
         mock_schools_data = {"data": [{"id": 1}, {"id": 2}], "total_count": 2}
 
-        with patch("src.app.api.v1.schools.crud_schools") as mock_crud:
-            mock_crud.get_multi = AsyncMock(return_value=mock_schools_data)
+        with patch("src.app.api.v1.schools.get_multi_with_total", new_callable=AsyncMock) as mock_get_multi:
+            mock_get_multi.return_value = mock_schools_data
 
             with patch("src.app.api.v1.schools.paginated_response") as mock_paginated:
                 expected_response = {"data": [{"id": 1}, {"id": 2}], "total_count": 2, "page": 1, "items_per_page": 10}
@@ -98,7 +83,7 @@ class TestListSchools:
                 result = await list_schools(Mock(), mock_db, current_user_dict, page=1, items_per_page=10)
 
                 assert result == expected_response
-                mock_crud.get_multi.assert_called_once()
+                mock_get_multi.assert_called_once()
                 mock_paginated.assert_called_once()
 
     @pytest.mark.asyncio
@@ -106,8 +91,8 @@ class TestListSchools:
         """Test schools list with faculty filter."""
         mock_schools_data = {"data": [{"id": 1, "fk_faculty": 1}], "total_count": 1}
 
-        with patch("src.app.api.v1.schools.crud_schools") as mock_crud:
-            mock_crud.get_multi = AsyncMock(return_value=mock_schools_data)
+        with patch("src.app.api.v1.schools.get_multi_with_total", new_callable=AsyncMock) as mock_get_multi:
+            mock_get_multi.return_value = mock_schools_data
 
             with patch("src.app.api.v1.schools.paginated_response") as mock_paginated:
                 expected_response = {"data": [{"id": 1}], "total_count": 1}
@@ -117,9 +102,24 @@ class TestListSchools:
 
                 assert result == expected_response
                 # Verificar que se pasó el filtro de faculty
-                call_kwargs = mock_crud.get_multi.call_args[1]
+                call_kwargs = mock_get_multi.call_args[1]
                 assert call_kwargs.get("fk_faculty") == 1
 
+    @pytest.mark.asyncio
+    async def test_list_schools_served_from_cache(self, mock_db, current_user_dict):
+        """Test that a cached page is returned without querying the database."""
+        cached_response = {"data": [{"id": 1}], "total_count": 1, "has_more": False, "page": 1, "items_per_page": 10}
+        mock_client = AsyncMock()
+        mock_client.get.return_value = json.dumps(cached_response).encode()
+
+        with patch("src.app.core.utils.cache.client", mock_client):
+            with patch("src.app.api.v1.schools.get_multi_with_total", new_callable=AsyncMock) as mock_get_multi:
+                result = await list_schools(Mock(), mock_db, current_user_dict, page=1, items_per_page=10, faculty_id=1)
+
+                assert result == cached_response
+                mock_client.get.assert_called_once_with("schools:list:1:10:fk_faculty=1")
+                mock_get_multi.assert_not_called()
+
 
 class TestGetSchool:
     """Test get school by ID endpoint."""
@@ -179,18 +179,39 @@ class TestUpdateSchool:
         }
 
         with patch("src.app.api.v1.schools.get_school_by_uuid") as mock_get:
-            mock_get.side_effect = [mock_existing_school, mock_updated_school]
+            mock_get.return_value = mock_existing_school
 
-            with patch("src.app.api.v1.schools.school_exists") as mock_exists:
-                mock_exists.return_value = False
+            with patch("src.app.api.v1.schools.validate_school_values", new_callable=AsyncMock) as mock_validate:
+                mock_validate.return_value = (True, False, False)
 
-                with patch("src.app.api.v1.schools.crud_schools") as mock_crud:
-                    mock_crud.update = AsyncMock()
+                with patch("src.app.api.v1.schools.update_school_values", new_callable=AsyncMock) as mock_update:
+                    mock_update.return_value = mock_updated_school
 
                     result = await update_school(Mock(), school_id, update_data, mock_db, current_admin_user_dict)
 
                     assert result == mock_updated_school
-                    mock_crud.update.assert_called_once()
+                    mock_validate.assert_called_once_with(
+                        db=mock_db, faculty_id=1, name="Nuevo Nombre", acronym=None, check_faculty=False
+                    )
+                    mock_update.assert_called_once_with(db=mock_db, school_id=school_id, values=update_data)
+
+    @pytest.mark.asyncio
+    async def test_update_school_deleted_concurrently(self, mock_db, current_admin_user_dict):
+        """Test school update when the row disappears between validation and update."""
+        school_id = 1
+        update_data = SchoolUpdate(name="Nuevo Nombre")
+
+        with patch("src.app.api.v1.schools.get_school_by_uuid") as mock_get:
+            mock_get.return_value = {"id": 1, "name": "Nombre Anterior", "acronym": "ESI", "fk_faculty": 1}
+
+            with patch("src.app.api.v1.schools.validate_school_values", new_callable=AsyncMock) as mock_validate:
+                mock_validate.return_value = (True, False, False)
+
+                with patch("src.app.api.v1.schools.update_school_values", new_callable=AsyncMock) as mock_update:
+                    mock_update.return_value = None
+
+                    with pytest.raises(NotFoundException, match="No se encontró la escuela"):
+                        await update_school(Mock(), school_id, update_data, mock_db, current_admin_user_dict)
 
 
 class TestDeleteSchool:
@@ -130,3 +130,32 @@ class TestSecurityFunctions:
         assert token is not None
         assert isinstance(token, str)
         assert len(token) > 0
+
+    @pytest.mark.asyncio
+    async def test_verify_token_with_rbac_reuses_verified_claims(self):
+        """Test that a verified token is decoded once but still checked against the blacklist every time."""
+        from src.app.core import security
+
+        user_data = {"username": "test_user", "uuid": "u-1", "email": "e@x.com", "name": "Test", "role": "admin"}
+        token = await security.create_access_token_with_rbac(user_data)
+        security._verified_claims_cache.clear()
+
+        with patch("src.app.core.security.is_token_blacklisted", return_value=False) as mock_blacklisted:
+            with patch("src.app.core.security.jwt.decode", wraps=security.jwt.decode) as mock_decode:
+                first = await security.verify_token_with_rbac(token, security.TokenType.ACCESS, Mock())
+                second = await security.verify_token_with_rbac(token, security.TokenType.ACCESS, Mock())
+
+                assert first == second
+                assert first["username_or_email"] == "test_user"
+                assert mock_decode.call_count == 1
+                assert mock_blacklisted.call_count == 2
+
+                # A token revoked after being cached is rejected
+                mock_blacklisted.return_value = True
+                assert await security.verify_token_with_rbac(token, security.TokenType.ACCESS, Mock()) is None
+
+                # The cached claims are not reused for another token type
+                mock_blacklisted.return_value = False
+                assert await security.verify_token_with_rbac(token, security.TokenType.REFRESH, Mock()) is None
+
+        security._verified_claims_cache.clear()